@@ -5,7 +5,10 @@ Supports configurable FPS (defaults to 24 FPS).
 """
 
 import logging
-from typing import NamedTuple, Optional
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, Generic, NamedTuple, Optional, TypeVar, Union, overload
+
+import numpy as np
 
 from app.core.constants import ACCEPTABLE_ALIGNMENT
 
@@ -47,42 +50,259 @@ class ClipBoundary(NamedTuple):
     start_alignment_error: float
     end_alignment_error: float
     duration_sec: float
-    beats_in_clip: list[int]
+    beats_in_clip: Sequence[int]  # range(start_beat_index, end_beat_index + 1) when computed
+
 
+_Row = TypeVar("_Row", bound=tuple)
 
-def map_beats_to_frames(beat_times: list[float], fps: float = VIDEO_FPS) -> list[BeatFrameAlignment]:
+
+class _RecordArray(Sequence[_Row], Generic[_Row]):
     """
-    Map each beat to its nearest frame index.
+    Base for structure-of-arrays containers that read back as NamedTuple rows.
+
+    Subclasses set _row_type and store one attribute per row field, as a numpy
+    array or (for non-numeric fields) a plain list, in _row_type field order.
+    """
+
+    __slots__ = ()
+    _row_type: type[_Row]
+
+    @classmethod
+    def _from_rows(cls, rows: Sequence[_Row]) -> Any:
+        if isinstance(rows, cls):
+            return rows
+        if not rows:
+            return cls(*([] for _ in cls._row_type._fields))
+        # Transpose rows into one column per field
+        return cls(*zip(*rows))
+
+    def _columns(self) -> list[Any]:
+        return [getattr(self, field) for field in self._row_type._fields]
+
+    def __len__(self) -> int:
+        return len(getattr(self, self._row_type._fields[0]))
+
+    @overload
+    def __getitem__(self, index: int) -> _Row: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Any: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return type(self)(*(column[index] for column in self._columns()))
+        # .item() hands back Python scalars rather than numpy ones
+        return self._row_type(
+            *(
+                column[index].item() if isinstance(column, np.ndarray) else column[index]
+                for column in self._columns()
+            )
+        )
+
+    def __iter__(self) -> Iterator[_Row]:
+        # Convert each column once rather than indexing numpy scalars per row
+        columns = [
+            column.tolist() if isinstance(column, np.ndarray) else column
+            for column in self._columns()
+        ]
+        return map(self._row_type._make, zip(*columns))
+
+    def __add__(self, other: Sequence[_Row]) -> Any:
+        # Concatenate like the plain lists these types replaced
+        other = self._from_rows(other)
+        return type(self)(
+            *(
+                np.concatenate([mine, theirs]) if isinstance(mine, np.ndarray) else mine + theirs
+                for mine, theirs in zip(self._columns(), other._columns())
+            )
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+
+class BeatFrameAlignmentArray(_RecordArray[BeatFrameAlignment]):
+    """
+    Structure-of-arrays collection of beat-to-frame alignments.
+
+    Holds one numpy column per BeatFrameAlignment field instead of one object per
+    beat; indexing and iteration yield BeatFrameAlignment tuples.
+    """
+
+    __slots__ = ("beat_index", "beat_time", "frame_index", "frame_time", "error_sec")
+    _row_type = BeatFrameAlignment
+
+    def __init__(
+        self,
+        beat_index: Iterable[int],
+        beat_time: Iterable[float],
+        frame_index: Iterable[int],
+        frame_time: Iterable[float],
+        error_sec: Iterable[float],
+    ):
+        self.beat_index = np.asarray(beat_index, dtype=np.int64)
+        self.beat_time = np.asarray(beat_time, dtype=np.float64)
+        self.frame_index = np.asarray(frame_index, dtype=np.int64)
+        self.frame_time = np.asarray(frame_time, dtype=np.float64)
+        self.error_sec = np.asarray(error_sec, dtype=np.float64)
+
+
+class ClipBoundaryArray(_RecordArray[ClipBoundary]):
+    """
+    Structure-of-arrays collection of clip boundaries.
+
+    Each ClipBoundary field is stored as a numpy column so validation can run as
+    vectorized reductions. Indexing and iteration still yield ClipBoundary tuples
+    for callers that work clip by clip.
+    """
+
+    __slots__ = (
+        "start_time",
+        "end_time",
+        "start_beat_index",
+        "end_beat_index",
+        "start_frame_index",
+        "end_frame_index",
+        "start_alignment_error",
+        "end_alignment_error",
+        "duration_sec",
+        "beats_in_clip",
+    )
+    _row_type = ClipBoundary
+
+    def __init__(
+        self,
+        start_time: Iterable[float],
+        end_time: Iterable[float],
+        start_beat_index: Iterable[int],
+        end_beat_index: Iterable[int],
+        start_frame_index: Iterable[int],
+        end_frame_index: Iterable[int],
+        start_alignment_error: Iterable[float],
+        end_alignment_error: Iterable[float],
+        duration_sec: Iterable[float],
+        beats_in_clip: Iterable[Sequence[int]],
+    ):
+        self.start_time = np.asarray(start_time, dtype=np.float64)
+        self.end_time = np.asarray(end_time, dtype=np.float64)
+        self.start_beat_index = np.asarray(start_beat_index, dtype=np.int64)
+        self.end_beat_index = np.asarray(end_beat_index, dtype=np.int64)
+        self.start_frame_index = np.asarray(start_frame_index, dtype=np.int64)
+        self.end_frame_index = np.asarray(end_frame_index, dtype=np.int64)
+        self.start_alignment_error = np.asarray(start_alignment_error, dtype=np.float64)
+        self.end_alignment_error = np.asarray(end_alignment_error, dtype=np.float64)
+        self.duration_sec = np.asarray(duration_sec, dtype=np.float64)
+        self.beats_in_clip = list(beats_in_clip)
+
+    @classmethod
+    def from_boundaries(cls, boundaries: Sequence[ClipBoundary]) -> "ClipBoundaryArray":
+        """Build an array from ClipBoundary tuples (returned unchanged if already an array)."""
+        return cls._from_rows(boundaries)
+
+    def with_offset(self, offset: float, beat_offset: int = 0) -> "ClipBoundaryArray":
+        """Return a copy with times shifted by offset seconds and beat indices by beat_offset."""
+        return ClipBoundaryArray(
+            start_time=self.start_time + offset,
+            end_time=self.end_time + offset,
+            start_beat_index=self.start_beat_index + beat_offset,
+            end_beat_index=self.end_beat_index + beat_offset,
+            start_frame_index=self.start_frame_index,
+            end_frame_index=self.end_frame_index,
+            start_alignment_error=self.start_alignment_error,
+            end_alignment_error=self.end_alignment_error,
+            duration_sec=self.duration_sec,
+            beats_in_clip=(
+                [_shift_beats(beats, beat_offset) for beats in self.beats_in_clip]
+                if beat_offset
+                else self.beats_in_clip
+            ),
+        )
+
+
+def _shift_beats(beats: Sequence[int], offset: int) -> Sequence[int]:
+    """Shift beat indices by offset, keeping contiguous ranges as ranges."""
+    if isinstance(beats, range):
+        return range(beats.start + offset, beats.stop + offset, beats.step)
+    return [beat + offset for beat in beats]
+
+
+def _beat_frame_arrays(
+    beat_times: list[float], fps: float = VIDEO_FPS
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute nearest-frame indices, frame times and alignment errors for all beats at once.
 
     Args:
         beat_times: List of beat times in seconds
+        fps: Video frames per second
+
+    Returns:
+        Tuple of (frame_indices, frame_times, errors) as parallel numpy arrays
+    """
+    beats = np.asarray(beat_times, dtype=np.float64)
+    # np.rint rounds half to even, matching Python's round()
+    frame_indices = np.rint(beats * fps).astype(np.int64)
+    frame_times = frame_indices * (1.0 / fps)
+    errors = np.abs(beats - frame_times)
+    return frame_indices, frame_times, errors
+
+
+def map_beats_to_frames(beat_times: list[float], fps: float = VIDEO_FPS) -> BeatFrameAlignmentArray:
+    """
+    Map each beat to its nearest frame index.
+
+    Args:
+        beat_times: Beat times in seconds, as a list or numpy array
         fps: Video frames per second (default: 8)
 
     Returns:
-        List of BeatFrameAlignment objects
+        BeatFrameAlignmentArray with one alignment per beat
     """
-    alignments = []
-    frame_interval = 1.0 / fps
+    frame_indices, frame_times, errors = _beat_frame_arrays(beat_times, fps)
+
+    return BeatFrameAlignmentArray(
+        beat_index=np.arange(len(frame_indices)),
+        beat_time=np.asarray(beat_times, dtype=np.float64),
+        frame_index=frame_indices,
+        frame_time=frame_times,
+        error_sec=errors,
+    )
 
-    for beat_idx, beat_time in enumerate(beat_times):
-        # Find nearest frame
-        frame_idx = round(beat_time * fps)
-        frame_time = frame_idx * frame_interval
-
-        # Calculate alignment error
-        error = abs(beat_time - frame_time)
-
-        alignments.append(
-            BeatFrameAlignment(
-                beat_index=beat_idx,
-                beat_time=beat_time,
-                frame_index=frame_idx,
-                frame_time=frame_time,
-                error_sec=error,
-            )
-        )
 
-    return alignments
+def find_nearest_beat_indices(times: list[float], beat_times: list[float]) -> np.ndarray:
+    """
+    Find the index of the nearest beat for each of the given times.
+
+    Uses a binary search over the beat grid, so each lookup is O(log n).
+    Ties between equally distant beats resolve to the earliest one.
+
+    Args:
+        times: Query times in seconds
+        beat_times: List of beat times in seconds (must be sorted)
+
+    Returns:
+        Array of nearest beat indices, one per query time
+    """
+    if len(beat_times) == 0:
+        raise ValueError("beat_times cannot be empty")
+
+    beats = np.asarray(beat_times, dtype=np.float64)
+    queries = np.asarray(times, dtype=np.float64)
+
+    # Candidates are the beats immediately left and right of each query's insertion point
+    insert_idx = np.searchsorted(beats, queries)
+    left = np.clip(insert_idx - 1, 0, len(beats) - 1)
+    right = np.clip(insert_idx, 0, len(beats) - 1)
+    nearest = np.where(np.abs(beats[left] - queries) <= np.abs(beats[right] - queries), left, right)
+    # Map duplicated beat times back to their first occurrence
+    return np.searchsorted(beats, beats[nearest], side="left")
 
 
 def find_nearest_beat_index(time: float, beat_times: list[float]) -> int:
@@ -91,24 +311,12 @@ def find_nearest_beat_index(time: float, beat_times: list[float]) -> int:
 
     Args:
         time: Time in seconds
-        beat_times: List of beat times in seconds
+        beat_times: List of beat times in seconds (must be sorted)
 
     Returns:
         Index of nearest beat
     """
-    if not beat_times:
-        raise ValueError("beat_times cannot be empty")
-
-    min_distance = float("inf")
-    nearest_idx = 0
-
-    for idx, beat_time in enumerate(beat_times):
-        distance = abs(beat_time - time)
-        if distance < min_distance:
-            min_distance = distance
-            nearest_idx = idx
-
-    return nearest_idx
+    return int(find_nearest_beat_indices([time], beat_times)[0])
 
 
 def calculate_beat_aligned_boundaries(
@@ -117,7 +325,7 @@ def calculate_beat_aligned_boundaries(
     min_duration: float = MIN_CLIP_DURATION,
     max_duration: float = MAX_CLIP_DURATION,
     fps: float = VIDEO_FPS,
-) -> list[ClipBoundary]:
+) -> ClipBoundaryArray:
     """
     Calculate optimal clip boundaries aligned to beats.
 
@@ -129,16 +337,16 @@ def calculate_beat_aligned_boundaries(
     5. Ensure last boundary aligns with song end (or nearest beat)
 
     Args:
-        beat_times: List of beat times in seconds (must be sorted)
+        beat_times: Beat times in seconds, as a list or numpy array (must be sorted)
         song_duration: Total song duration in seconds
         min_duration: Minimum clip duration in seconds (default: 3.0)
         max_duration: Maximum clip duration in seconds (default: 6.0)
         fps: Video frames per second (default: 8)
 
     Returns:
-        List of ClipBoundary objects with beat alignment metadata
+        ClipBoundaryArray with beat alignment metadata
     """
-    if not beat_times:
+    if len(beat_times) == 0:
         raise ValueError("beat_times cannot be empty")
 
     if song_duration <= 0:
@@ -147,66 +355,32 @@ def calculate_beat_aligned_boundaries(
     if min_duration >= max_duration:
         raise ValueError("min_duration must be less than max_duration")
 
-    # Get beat-to-frame alignments
-    alignments = map_beats_to_frames(beat_times, fps)
-
-    boundaries: list[ClipBoundary] = []
-    current_start_beat_idx = 0
-    current_start_time = beat_times[0]
-
-    frame_interval = 1.0 / fps
-
-    # Find beats that can serve as boundaries
-    for beat_idx in range(1, len(beat_times)):
-        beat_time = beat_times[beat_idx]
-        duration = beat_time - current_start_time
-
-        # If adding this beat would exceed max duration, finalize current clip
-        if duration > max_duration:
-            # Find the best beat to end the current clip (closest to max_duration)
-            best_end_beat_idx = beat_idx - 1
-            best_end_time = beat_times[best_end_beat_idx]
-
-            # Check if we can extend to current beat while staying within max
-            # (This handles the case where we're just over max)
-            if duration <= max_duration * 1.1:  # Allow 10% tolerance
-                best_end_beat_idx = beat_idx
-                best_end_time = beat_time
-
-            # Ensure minimum duration
-            if best_end_time - current_start_time < min_duration:
-                # Extend to next beat if possible
-                if beat_idx < len(beat_times) - 1:
-                    next_beat_time = beat_times[beat_idx + 1]
-                    if next_beat_time - current_start_time <= max_duration:
-                        best_end_beat_idx = beat_idx + 1
-                        best_end_time = next_beat_time
-
-            # Create boundary
-            end_alignment = alignments[best_end_beat_idx]
-            start_alignment = alignments[current_start_beat_idx]
-
-            # Get beats in this clip
-            beats_in_clip = list(range(current_start_beat_idx, best_end_beat_idx + 1))
-
-            boundary = ClipBoundary(
-                start_time=current_start_time,
-                end_time=best_end_time,
-                start_beat_index=current_start_beat_idx,
-                end_beat_index=best_end_beat_idx,
-                start_frame_index=start_alignment.frame_index,
-                end_frame_index=end_alignment.frame_index,
-                start_alignment_error=start_alignment.error_sec,
-                end_alignment_error=end_alignment.error_sec,
-                duration_sec=best_end_time - current_start_time,
-                beats_in_clip=beats_in_clip,
-            )
-
-            boundaries.append(boundary)
+    # Accept numpy arrays too; the greedy scan works on Python floats
+    beats = np.asarray(beat_times, dtype=np.float64)
+    beat_times = beats.tolist()
+
+    # Get beat-to-frame alignments as parallel arrays (no per-beat objects)
+    frame_indices, frame_times, frame_errors = _beat_frame_arrays(beats, fps)
+
+    # Beat index pairs for every clip except the last
+    cuts = _greedy_clip_cuts(beats, beat_times, min_duration, max_duration)
+    start_idx = np.array([start for start, _ in cuts], dtype=np.int64)
+    end_idx = np.array([end for _, end in cuts], dtype=np.int64)
+    boundaries = ClipBoundaryArray(
+        start_time=beats[start_idx],
+        end_time=beats[end_idx],
+        start_beat_index=start_idx,
+        end_beat_index=end_idx,
+        start_frame_index=frame_indices[start_idx],
+        end_frame_index=frame_indices[end_idx],
+        start_alignment_error=frame_errors[start_idx],
+        end_alignment_error=frame_errors[end_idx],
+        duration_sec=beats[end_idx] - beats[start_idx],
+        beats_in_clip=[range(start, end + 1) for start, end in cuts],
+    )
 
-            # Start new clip
-            current_start_beat_idx = best_end_beat_idx
-            current_start_time = best_end_time
+    current_start_beat_idx = cuts[-1][1] if cuts else 0
+    current_start_time = beat_times[current_start_beat_idx]
 
     # Handle last clip
     if current_start_time < song_duration:
@@ -233,41 +407,102 @@ def calculate_beat_aligned_boundaries(
                 end_time = last_beat_time
                 end_beat_idx = last_beat_idx
 
-        # Get alignment for end (use last beat's alignment, or calculate for song end)
-        if end_beat_idx < len(alignments):
-            end_alignment = alignments[end_beat_idx]
-            end_frame_idx = end_alignment.frame_index
-            end_error = abs(end_time - end_alignment.frame_time)
-        else:
-            # Calculate frame for song end
-            end_frame_idx = round(end_time * fps)
-            end_error = abs(end_time - (end_frame_idx * frame_interval))
-
-        start_alignment = alignments[current_start_beat_idx]
-
-        # Get beats in this clip
-        beats_in_clip = list(range(current_start_beat_idx, end_beat_idx + 1))
-
-        boundary = ClipBoundary(
-            start_time=current_start_time,
-            end_time=end_time,
-            start_beat_index=current_start_beat_idx,
-            end_beat_index=end_beat_idx,
-            start_frame_index=start_alignment.frame_index,
-            end_frame_index=end_frame_idx,
-            start_alignment_error=start_alignment.error_sec,
-            end_alignment_error=end_error,
-            duration_sec=end_time - current_start_time,
-            beats_in_clip=beats_in_clip,
-        )
+        # Frame alignment for the end (last beat's frame, error measured from the actual end time)
+        end_frame_idx = int(frame_indices[end_beat_idx])
+        end_error = abs(end_time - float(frame_times[end_beat_idx]))
 
-        boundaries.append(boundary)
+        boundaries = boundaries + [
+            ClipBoundary(
+                start_time=current_start_time,
+                end_time=end_time,
+                start_beat_index=current_start_beat_idx,
+                end_beat_index=end_beat_idx,
+                start_frame_index=int(frame_indices[current_start_beat_idx]),
+                end_frame_index=end_frame_idx,
+                start_alignment_error=float(frame_errors[current_start_beat_idx]),
+                end_alignment_error=end_error,
+                duration_sec=end_time - current_start_time,
+                beats_in_clip=range(current_start_beat_idx, end_beat_idx + 1),
+            )
+        ]
 
     return boundaries
 
 
+def _greedy_clip_cuts(
+    beats: np.ndarray,
+    beat_times: list[float],
+    min_duration: float,
+    max_duration: float,
+) -> list[tuple[int, int]]:
+    """
+    Greedily cut the beat grid into clips of at most max_duration.
+
+    Pure index arithmetic, independent of fps; the final clip (which may run to
+    the song end rather than a beat) is left to the caller.
+
+    Args:
+        beats: Sorted beat times as a numpy array (for binary search)
+        beat_times: The same beat times as a list (for scalar access)
+        min_duration: Minimum clip duration in seconds
+        max_duration: Maximum clip duration in seconds
+
+    Returns:
+        List of (start_beat_index, end_beat_index) pairs, in order
+    """
+    num_beats = len(beat_times)
+    cuts: list[tuple[int, int]] = []
+    current_start_beat_idx = 0
+    current_start_time = beat_times[0]
+
+    beat_idx = 0
+    while True:
+        # Jump to the first beat past beat_idx that would exceed max duration
+        min_idx = beat_idx + 1
+        beat_idx = max(
+            min_idx,
+            int(np.searchsorted(beats, current_start_time + max_duration, side="right")),
+        )
+        # Settle on the exact (beat - start > max) predicate so float rounding
+        # in start + max can't move the cut
+        while beat_idx > min_idx and beat_times[beat_idx - 1] - current_start_time > max_duration:
+            beat_idx -= 1
+        while beat_idx < num_beats and beat_times[beat_idx] - current_start_time <= max_duration:
+            beat_idx += 1
+        if beat_idx >= num_beats:
+            return cuts
+
+        beat_time = beat_times[beat_idx]
+        duration = beat_time - current_start_time
+
+        # Find the best beat to end the current clip (closest to max_duration)
+        best_end_beat_idx = beat_idx - 1
+        best_end_time = beat_times[best_end_beat_idx]
+
+        # Check if we can extend to current beat while staying within max
+        # (This handles the case where we're just over max)
+        if duration <= max_duration * 1.1:  # Allow 10% tolerance
+            best_end_beat_idx = beat_idx
+            best_end_time = beat_time
+
+        # Ensure minimum duration
+        if best_end_time - current_start_time < min_duration:
+            # Extend to next beat if possible
+            if beat_idx < num_beats - 1:
+                next_beat_time = beat_times[beat_idx + 1]
+                if next_beat_time - current_start_time <= max_duration:
+                    best_end_beat_idx = beat_idx + 1
+                    best_end_time = next_beat_time
+
+        cuts.append((current_start_beat_idx, best_end_beat_idx))
+
+        # Start new clip
+        current_start_beat_idx = best_end_beat_idx
+        current_start_time = best_end_time
+
+
 def validate_boundaries(
-    boundaries: list[ClipBoundary],
+    boundaries: Sequence[ClipBoundary],
     beat_times: list[float],
     song_duration: float,
     max_drift: float = ACCEPTABLE_ALIGNMENT,
@@ -277,7 +512,7 @@ def validate_boundaries(
     Validate that boundaries don't drift from beat grid.
 
     Args:
-        boundaries: List of clip boundaries
+        boundaries: Clip boundaries (list or ClipBoundaryArray)
         beat_times: List of beat times in seconds
         song_duration: Total song duration in seconds
         max_drift: Maximum allowed drift from beat grid in seconds (default: 0.1)
@@ -289,31 +524,32 @@ def validate_boundaries(
     if not boundaries:
         return True, 0.0, 0.0
 
-    errors = []
     frame_interval = 1.0 / fps
+    beats = np.asarray(beat_times, dtype=np.float64)
 
-    for boundary in boundaries:
-        # Check start alignment
-        start_beat_time = beat_times[boundary.start_beat_index]
-        start_frame_time = boundary.start_frame_index * frame_interval
-        start_error = abs(boundary.start_time - start_beat_time) + abs(boundary.start_time - start_frame_time)
-        errors.append(start_error)
-
-        # Check end alignment
-        end_beat_time = beat_times[boundary.end_beat_index]
-        end_frame_time = boundary.end_frame_index * frame_interval
-        end_error = abs(boundary.end_time - end_beat_time) + abs(boundary.end_time - end_frame_time)
-        errors.append(end_error)
-
-        # Validate duration
-        if boundary.duration_sec < MIN_CLIP_DURATION or boundary.duration_sec > MAX_CLIP_DURATION * 1.1:
-            logger.warning(
-                f"Boundary duration {boundary.duration_sec:.3f}s outside constraints "
-                f"[{MIN_CLIP_DURATION}, {MAX_CLIP_DURATION}]"
-            )
+    columns = ClipBoundaryArray.from_boundaries(boundaries)
+    start_times, end_times = columns.start_time, columns.end_time
+    durations = columns.duration_sec
+
+    # Start and end alignment errors, interleaved per boundary
+    errors = np.empty(2 * len(boundaries), dtype=np.float64)
+    errors[0::2] = np.abs(start_times - beats[columns.start_beat_index]) + np.abs(
+        start_times - columns.start_frame_index * frame_interval
+    )
+    errors[1::2] = np.abs(end_times - beats[columns.end_beat_index]) + np.abs(
+        end_times - columns.end_frame_index * frame_interval
+    )
+
+    # Validate duration
+    out_of_range = (durations < MIN_CLIP_DURATION) | (durations > MAX_CLIP_DURATION * 1.1)
+    for duration in durations[out_of_range].tolist():
+        logger.warning(
+            f"Boundary duration {duration:.3f}s outside constraints "
+            f"[{MIN_CLIP_DURATION}, {MAX_CLIP_DURATION}]"
+        )
 
-    max_error = max(errors) if errors else 0.0
-    avg_error = sum(errors) / len(errors) if errors else 0.0
+    max_error = float(errors.max())
+    avg_error = float(errors.mean())
     is_valid = max_error <= max_drift
 
     return is_valid, max_error, avg_error
@@ -328,12 +564,12 @@ def calculate_beat_aligned_clip_boundaries(
     fps: float = VIDEO_FPS,
     user_selection_start: Optional[float] = None,
     user_selection_end: Optional[float] = None,
-) -> list[ClipBoundary]:
+) -> ClipBoundaryArray:
     """
     Calculate clip boundaries aligned to beats, with optional user selection.
     
     Args:
-        beat_times: List of beat timestamps
+        beat_times: List of beat timestamps (must be sorted)
         song_duration: Total song duration
         num_clips: Target number of clips
         min_clip_duration: Minimum clip duration
@@ -343,18 +579,20 @@ def calculate_beat_aligned_clip_boundaries(
         user_selection_end: Optional end time for user-selected segment (30s selection)
     
     Returns:
-        List of ClipBoundary objects with beat-aligned timestamps
+        ClipBoundaryArray with beat-aligned timestamps; beat indices refer to beat_times
     """
     # Filter beats to user selection if provided
     if user_selection_start is not None and user_selection_end is not None:
-        filtered_beats = [
-            beat for beat in beat_times
-            if user_selection_start <= beat <= user_selection_end
-        ]
+        # Beats are sorted, so the selection is a contiguous slice
+        beats = np.asarray(beat_times, dtype=np.float64)
+        first_beat_idx = int(np.searchsorted(beats, user_selection_start, side="left"))
+        last_beat_idx = int(np.searchsorted(beats, user_selection_end, side="right"))
+        filtered_beats = beats[first_beat_idx:last_beat_idx]
         effective_duration = user_selection_end - user_selection_start
         effective_start = user_selection_start
     else:
         filtered_beats = beat_times
+        first_beat_idx = 0
         effective_duration = song_duration
         effective_start = 0.0
     
@@ -367,31 +605,15 @@ def calculate_beat_aligned_clip_boundaries(
         fps=fps
     )
     
-    # Adjust boundaries for user selection offset
+    # Adjust boundaries for user selection offset (times and beat indices)
     if user_selection_start is not None:
-        adjusted_boundaries = []
-        for boundary in boundaries:
-            adjusted_boundaries.append(
-                ClipBoundary(
-                    start_time=boundary.start_time + effective_start,
-                    end_time=boundary.end_time + effective_start,
-                    start_beat_index=boundary.start_beat_index,
-                    end_beat_index=boundary.end_beat_index,
-                    start_frame_index=boundary.start_frame_index,
-                    end_frame_index=boundary.end_frame_index,
-                    start_alignment_error=boundary.start_alignment_error,
-                    end_alignment_error=boundary.end_alignment_error,
-                    duration_sec=boundary.duration_sec,
-                    beats_in_clip=boundary.beats_in_clip,
-                )
-            )
-        boundaries = adjusted_boundaries
+        boundaries = boundaries.with_offset(effective_start, beat_offset=first_beat_idx)
     
     return boundaries
 
 
 def verify_beat_aligned_transitions(
-    boundaries: list[ClipBoundary],
+    boundaries: Sequence[ClipBoundary],
     beat_times: list[float],
     tolerance_sec: float = 0.05,
 ) -> tuple[bool, list[float]]:
@@ -399,24 +621,23 @@ def verify_beat_aligned_transitions(
     Verify that all clip transitions occur on beat boundaries.
     
     Args:
-        boundaries: List of clip boundaries
+        boundaries: Clip boundaries (list or ClipBoundaryArray)
         beat_times: List of beat timestamps
         tolerance_sec: Maximum allowed deviation from beat (default: 50ms)
     
     Returns:
         Tuple of (all_aligned, list of alignment errors)
     """
-    errors = []
-    
-    for i in range(len(boundaries) - 1):
-        # Transition occurs at end of current clip = start of next clip
-        transition_time = boundaries[i].end_time
-        
-        # Find nearest beat
-        nearest_beat = min(beat_times, key=lambda x: abs(x - transition_time))
-        error = abs(transition_time - nearest_beat)
-        errors.append(error)
-    
-    all_aligned = all(error <= tolerance_sec for error in errors)
-    return all_aligned, errors
+    if len(boundaries) < 2:
+        return True, []
+
+    # Transition occurs at end of current clip = start of next clip
+    transition_times = ClipBoundaryArray.from_boundaries(boundaries).end_time[:-1]
+
+    # Distance from each transition to its nearest beat
+    beats = np.asarray(beat_times, dtype=np.float64)
+    nearest_beats = beats[find_nearest_beat_indices(transition_times, beats)]
+    errors = np.abs(transition_times - nearest_beats)
 
+    all_aligned = bool((errors <= tolerance_sec).all())
+    return all_aligned, errors.tolist()
@@ -1,6 +1,7 @@
 """Beat filter applicator for centralized effect application logic."""
 
 import logging
+from functools import cached_property
 from typing import Optional
 
 from app.core.config import BeatEffectConfig, get_beat_effect_config
@@ -11,6 +12,15 @@ logger = logging.getLogger(__name__)
 class BeatFilterApplicator:
     """Centralized beat filter application logic."""
 
+    # Filter type -> handler method name, looked up per call so handlers stay patchable
+    _FILTER_METHODS = {
+        "flash": "apply_flash_filter",
+        "glitch": "apply_glitch_filter",
+        "color_burst": "apply_color_burst_filter",
+        "brightness_pulse": "apply_brightness_pulse_filter",
+        "zoom_pulse": "apply_zoom_pulse_filter",
+    }
+
     def __init__(self, effect_config: Optional[BeatEffectConfig] = None, test_mode: Optional[bool] = None):
         """Initialize applicator with config and test mode."""
         self.effect_config = effect_config or get_beat_effect_config()
@@ -23,8 +33,8 @@ class BeatFilterApplicator:
             )
         self.test_mode = test_mode
 
-    def get_tolerance_sec(self) -> float:
-        """Get tolerance in seconds (exaggerated in test mode)."""
+    @cached_property
+    def _tolerance_sec(self) -> float:
         if self.test_mode:
             return (
                 self.effect_config.tolerance_ms
@@ -33,27 +43,63 @@ class BeatFilterApplicator:
             )
         return self.effect_config.tolerance_ms / 1000.0
 
-    def apply_flash_filter(self, video_stream, beat_condition: str) -> any:
-        """Apply flash effect filter."""
+    def get_tolerance_sec(self) -> float:
+        """Get tolerance in seconds (exaggerated in test mode)."""
+        return self._tolerance_sec
+
+    # Effect parameters are resolved for the current mode on first use and then
+    # reused, since apply_* is called once per effect group for every render.
+
+    @cached_property
+    def _flash_intensity(self) -> int:
         if self.test_mode:
             intensity_multiplier = self.effect_config.test_mode_flash_intensity_multiplier
         else:
             intensity_multiplier = 1.0
-        intensity = int(self.effect_config.flash_intensity * intensity_multiplier)
+        return int(self.effect_config.flash_intensity * intensity_multiplier)
+
+    @cached_property
+    def _glitch_shift_pixels(self) -> int:
+        if self.test_mode:
+            glitch_intensity = self.effect_config.test_mode_glitch_intensity
+        else:
+            glitch_intensity = self.effect_config.glitch_intensity
+        return int(glitch_intensity * 10)
+
+    @cached_property
+    def _color_burst_values(self) -> tuple[float, float]:
+        if self.test_mode:
+            return (
+                self.effect_config.test_mode_color_burst_saturation,
+                self.effect_config.test_mode_color_burst_brightness,
+            )
+        return self.effect_config.color_burst_saturation, self.effect_config.color_burst_brightness
+
+    @cached_property
+    def _brightness_pulse(self) -> float:
+        if self.test_mode:
+            return self.effect_config.test_mode_brightness_pulse
+        return self.effect_config.brightness_pulse_amount
+
+    @cached_property
+    def _zoom_pulse(self) -> float:
+        if self.test_mode:
+            return self.effect_config.test_mode_zoom_pulse
+        return self.effect_config.zoom_pulse_amount
+
+    def apply_flash_filter(self, video_stream, beat_condition: str) -> any:
+        """Apply flash effect filter."""
+        flash = f"if({beat_condition},{self._flash_intensity},0)"
         return video_stream.filter(
             "geq",
-            r=f"r+if({beat_condition},{intensity},0)",
-            g=f"g+if({beat_condition},{intensity},0)",
-            b=f"b+if({beat_condition},{intensity},0)",
+            r=f"r+{flash}",
+            g=f"g+{flash}",
+            b=f"b+{flash}",
         )
 
     def apply_glitch_filter(self, video_stream, beat_condition: str) -> any:
         """Apply glitch effect filter."""
-        if self.test_mode:
-            glitch_intensity = self.effect_config.test_mode_glitch_intensity
-        else:
-            glitch_intensity = self.effect_config.glitch_intensity
-        shift_pixels = int(glitch_intensity * 10)
+        shift_pixels = self._glitch_shift_pixels
         return video_stream.filter(
             "geq",
             r=f"if({beat_condition},p(X+{shift_pixels},Y),p(X,Y))",
@@ -63,12 +109,7 @@ class BeatFilterApplicator:
 
     def apply_color_burst_filter(self, video_stream, beat_condition: str) -> any:
         """Apply color burst effect filter."""
-        if self.test_mode:
-            saturation = self.effect_config.test_mode_color_burst_saturation
-            brightness = self.effect_config.test_mode_color_burst_brightness
-        else:
-            saturation = self.effect_config.color_burst_saturation
-            brightness = self.effect_config.color_burst_brightness
+        saturation, brightness = self._color_burst_values
         return video_stream.filter(
             "eq",
             saturation=f"if({beat_condition},{saturation},1)",
@@ -77,25 +118,18 @@ class BeatFilterApplicator:
 
     def apply_brightness_pulse_filter(self, video_stream, beat_condition: str) -> any:
         """Apply brightness pulse effect filter."""
-        if self.test_mode:
-            brightness = self.effect_config.test_mode_brightness_pulse
-        else:
-            brightness = self.effect_config.brightness_pulse_amount
         return video_stream.filter(
             "eq",
-            brightness=f"if({beat_condition},{brightness},0)",
+            brightness=f"if({beat_condition},{self._brightness_pulse},0)",
         )
 
     def apply_zoom_pulse_filter(self, video_stream, beat_condition: str) -> any:
         """Apply zoom pulse effect filter."""
-        if self.test_mode:
-            zoom = self.effect_config.test_mode_zoom_pulse
-        else:
-            zoom = self.effect_config.zoom_pulse_amount
+        zoom = f"if({beat_condition},{self._zoom_pulse},1)"
         return video_stream.filter(
             "scale",
-            w=f"iw*if({beat_condition},{zoom},1)",
-            h=f"ih*if({beat_condition},{zoom},1)",
+            w=f"iw*{zoom}",
+            h=f"ih*{zoom}",
         )
 
     def apply_filter(
@@ -115,19 +149,11 @@ class BeatFilterApplicator:
         Returns:
             Filtered video stream
         """
-        if filter_type == "flash":
-            return self.apply_flash_filter(video_stream, beat_condition)
-        elif filter_type == "glitch":
-            return self.apply_glitch_filter(video_stream, beat_condition)
-        elif filter_type == "color_burst":
-            return self.apply_color_burst_filter(video_stream, beat_condition)
-        elif filter_type == "brightness_pulse":
-            return self.apply_brightness_pulse_filter(video_stream, beat_condition)
-        elif filter_type == "zoom_pulse":
-            return self.apply_zoom_pulse_filter(video_stream, beat_condition)
-        else:
+        method_name = self._FILTER_METHODS.get(filter_type)
+        if method_name is None:
             logger.warning(f"Unknown filter type: {filter_type}, skipping beat effects")
             return video_stream
+        return getattr(self, method_name)(video_stream, beat_condition)
 
     def should_chunk(self, filter_type: str, beat_count: int, chunk_size: int = 200) -> bool:
         """Determine if effect needs chunking for large beat counts."""
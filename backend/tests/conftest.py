@@ -0,0 +1,23 @@
+"""Shared pytest configuration for backend tests."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make the backend package importable however pytest is invoked (repo root or backend/)
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+
+@pytest.fixture(scope="session")
+def song_analysis_source() -> str:
+    """Source of app/services/song_analysis.py, read once per test session.
+
+    Read from disk rather than via importlib.resources so the app.services
+    package (and librosa with it) is never imported for source-level checks.
+    """
+    return (backend_dir / "app" / "services" / "song_analysis.py").read_text()
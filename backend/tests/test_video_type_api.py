@@ -6,47 +6,98 @@ error cases, and successful updates.
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator, Iterator
 from uuid import uuid4
 
-from fastapi.testclient import TestClient
-from sqlmodel import select
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.pool import NullPool
+from sqlmodel import create_engine, delete
 
+from app.core import database
 from app.core.database import init_db, session_scope
 from app.main import create_app
 from app.models.analysis import SongAnalysisRecord
+from app.models.clip import SongClip
 from app.models.song import DEFAULT_USER_ID, Song
-
-init_db()
+from app.schemas.analysis import SongAnalysis
+
+pytestmark = pytest.mark.anyio
+
+# Serialized once at import; the analysis content is identical for every test.
+_ANALYSIS_JSON = SongAnalysis(
+    durationSec=30.0,
+    bpm=128.0,
+    beatTimes=[i * 0.5 for i in range(60)],
+    sections=[],
+    moodPrimary="energetic",
+    moodTags=["energetic"],
+    moodVector={
+        "energy": 0.8,
+        "valence": 0.7,
+        "danceability": 0.6,
+        "tension": 0.5,
+    },
+    primaryGenre="Electronic",
+    subGenres=[],
+    lyricsAvailable=False,
+    sectionLyrics=[],
+).model_dump_json(by_alias=True)
 
 
 def _cleanup_song(song_id: uuid4) -> None:
-    """Clean up test song and related records."""
+    """Clean up test song and related records with bulk deletes."""
     with session_scope() as session:
-        from app.models.clip import SongClip
-
-        for clip in session.exec(
-            select(SongClip).where(SongClip.song_id == song_id)
-        ).all():
-            session.delete(clip)
-        records = session.exec(
-            select(SongAnalysisRecord).where(SongAnalysisRecord.song_id == song_id)
-        ).all()
-        for record in records:
-            session.delete(record)
-        song = session.get(Song, song_id)
-        if song:
-            session.delete(song)
-            session.commit()
+        session.exec(delete(SongClip).where(SongClip.song_id == song_id))
+        session.exec(delete(SongAnalysisRecord).where(SongAnalysisRecord.song_id == song_id))
+        session.exec(delete(Song).where(Song.id == song_id))
+        session.commit()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _db_engine() -> Iterator[None]:
+    """Point session_scope() at a NullPool engine for this module.
+
+    Every session, including those opened in the app's threadpool workers, gets
+    its own connection, so no connection is shared across threads or left
+    checked out between tests.
+    """
+    engine = create_engine(
+        database.database_url,
+        echo=False,
+        connect_args=database.connect_args,
+        poolclass=NullPool,
+    )
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(database, "engine", engine)
+        yield
+    engine.dispose()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _init_db(_db_engine: None) -> None:
+    """Create the schema when these tests run, not when the module is collected."""
+    init_db()
+
+
+@pytest.fixture(scope="module")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(scope="module")
+async def client(anyio_backend: str) -> AsyncIterator[AsyncClient]:
+    """Async client bound to the app in-process, shared across the module's tests."""
+    transport = ASGITransport(app=create_app())
+    async with AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+        yield async_client
 
 
 class TestVideoTypeEndpoint:
     """Tests for PATCH /songs/{song_id}/video-type endpoint."""
 
     def setup_method(self):
-        """Set up test client and create a test song."""
-        self.app = create_app()
-        self.client = TestClient(self.app)
-
+        """Create a test song."""
         # Create a test song
         with session_scope() as session:
             song = Song(
@@ -67,9 +118,9 @@ class TestVideoTypeEndpoint:
         """Clean up test song."""
         _cleanup_song(self.song_id)
 
-    def test_set_video_type_full_length_success(self):
+    async def test_set_video_type_full_length_success(self, client: AsyncClient):
         """Test setting video_type to full_length succeeds."""
-        response = self.client.patch(
+        response = await client.patch(
             f"/api/v1/songs/{self.song_id}/video-type",
             json={"video_type": "full_length"},
         )
@@ -83,9 +134,9 @@ class TestVideoTypeEndpoint:
             song = session.get(Song, self.song_id)
             assert song.video_type == "full_length"
 
-    def test_set_video_type_short_form_success(self):
+    async def test_set_video_type_short_form_success(self, client: AsyncClient):
         """Test setting video_type to short_form succeeds."""
-        response = self.client.patch(
+        response = await client.patch(
             f"/api/v1/songs/{self.song_id}/video-type",
             json={"video_type": "short_form"},
         )
@@ -99,9 +150,9 @@ class TestVideoTypeEndpoint:
             song = session.get(Song, self.song_id)
             assert song.video_type == "short_form"
 
-    def test_set_video_type_invalid_value(self):
+    async def test_set_video_type_invalid_value(self, client: AsyncClient):
         """Test that invalid video_type returns 422 (Pydantic validation error)."""
-        response = self.client.patch(
+        response = await client.patch(
             f"/api/v1/songs/{self.song_id}/video-type",
             json={"video_type": "invalid"},
         )
@@ -115,45 +166,23 @@ class TestVideoTypeEndpoint:
         video_type_errors = [err for err in detail if "video_type" in str(err).lower()]
         assert len(video_type_errors) > 0
 
-    def test_set_video_type_song_not_found(self):
+    async def test_set_video_type_song_not_found(self, client: AsyncClient):
         """Test that setting video_type for non-existent song returns 404."""
         fake_id = uuid4()
-        response = self.client.patch(
+        response = await client.patch(
             f"/api/v1/songs/{fake_id}/video-type",
             json={"video_type": "full_length"},
         )
 
         assert response.status_code == 404
 
-    def test_set_video_type_after_analysis_fails(self):
+    async def test_set_video_type_after_analysis_fails(self, client: AsyncClient):
         """Test that changing video_type after analysis returns 409 with correct error message."""
-        # Create a complete analysis record with all required fields
-        from app.schemas.analysis import SongAnalysis
-
-        complete_analysis = SongAnalysis(
-            durationSec=30.0,
-            bpm=128.0,
-            beatTimes=[i * 0.5 for i in range(60)],
-            sections=[],
-            moodPrimary="energetic",
-            moodTags=["energetic"],
-            moodVector={
-                "energy": 0.8,
-                "valence": 0.7,
-                "danceability": 0.6,
-                "tension": 0.5,
-            },
-            primaryGenre="Electronic",
-            subGenres=[],
-            lyricsAvailable=False,
-            sectionLyrics=[],
-        )
-
         # Create analysis record with complete JSON
         with session_scope() as session:
             analysis_record = SongAnalysisRecord(
                 song_id=self.song_id,
-                analysis_json=complete_analysis.model_dump_json(by_alias=True),
+                analysis_json=_ANALYSIS_JSON,
                 duration_sec=30.0,
                 bpm=128.0,
             )
@@ -161,7 +190,7 @@ class TestVideoTypeEndpoint:
             session.commit()
 
         # Try to set video_type - should fail with 409
-        response = self.client.patch(
+        response = await client.patch(
             f"/api/v1/songs/{self.song_id}/video-type",
             json={"video_type": "full_length"},
         )
@@ -173,33 +202,33 @@ class TestVideoTypeEndpoint:
         assert "Cannot change after analysis has been completed" in error_detail
         assert "Please upload a new song" in error_detail
 
-    def test_update_video_type_before_analysis_succeeds(self):
+    async def test_update_video_type_before_analysis_succeeds(self, client: AsyncClient):
         """Test that updating video_type before analysis succeeds."""
         # Set initial video_type
-        response1 = self.client.patch(
+        response1 = await client.patch(
             f"/api/v1/songs/{self.song_id}/video-type",
             json={"video_type": "full_length"},
         )
         assert response1.status_code == 200
 
         # Update to different type (before analysis)
-        response2 = self.client.patch(
+        response2 = await client.patch(
             f"/api/v1/songs/{self.song_id}/video-type",
             json={"video_type": "short_form"},
         )
         assert response2.status_code == 200
         assert response2.json()["video_type"] == "short_form"
 
-    def test_video_type_in_song_read_response(self):
+    async def test_video_type_in_song_read_response(self, client: AsyncClient):
         """Test that video_type is included in GET /songs/{id} response."""
         # Set video_type
-        self.client.patch(
+        await client.patch(
             f"/api/v1/songs/{self.song_id}/video-type",
             json={"video_type": "full_length"},
         )
 
         # Get song
-        response = self.client.get(f"/api/v1/songs/{self.song_id}")
+        response = await client.get(f"/api/v1/songs/{self.song_id}")
         assert response.status_code == 200
         data = response.json()
         assert "video_type" in data
@@ -3,18 +3,13 @@
 Tests that analysis pipeline uses selected audio segment when available.
 """
 
-from pathlib import Path
-
-
-
 
 class TestAnalysisUsesSelection:
     """Tests that analysis uses selected audio segment."""
 
-    def test_analysis_code_checks_selection(self):
+    def test_analysis_code_checks_selection(self, song_analysis_source):
         """Test that analysis service code checks for selection."""
-        song_analysis_path = Path(__file__).parent.parent.parent / "app" / "services" / "song_analysis.py"
-        content = song_analysis_path.read_text()
+        content = song_analysis_source
         assert "selected_start_sec" in content, \
             "Analysis service should check for selected_start_sec"
         assert "selected_end_sec" in content, \
@@ -22,33 +17,29 @@ class TestAnalysisUsesSelection:
         assert "time_offset" in content, \
             "Analysis service should use time_offset to adjust beat times"
 
-    def test_analysis_extracts_segment_when_selection_exists(self):
+    def test_analysis_extracts_segment_when_selection_exists(self, song_analysis_source):
         """Test that analysis extracts audio segment when selection exists."""
-        song_analysis_path = Path(__file__).parent.parent.parent / "app" / "services" / "song_analysis.py"
-        content = song_analysis_path.read_text()
+        content = song_analysis_source
         assert "Extract the selected segment" in content or "extract" in content.lower(), \
             "Analysis should extract audio segment when selection exists"
         assert "ffmpeg" in content.lower() or "subprocess" in content, \
             "Analysis should use ffmpeg/subprocess to extract segment"
 
-    def test_analysis_adjusts_beat_times_with_selection(self):
+    def test_analysis_adjusts_beat_times_with_selection(self, song_analysis_source):
         """Test that analysis adjusts beat times to be absolute when selection exists."""
-        song_analysis_path = Path(__file__).parent.parent.parent / "app" / "services" / "song_analysis.py"
-        content = song_analysis_path.read_text()
+        content = song_analysis_source
         assert "t + time_offset" in content or "time_offset" in content, \
             "Analysis should adjust beat times by adding time_offset"
 
-    def test_analysis_adjusts_sections_with_selection(self):
+    def test_analysis_adjusts_sections_with_selection(self, song_analysis_source):
         """Test that analysis adjusts section times to be absolute when selection exists."""
-        song_analysis_path = Path(__file__).parent.parent.parent / "app" / "services" / "song_analysis.py"
-        content = song_analysis_path.read_text()
+        content = song_analysis_source
         assert "section.start_sec + time_offset" in content or "time_offset" in content, \
             "Analysis should adjust section times by adding time_offset"
 
-    def test_analysis_uses_effective_duration_with_selection(self):
+    def test_analysis_uses_effective_duration_with_selection(self, song_analysis_source):
         """Test that analysis uses selected duration when selection exists."""
-        song_analysis_path = Path(__file__).parent.parent.parent / "app" / "services" / "song_analysis.py"
-        content = song_analysis_path.read_text()
+        content = song_analysis_source
         assert "effective_duration" in content, \
             "Analysis should use effective_duration when selection exists"
         assert "selection_end_sec - selection_start_sec" in content, \
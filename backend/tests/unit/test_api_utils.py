@@ -1,5 +1,6 @@
 """Unit tests for API utility functions."""
 
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 from uuid import uuid4
 
@@ -7,8 +8,6 @@ import pytest
 from fastapi import HTTPException
 
 from app.api.v1.utils import ensure_no_analysis, update_song_field, verify_song_ownership
-from app.models.song import Song
-from app.models.user import User
 
 
 class TestUpdateSongField:
@@ -17,9 +16,7 @@ class TestUpdateSongField:
     def test_updates_field_and_commits(self):
         """Test that field is updated and changes are committed."""
         song_id = uuid4()
-        mock_song = Mock(spec=Song)
-        mock_song.id = song_id
-        mock_song.video_type = None
+        mock_song = SimpleNamespace(id=song_id, video_type=None)
 
         mock_db = Mock()
 
@@ -75,22 +72,18 @@ class TestVerifySongOwnership:
 
     def test_valid_ownership_passes(self):
         """Test that same user_id passes verification."""
-        song = Mock(spec=Song)
-        song.user_id = "user_123"
+        song = SimpleNamespace(user_id="user_123")
         
-        current_user = Mock(spec=User)
-        current_user.id = "user_123"
+        current_user = SimpleNamespace(id="user_123")
         
         # Should not raise any exception
         verify_song_ownership(song, current_user)
 
     def test_invalid_ownership_raises_403(self):
         """Test that different user_id raises 403 Forbidden."""
-        song = Mock(spec=Song)
-        song.user_id = "user_123"
+        song = SimpleNamespace(user_id="user_123")
         
-        current_user = Mock(spec=User)
-        current_user.id = "user_456"  # Different user
+        current_user = SimpleNamespace(id="user_456")  # Different user
         
         with pytest.raises(HTTPException) as exc_info:
             verify_song_ownership(song, current_user)
@@ -100,11 +93,9 @@ class TestVerifySongOwnership:
 
     def test_ownership_check_uses_correct_error_message(self):
         """Test error message is clear and helpful."""
-        song = Mock(spec=Song)
-        song.user_id = "user_123"
+        song = SimpleNamespace(user_id="user_123")
         
-        current_user = Mock(spec=User)
-        current_user.id = "user_456"
+        current_user = SimpleNamespace(id="user_456")
         
         with pytest.raises(HTTPException) as exc_info:
             verify_song_ownership(song, current_user)
@@ -6,31 +6,44 @@ audio segments for composition.
 
 from __future__ import annotations
 
+import subprocess
+from collections.abc import Iterator
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 
 import pytest
 
 from app.services.clip_generation import _extract_audio_segment
 
 
+@pytest.fixture
+def mock_run(monkeypatch: pytest.MonkeyPatch) -> Iterator[Mock]:
+    """Patch settings and a successful subprocess.run; yield the run mock."""
+    mock_settings = Mock(ffmpeg_bin="/usr/bin/ffmpeg")
+    monkeypatch.setattr("app.services.clip_generation.get_settings", lambda: mock_settings)
+    run = Mock(return_value=Mock(returncode=0))
+    monkeypatch.setattr("app.services.clip_generation.subprocess.run", run)
+    yield run
+
+
+def _parse_ffmpeg_cmd(cmd: list[str]) -> dict[str, str]:
+    """Map each ``-flag value`` pair in an ffmpeg command to a dict in one pass."""
+    flags: dict[str, str] = {}
+    i = 0
+    while i < len(cmd):
+        if cmd[i].startswith("-") and i + 1 < len(cmd) and not cmd[i + 1].startswith("-"):
+            flags[cmd[i]] = cmd[i + 1]
+            i += 2
+        else:
+            i += 1
+    return flags
+
+
 class TestExtractAudioSegment:
     """Tests for _extract_audio_segment function."""
 
-    @patch("app.services.clip_generation.get_settings")
-    @patch("app.services.clip_generation.subprocess.run")
-    def test_extract_audio_segment_calls_ffmpeg_correctly(self, mock_run, mock_get_settings):
+    def test_extract_audio_segment_calls_ffmpeg_correctly(self, mock_run):
         """Test that ffmpeg is called with correct parameters."""
-        # Mock settings
-        mock_settings = Mock()
-        mock_settings.ffmpeg_bin = "/usr/bin/ffmpeg"
-        mock_get_settings.return_value = mock_settings
-
-        # Mock successful subprocess run
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
-
         audio_path = Path("/tmp/input.wav")
         output_path = Path("/tmp/output.wav")
         start_sec = 10.0
@@ -54,43 +67,20 @@ class TestExtractAudioSegment:
         # Verify ffmpeg binary
         assert cmd[0] == "/usr/bin/ffmpeg"
 
-        # Verify input file
-        assert "-i" in cmd
-        input_idx = cmd.index("-i")
-        assert cmd[input_idx + 1] == str(audio_path)
-
-        # Verify start time (-ss)
-        assert "-ss" in cmd
-        ss_idx = cmd.index("-ss")
-        assert float(cmd[ss_idx + 1]) == start_sec
-
-        # Verify duration (-t)
-        assert "-t" in cmd
-        t_idx = cmd.index("-t")
-        assert float(cmd[t_idx + 1]) == expected_duration
+        flags = _parse_ffmpeg_cmd(cmd)
+        assert flags["-i"] == str(audio_path)
+        assert float(flags["-ss"]) == start_sec
+        assert float(flags["-t"]) == expected_duration
+        assert flags["-acodec"] == "copy"
 
         # Verify output file
         assert str(output_path) in cmd
 
-        # Verify codec copy flag
-        assert "-acodec" in cmd
-        acodec_idx = cmd.index("-acodec")
-        assert cmd[acodec_idx + 1] == "copy"
-
         # Verify overwrite flag
         assert "-y" in cmd
 
-    @patch("app.services.clip_generation.get_settings")
-    @patch("app.services.clip_generation.subprocess.run")
-    def test_extract_audio_segment_handles_ffmpeg_failure(self, mock_run, mock_get_settings):
+    def test_extract_audio_segment_handles_ffmpeg_failure(self, mock_run):
         """Test that RuntimeError is raised when ffmpeg fails."""
-        import subprocess
-
-        # Mock settings
-        mock_settings = Mock()
-        mock_settings.ffmpeg_bin = "/usr/bin/ffmpeg"
-        mock_get_settings.return_value = mock_settings
-
         # Mock failed subprocess run - CalledProcessError is raised when check=True and process fails
         mock_run.side_effect = subprocess.CalledProcessError(
             returncode=1,
@@ -109,18 +99,9 @@ class TestExtractAudioSegment:
                 output_path=output_path,
             )
 
-    @patch("app.services.clip_generation.get_settings")
-    @patch("app.services.clip_generation.subprocess.run")
-    def test_extract_audio_segment_handles_timeout(self, mock_run, mock_get_settings):
+    def test_extract_audio_segment_handles_timeout(self, mock_run):
         """Test that timeout is handled correctly."""
-        # Mock settings
-        mock_settings = Mock()
-        mock_settings.ffmpeg_bin = "/usr/bin/ffmpeg"
-        mock_get_settings.return_value = mock_settings
-
         # Mock timeout
-        import subprocess
-
         mock_run.side_effect = subprocess.TimeoutExpired(cmd=["ffmpeg"], timeout=60.0)
 
         audio_path = Path("/tmp/input.wav")
@@ -134,20 +115,8 @@ class TestExtractAudioSegment:
                 output_path=output_path,
             )
 
-    @patch("app.services.clip_generation.get_settings")
-    @patch("app.services.clip_generation.subprocess.run")
-    def test_extract_audio_segment_calculates_duration_correctly(self, mock_run, mock_get_settings):
+    def test_extract_audio_segment_calculates_duration_correctly(self, mock_run):
         """Test that duration is calculated correctly from start and end times."""
-        # Mock settings
-        mock_settings = Mock()
-        mock_settings.ffmpeg_bin = "/usr/bin/ffmpeg"
-        mock_get_settings.return_value = mock_settings
-
-        # Mock successful subprocess run
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
-
         audio_path = Path("/tmp/input.wav")
         output_path = Path("/tmp/output.wav")
 
@@ -170,26 +139,12 @@ class TestExtractAudioSegment:
             )
 
             # Verify duration in command
-            call_args = mock_run.call_args
-            cmd = call_args[0][0]
-            t_idx = cmd.index("-t")
-            actual_duration = float(cmd[t_idx + 1])
+            cmd = mock_run.call_args[0][0]
+            actual_duration = float(_parse_ffmpeg_cmd(cmd)["-t"])
             assert actual_duration == pytest.approx(expected_duration, abs=0.01)
 
-    @patch("app.services.clip_generation.get_settings")
-    @patch("app.services.clip_generation.subprocess.run")
-    def test_extract_audio_segment_uses_codec_copy(self, mock_run, mock_get_settings):
+    def test_extract_audio_segment_uses_codec_copy(self, mock_run):
         """Test that -acodec copy is used to avoid re-encoding."""
-        # Mock settings
-        mock_settings = Mock()
-        mock_settings.ffmpeg_bin = "/usr/bin/ffmpeg"
-        mock_get_settings.return_value = mock_settings
-
-        # Mock successful subprocess run
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
-
         audio_path = Path("/tmp/input.wav")
         output_path = Path("/tmp/output.wav")
 
@@ -201,9 +156,6 @@ class TestExtractAudioSegment:
         )
 
         # Verify codec copy is used
-        call_args = mock_run.call_args
-        cmd = call_args[0][0]
-        assert "-acodec" in cmd
-        acodec_idx = cmd.index("-acodec")
-        assert cmd[acodec_idx + 1] == "copy"
+        cmd = mock_run.call_args[0][0]
+        assert _parse_ffmpeg_cmd(cmd)["-acodec"] == "copy"
 
@@ -6,359 +6,205 @@ Covers configuration validation, critical error handling, and response parsing.
 Run with: pytest backend/tests/unit/test_audjust_client.py -v
 """
 
-import sys
+import io
+import re
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from typing import Any
 
-# Add backend directory to path for direct execution
-backend_dir = Path(__file__).parent.parent
-if str(backend_dir) not in sys.path:
-    sys.path.insert(0, str(backend_dir))
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
 
-import httpx  # noqa: E402
-import pytest  # noqa: E402
-from app.services.audjust_client import (  # noqa: E402
+from app.services import audjust_client
+from app.services.audjust_client import (
     AudjustConfigurationError,
     AudjustRequestError,
     fetch_structure_segments,
 )
 
+pytestmark = pytest.mark.unit
+
+AUDIO_PATH = Path("/tmp/test.mp3")
+
+_RE_MISSING_CREDENTIALS = re.compile(r"credentials are not configured")
+_RE_MISSING_URLS = re.compile(r"did not return storage/retrieval URLs")
+_RE_UPLOAD_URL = re.compile(r"Failed to obtain Audjust upload URL")
+_RE_UPLOAD = re.compile(r"Failed to upload audio to Audjust storage")
+_RE_STRUCTURE_CALL = re.compile(r"Failed to call Audjust structure endpoint")
+_RE_STATUS_400 = re.compile(r"status 400")
+_RE_INVALID_JSON = re.compile(r"not valid JSON")
+_RE_MISSING_SECTIONS = re.compile(r"did not include sections")
+
+DEFAULT_SETTINGS = SimpleNamespace(
+    audjust_base_url="https://api.audjust.com",
+    audjust_api_key="test-key",
+    audjust_upload_path="/upload",
+    audjust_structure_path="/structure",
+    audjust_timeout_sec=30.0,
+)
+
+UPLOAD_URL = "https://api.audjust.com/upload"
+STORAGE_URL = "https://storage.example.com/upload"
+STRUCTURE_URL = "https://api.audjust.com/structure"
+
+UPLOAD_PAYLOAD = {
+    "storageUrl": STORAGE_URL,
+    "retrievalUrl": "https://storage.example.com/retrieve",
+}
+
+# (stage, method, url, default add_response kwargs) in the order the client calls them.
+_STAGES = (
+    ("get", "GET", UPLOAD_URL, {"json": UPLOAD_PAYLOAD}),
+    ("put", "PUT", STORAGE_URL, {}),
+    (
+        "post",
+        "POST",
+        STRUCTURE_URL,
+        {
+            "json": {
+                "sections": [
+                    {"startMs": 0, "endMs": 5000, "label": 100},
+                    {"startMs": 5000, "endMs": 10000, "label": 200},
+                ]
+            }
+        },
+    ),
+)
+
+
+def _mock_audjust(
+    httpx_mock: HTTPXMock, until: str = "post", **overrides: dict[str, Any] | Exception
+) -> None:
+    """Register the Audjust calls in order, up to and including stage ``until``.
+
+    Each override replaces a stage's add_response kwargs, or is raised from
+    that stage when it is an exception. Later stages are left unregistered
+    because the client never reaches them and httpx_mock asserts every
+    registered response is requested.
+    """
+    for stage, method, url, default in _STAGES:
+        override = overrides.get(stage, default)
+        if isinstance(override, Exception):
+            httpx_mock.add_exception(override, method=method, url=url)
+        else:
+            httpx_mock.add_response(method=method, url=url, **override)
+        if stage == until:
+            return
+
+
+def _fake_open(*args: Any, **kwargs: Any) -> io.BytesIO:
+    """Stand in for Path.open; BytesIO already supports the with-statement."""
+    return io.BytesIO(b"fake audio data")
+
+
+@pytest.fixture
+def audjust_http(monkeypatch: pytest.MonkeyPatch, httpx_mock: HTTPXMock) -> HTTPXMock:
+    """Patch settings and file reads; HTTP is intercepted at the transport by httpx_mock."""
+    monkeypatch.setattr(audjust_client, "get_settings", lambda: DEFAULT_SETTINGS)
+    monkeypatch.setattr(audjust_client.Path, "open", _fake_open)
+    return httpx_mock
+
 
 class TestConfigurationErrors:
     """Test configuration validation."""
 
-    @patch("app.services.audjust_client.get_settings")
-    def test_missing_credentials(self, mock_get_settings):
+    def test_missing_credentials(self, monkeypatch):
         """Test that missing credentials raises AudjustConfigurationError."""
-        mock_settings = MagicMock()
-        mock_settings.audjust_base_url = None
-        mock_settings.audjust_api_key = None
-        mock_get_settings.return_value = mock_settings
+        mock_settings = SimpleNamespace(
+            **{**vars(DEFAULT_SETTINGS), "audjust_base_url": None, "audjust_api_key": None}
+        )
+        monkeypatch.setattr(audjust_client, "get_settings", lambda: mock_settings)
 
-        with pytest.raises(AudjustConfigurationError, match="credentials are not configured"):
-            fetch_structure_segments(Path("/tmp/test.mp3"))
+        with pytest.raises(AudjustConfigurationError, match=_RE_MISSING_CREDENTIALS):
+            fetch_structure_segments(AUDIO_PATH)
 
 
 class TestUploadUrlRequest:
     """Test upload URL request handling."""
 
-    @patch("app.services.audjust_client.get_settings")
-    @patch("app.services.audjust_client.httpx.get")
-    def test_upload_url_http_error(self, mock_get, mock_get_settings):
-        """Test that HTTP error on upload URL raises AudjustRequestError."""
-        mock_settings = MagicMock()
-        mock_settings.audjust_base_url = "https://api.audjust.com"
-        mock_settings.audjust_api_key = "test-key"
-        mock_settings.audjust_timeout_sec = 30.0
-        mock_get_settings.return_value = mock_settings
-
-        mock_response = MagicMock()
-        mock_response.raise_for_status.side_effect = httpx.HTTPError("Connection error")
-        mock_get.return_value = mock_response
-
-        with pytest.raises(AudjustRequestError, match="Failed to obtain Audjust upload URL"):
-            fetch_structure_segments(Path("/tmp/test.mp3"))
-
-    @patch("app.services.audjust_client.get_settings")
-    @patch("app.services.audjust_client.httpx.get")
-    def test_missing_storage_url(self, mock_get, mock_get_settings):
+    def test_missing_storage_url(self, audjust_http):
         """Test that missing storageUrl raises AudjustRequestError."""
-        mock_settings = MagicMock()
-        mock_settings.audjust_base_url = "https://api.audjust.com"
-        mock_settings.audjust_api_key = "test-key"
-        mock_settings.audjust_timeout_sec = 30.0
-        mock_get_settings.return_value = mock_settings
-
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "retrievalUrl": "https://storage.example.com/retrieve",
-            # Missing storageUrl
-        }
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
-
-        with pytest.raises(AudjustRequestError, match="did not return storage/retrieval URLs"):
-            fetch_structure_segments(Path("/tmp/test.mp3"))
-
-
-class TestFileUpload:
-    """Test file upload handling."""
-
-    @patch("app.services.audjust_client.Path.open")
-    @patch("app.services.audjust_client.get_settings")
-    @patch("app.services.audjust_client.httpx.put")
-    @patch("app.services.audjust_client.httpx.get")
-    def test_upload_http_error(self, mock_get, mock_put, mock_get_settings, mock_path_open):
-        """Test that HTTP error on upload raises AudjustRequestError."""
-        mock_settings = MagicMock()
-        mock_settings.audjust_base_url = "https://api.audjust.com"
-        mock_settings.audjust_api_key = "test-key"
-        mock_settings.audjust_timeout_sec = 30.0
-        mock_get_settings.return_value = mock_settings
-
-        upload_response = MagicMock()
-        upload_response.json.return_value = {
-            "storageUrl": "https://storage.example.com/upload",
-            "retrievalUrl": "https://storage.example.com/retrieve",
-        }
-        upload_response.raise_for_status = MagicMock()
-        mock_get.return_value = upload_response
-
-        put_response = MagicMock()
-        put_response.raise_for_status.side_effect = httpx.HTTPError("Upload failed")
-        mock_put.return_value = put_response
-
-        # Mock file opening
-        mock_file_handle = MagicMock()
-        mock_file_handle.read.return_value = b"fake audio data"
-        mock_path_open.return_value.__enter__.return_value = mock_file_handle
-
-        with pytest.raises(AudjustRequestError, match="Failed to upload audio to Audjust storage"):
-            fetch_structure_segments(Path("/tmp/test.mp3"))
+        _mock_audjust(
+            audjust_http,
+            until="get",
+            get={
+                "json": {
+                    "retrievalUrl": "https://storage.example.com/retrieve",
+                    # Missing storageUrl
+                }
+            },
+        )
+
+        with pytest.raises(AudjustRequestError, match=_RE_MISSING_URLS):
+            fetch_structure_segments(AUDIO_PATH)
 
 
 class TestStructureApiCall:
     """Test structure API call handling."""
 
-    @patch("app.services.audjust_client.Path.open")
-    @patch("app.services.audjust_client.get_settings")
-    @patch("app.services.audjust_client.httpx.post")
-    @patch("app.services.audjust_client.httpx.put")
-    @patch("app.services.audjust_client.httpx.get")
-    def test_structure_success(self, mock_get, mock_put, mock_post, mock_get_settings, mock_path_open):
+    def test_structure_success(self, audjust_http):
         """Test successful structure API call."""
-        mock_settings = MagicMock()
-        mock_settings.audjust_base_url = "https://api.audjust.com"
-        mock_settings.audjust_api_key = "test-key"
-        mock_settings.audjust_upload_path = "/upload"
-        mock_settings.audjust_structure_path = "/structure"
-        mock_settings.audjust_timeout_sec = 30.0
-        mock_get_settings.return_value = mock_settings
-
-        upload_response = MagicMock()
-        upload_response.json.return_value = {
-            "storageUrl": "https://storage.example.com/upload",
-            "retrievalUrl": "https://storage.example.com/retrieve",
-        }
-        upload_response.raise_for_status = MagicMock()
-        mock_get.return_value = upload_response
-
-        put_response = MagicMock()
-        put_response.raise_for_status = MagicMock()
-        mock_put.return_value = put_response
-
-        structure_response = MagicMock()
-        structure_response.status_code = 200
-        structure_response.json.return_value = {
-            "sections": [
-                {"startMs": 0, "endMs": 5000, "label": 100},
-                {"startMs": 5000, "endMs": 10000, "label": 200},
-            ]
-        }
-        mock_post.return_value = structure_response
-
-        # Mock file opening
-        mock_file_handle = MagicMock()
-        mock_file_handle.read.return_value = b"fake audio data"
-        mock_path_open.return_value.__enter__.return_value = mock_file_handle
-
-        result = fetch_structure_segments(Path("/tmp/test.mp3"))
+        _mock_audjust(audjust_http)
+
+        result = fetch_structure_segments(AUDIO_PATH)
         assert len(result) == 2
         assert result[0]["label"] == 100
         assert result[1]["label"] == 200
 
-    @patch("app.services.audjust_client.Path.open")
-    @patch("app.services.audjust_client.get_settings")
-    @patch("app.services.audjust_client.httpx.post")
-    @patch("app.services.audjust_client.httpx.put")
-    @patch("app.services.audjust_client.httpx.get")
-    def test_structure_http_error(self, mock_get, mock_put, mock_post, mock_get_settings, mock_path_open):
-        """Test that HTTP error on structure call raises AudjustRequestError."""
-        mock_settings = MagicMock()
-        mock_settings.audjust_base_url = "https://api.audjust.com"
-        mock_settings.audjust_api_key = "test-key"
-        mock_settings.audjust_timeout_sec = 30.0
-        mock_get_settings.return_value = mock_settings
-
-        upload_response = MagicMock()
-        upload_response.json.return_value = {
-            "storageUrl": "https://storage.example.com/upload",
-            "retrievalUrl": "https://storage.example.com/retrieve",
-        }
-        upload_response.raise_for_status = MagicMock()
-        mock_get.return_value = upload_response
-
-        put_response = MagicMock()
-        put_response.raise_for_status = MagicMock()
-        mock_put.return_value = put_response
-
-        mock_post.side_effect = httpx.HTTPError("Structure API error")
-
-        # Mock file opening
-        mock_file_handle = MagicMock()
-        mock_file_handle.read.return_value = b"fake audio data"
-        mock_path_open.return_value.__enter__.return_value = mock_file_handle
-
-        with pytest.raises(AudjustRequestError, match="Failed to call Audjust structure endpoint"):
-            fetch_structure_segments(Path("/tmp/test.mp3"))
-
-    @patch("app.services.audjust_client.Path.open")
-    @patch("app.services.audjust_client.get_settings")
-    @patch("app.services.audjust_client.httpx.post")
-    @patch("app.services.audjust_client.httpx.put")
-    @patch("app.services.audjust_client.httpx.get")
-    def test_structure_status_400(self, mock_get, mock_put, mock_post, mock_get_settings, mock_path_open):
-        """Test that status code >= 400 raises AudjustRequestError."""
-        mock_settings = MagicMock()
-        mock_settings.audjust_base_url = "https://api.audjust.com"
-        mock_settings.audjust_api_key = "test-key"
-        mock_settings.audjust_timeout_sec = 30.0
-        mock_get_settings.return_value = mock_settings
-
-        upload_response = MagicMock()
-        upload_response.json.return_value = {
-            "storageUrl": "https://storage.example.com/upload",
-            "retrievalUrl": "https://storage.example.com/retrieve",
-        }
-        upload_response.raise_for_status = MagicMock()
-        mock_get.return_value = upload_response
-
-        put_response = MagicMock()
-        put_response.raise_for_status = MagicMock()
-        mock_put.return_value = put_response
-
-        structure_response = MagicMock()
-        structure_response.status_code = 400
-        structure_response.text = "Bad Request"
-        mock_post.return_value = structure_response
-
-        # Mock file opening
-        mock_file_handle = MagicMock()
-        mock_file_handle.read.return_value = b"fake audio data"
-        mock_path_open.return_value.__enter__.return_value = mock_file_handle
-
-        with pytest.raises(AudjustRequestError, match="status 400"):
-            fetch_structure_segments(Path("/tmp/test.mp3"))
+
+class TestRequestErrors:
+    """Test that a failure at any HTTP stage raises AudjustRequestError."""
+
+    @pytest.mark.parametrize(
+        "stage,failure,match",
+        [
+            pytest.param("get", {"status_code": 500}, _RE_UPLOAD_URL, id="upload-url-http-error"),
+            pytest.param("put", {"status_code": 500}, _RE_UPLOAD, id="upload-http-error"),
+            pytest.param(
+                "post",
+                httpx.ConnectError("Structure API error"),
+                _RE_STRUCTURE_CALL,
+                id="structure-http-error",
+            ),
+            pytest.param(
+                "post",
+                {"status_code": 400, "text": "Bad Request"},
+                _RE_STATUS_400,
+                id="structure-status-400",
+            ),
+        ],
+    )
+    def test_stage_failure(self, audjust_http, stage, failure, match):
+        """Test that each failing stage surfaces its own error message."""
+        _mock_audjust(audjust_http, until=stage, **{stage: failure})
+
+        with pytest.raises(AudjustRequestError, match=match):
+            fetch_structure_segments(AUDIO_PATH)
 
 
 class TestResponseParsing:
     """Test response parsing logic."""
 
-    @patch("app.services.audjust_client.Path.open")
-    @patch("app.services.audjust_client.get_settings")
-    @patch("app.services.audjust_client.httpx.post")
-    @patch("app.services.audjust_client.httpx.put")
-    @patch("app.services.audjust_client.httpx.get")
-    def test_sections_nested_in_result(self, mock_get, mock_put, mock_post, mock_get_settings, mock_path_open):
-        """Test parsing sections from nested result structure (both formats)."""
-        mock_settings = MagicMock()
-        mock_settings.audjust_base_url = "https://api.audjust.com"
-        mock_settings.audjust_api_key = "test-key"
-        mock_settings.audjust_timeout_sec = 30.0
-        mock_get_settings.return_value = mock_settings
-
-        upload_response = MagicMock()
-        upload_response.json.return_value = {
-            "storageUrl": "https://storage.example.com/upload",
-            "retrievalUrl": "https://storage.example.com/retrieve",
-        }
-        upload_response.raise_for_status = MagicMock()
-        mock_get.return_value = upload_response
-
-        put_response = MagicMock()
-        put_response.raise_for_status = MagicMock()
-        mock_put.return_value = put_response
-
-        # Test nested format
-        structure_response = MagicMock()
-        structure_response.status_code = 200
-        structure_response.json.return_value = {
-            "result": {
-                "sections": [{"startMs": 0, "endMs": 5000, "label": 100}]
-            }
-        }
-        mock_post.return_value = structure_response
-
-        # Mock file opening
-        mock_file_handle = MagicMock()
-        mock_file_handle.read.return_value = b"fake audio data"
-        mock_path_open.return_value.__enter__.return_value = mock_file_handle
-
-        result = fetch_structure_segments(Path("/tmp/test.mp3"))
-        assert len(result) == 1
-
-    @patch("app.services.audjust_client.Path.open")
-    @patch("app.services.audjust_client.get_settings")
-    @patch("app.services.audjust_client.httpx.post")
-    @patch("app.services.audjust_client.httpx.put")
-    @patch("app.services.audjust_client.httpx.get")
-    def test_invalid_json(self, mock_get, mock_put, mock_post, mock_get_settings, mock_path_open):
-        """Test that invalid JSON raises AudjustRequestError."""
-        mock_settings = MagicMock()
-        mock_settings.audjust_base_url = "https://api.audjust.com"
-        mock_settings.audjust_api_key = "test-key"
-        mock_settings.audjust_timeout_sec = 30.0
-        mock_get_settings.return_value = mock_settings
-
-        upload_response = MagicMock()
-        upload_response.json.return_value = {
-            "storageUrl": "https://storage.example.com/upload",
-            "retrievalUrl": "https://storage.example.com/retrieve",
-        }
-        upload_response.raise_for_status = MagicMock()
-        mock_get.return_value = upload_response
-
-        put_response = MagicMock()
-        put_response.raise_for_status = MagicMock()
-        mock_put.return_value = put_response
-
-        structure_response = MagicMock()
-        structure_response.status_code = 200
-        structure_response.json.side_effect = ValueError("Invalid JSON")
-        mock_post.return_value = structure_response
-
-        # Mock file opening
-        mock_file_handle = MagicMock()
-        mock_file_handle.read.return_value = b"fake audio data"
-        mock_path_open.return_value.__enter__.return_value = mock_file_handle
-
-        with pytest.raises(AudjustRequestError, match="not valid JSON"):
-            fetch_structure_segments(Path("/tmp/test.mp3"))
-
-    @patch("app.services.audjust_client.Path.open")
-    @patch("app.services.audjust_client.get_settings")
-    @patch("app.services.audjust_client.httpx.post")
-    @patch("app.services.audjust_client.httpx.put")
-    @patch("app.services.audjust_client.httpx.get")
-    def test_missing_sections(self, mock_get, mock_put, mock_post, mock_get_settings, mock_path_open):
-        """Test that missing sections raises AudjustRequestError."""
-        mock_settings = MagicMock()
-        mock_settings.audjust_base_url = "https://api.audjust.com"
-        mock_settings.audjust_api_key = "test-key"
-        mock_settings.audjust_timeout_sec = 30.0
-        mock_get_settings.return_value = mock_settings
-
-        upload_response = MagicMock()
-        upload_response.json.return_value = {
-            "storageUrl": "https://storage.example.com/upload",
-            "retrievalUrl": "https://storage.example.com/retrieve",
-        }
-        upload_response.raise_for_status = MagicMock()
-        mock_get.return_value = upload_response
-
-        put_response = MagicMock()
-        put_response.raise_for_status = MagicMock()
-        mock_put.return_value = put_response
-
-        structure_response = MagicMock()
-        structure_response.status_code = 200
-        structure_response.json.return_value = {}  # No sections
-        mock_post.return_value = structure_response
-
-        # Mock file opening
-        mock_file_handle = MagicMock()
-        mock_file_handle.read.return_value = b"fake audio data"
-        mock_path_open.return_value.__enter__.return_value = mock_file_handle
-
-        with pytest.raises(AudjustRequestError, match="did not include sections"):
-            fetch_structure_segments(Path("/tmp/test.mp3"))
+    @pytest.mark.parametrize(
+        "structure_response,expect_error,expect_len",
+        [
+            pytest.param(
+                {"json": {"result": {"sections": [{"startMs": 0, "endMs": 5000, "label": 100}]}}},
+                None,
+                1,
+                id="sections-nested-in-result",
+            ),
+            pytest.param({"text": "<html>oops</html>"}, _RE_INVALID_JSON, None, id="invalid-json"),
+            pytest.param({"json": {}}, _RE_MISSING_SECTIONS, None, id="missing-sections"),
+        ],
+    )
+    def test_structure_payload(self, audjust_http, structure_response, expect_error, expect_len):
+        """Test how the structure response body is parsed or rejected."""
+        _mock_audjust(audjust_http, post=structure_response)
+
+        if expect_error is not None:
+            with pytest.raises(AudjustRequestError, match=expect_error):
+                fetch_structure_segments(AUDIO_PATH)
+        else:
+            assert len(fetch_structure_segments(AUDIO_PATH)) == expect_len
@@ -6,22 +6,19 @@ Validates security-critical authentication logic in isolation.
 Run with: pytest backend/tests/unit/test_auth.py -v
 """
 
-import sys
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
-from pathlib import Path
+from functools import lru_cache
 from unittest.mock import Mock
 
 import jwt
 import pytest
 from fastapi import HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials
+from freezegun import freeze_time
 
-# Add backend directory to path for direct execution
-backend_dir = Path(__file__).parent.parent
-if str(backend_dir) not in sys.path:
-    sys.path.insert(0, str(backend_dir))
-
-from app.core.auth import (  # noqa: E402
+from app.core.auth import (
     JWT_ALGORITHM,
     JWT_EXPIRATION_HOURS,
     JWT_SECRET_KEY,
@@ -31,84 +28,133 @@ from app.core.auth import (  # noqa: E402
     hash_password,
     verify_password,
 )
-from app.models.user import User  # noqa: E402
+from app.models.user import User
+
+pytestmark = pytest.mark.unit
+
+FROZEN_NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+@dataclass
+class _FakeUser:
+    """Stand-in for User; get_current_user only passes it through."""
+
+    id: str
+
+
+@pytest.fixture
+def frozen_now():
+    """Freeze the clock at FROZEN_NOW; tests can ``tick()`` it forward."""
+    with freeze_time(FROZEN_NOW) as frozen:
+        yield frozen
+
+
+@pytest.fixture(scope="session")
+def sample_password() -> str:
+    return "test_password"
+
+
+@pytest.fixture(scope="session")
+def sample_hash(sample_password: str) -> str:
+    """Hash of sample_password, computed once for the whole session."""
+    return hash_password(sample_password)
+
+
+@pytest.fixture(scope="session")
+def sample_user_id() -> str:
+    return "user_123"
+
+
+@pytest.fixture(scope="session")
+def token_factory() -> Callable[[str], str]:
+    """create_access_token memoized per user_id for the whole session.
+
+    Cached tokens stay valid for JWT_EXPIRATION_HOURS, far longer than a test run.
+    """
+    return lru_cache(maxsize=None)(create_access_token)
+
+
+@pytest.fixture(scope="session")
+def sample_token(token_factory: Callable[[str], str], sample_user_id: str) -> str:
+    """Access token for sample_user_id, encoded once for the whole session."""
+    return token_factory(sample_user_id)
+
+
+@pytest.fixture(scope="session")
+def expired_token(sample_user_id: str) -> str:
+    """Token issued far enough before FROZEN_NOW that it expired an hour before it."""
+    with freeze_time(FROZEN_NOW - timedelta(hours=JWT_EXPIRATION_HOURS + 1)):
+        return create_access_token(sample_user_id)
+
+
+@pytest.fixture(scope="session")
+def wrong_secret_token(sample_user_id: str) -> str:
+    """Unexpired token signed with a key the app does not know."""
+    return jwt.encode(
+        {"sub": sample_user_id, "exp": datetime.now(UTC) + timedelta(hours=1)},
+        "wrong-secret-key",
+        algorithm=JWT_ALGORITHM,
+    )
 
 
 class TestHashPassword:
     """Test password hashing functions."""
 
-    def test_hash_password_returns_hex_string(self):
+    def test_hash_password_returns_hex_string(self, sample_hash):
         """Test that hash_password returns a hex string."""
-        result = hash_password("test_password")
-        assert isinstance(result, str)
-        assert len(result) == 64  # SHA-256 hex digest length
-
-    def test_hash_password_deterministic(self):
-        """Test that same password produces same hash."""
-        password = "test_password"
-        hash1 = hash_password(password)
-        hash2 = hash_password(password)
-        assert hash1 == hash2
-
-    def test_hash_password_different_passwords(self):
-        """Test that different passwords produce different hashes."""
-        hash1 = hash_password("password1")
-        hash2 = hash_password("password2")
-        assert hash1 != hash2
-
-    def test_verify_password_correct(self):
-        """Test verify_password returns True for correct password."""
-        password = "test_password"
-        hashed = hash_password(password)
-        assert verify_password(password, hashed) is True
-
-    def test_verify_password_incorrect(self):
-        """Test verify_password returns False for incorrect password."""
-        password = "test_password"
-        hashed = hash_password(password)
-        assert verify_password("wrong_password", hashed) is False
-
-    def test_verify_password_different_hash(self):
-        """Test verify_password returns False for different hash."""
-        password = "test_password"
-        hashed2 = hash_password("different_password")
-        assert verify_password(password, hashed2) is False
+        assert isinstance(sample_hash, str)
+        assert len(sample_hash) == 64  # SHA-256 hex digest length
+
+    @pytest.mark.parametrize(
+        "password_a,password_b,equal",
+        [
+            pytest.param("test_password", "test_password", True, id="deterministic"),
+            pytest.param("password1", "password2", False, id="different-passwords"),
+            pytest.param("test_password", "different_password", False, id="different-hash"),
+        ],
+    )
+    def test_hash_equivalence(self, password_a, password_b, equal):
+        """Test that hashes match exactly when the passwords match."""
+        assert (hash_password(password_a) == hash_password(password_b)) is equal
+
+    @pytest.mark.parametrize(
+        "candidate,expected",
+        [("test_password", True), ("wrong_password", False)],
+    )
+    def test_verify_password(self, sample_hash, candidate, expected):
+        """Test verify_password accepts only the password that produced the hash."""
+        assert verify_password(candidate, sample_hash) is expected
 
 
 class TestCreateAccessToken:
     """Test JWT token creation."""
 
-    def test_creates_valid_jwt(self):
+    def test_creates_valid_jwt(self, sample_user_id, sample_token):
         """Test token can be decoded and contains user_id."""
-        user_id = "user_123"
-        token = create_access_token(user_id)
-        
-        assert isinstance(token, str)
-        assert len(token) > 0
+        assert isinstance(sample_token, str)
+        assert len(sample_token) > 0
         
         # Decode and verify
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        assert payload["sub"] == user_id
+        payload = jwt.decode(sample_token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        assert payload["sub"] == sample_user_id
 
-    def test_token_contains_expiration(self):
+    def test_token_contains_expiration(self, sample_user_id, frozen_now):
         """Test token has exp claim."""
-        user_id = "user_123"
-        token = create_access_token(user_id)
+        token = create_access_token(sample_user_id)
         
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
         assert "exp" in payload
         assert "iat" in payload
         
-        # Check expiration is approximately 7 days from now
+        # Expiration is exactly 7 days after the frozen issue time
+        assert datetime.fromtimestamp(payload["iat"], tz=UTC) == FROZEN_NOW
         exp_time = datetime.fromtimestamp(payload["exp"], tz=UTC)
-        expected_exp = datetime.now(UTC) + timedelta(hours=JWT_EXPIRATION_HOURS)
-        # Allow 1 minute tolerance
-        assert abs((exp_time - expected_exp).total_seconds()) < 60
+        assert exp_time == FROZEN_NOW + timedelta(hours=JWT_EXPIRATION_HOURS)
 
-    def test_token_contains_user_id_in_sub(self):
+    def test_token_contains_user_id_in_sub(self, token_factory):
         """Test token contains user_id in 'sub' claim."""
         user_id = "user_456"
-        token = create_access_token(user_id)
+        token = token_factory(user_id)
         
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
         assert payload["sub"] == user_id
@@ -117,25 +163,13 @@ class TestCreateAccessToken:
 class TestDecodeAccessToken:
     """Test JWT token decoding."""
 
-    def test_valid_token_returns_user_id(self):
+    def test_valid_token_returns_user_id(self, sample_user_id, sample_token):
         """Test valid token decodes correctly."""
-        user_id = "user_123"
-        token = create_access_token(user_id)
-        
-        decoded_id = decode_access_token(token)
-        assert decoded_id == user_id
+        decoded_id = decode_access_token(sample_token)
+        assert decoded_id == sample_user_id
 
-    def test_expired_token_returns_none(self):
+    def test_expired_token_returns_none(self, expired_token):
         """Test expired token returns None."""
-        # Create an expired token
-        expiration = datetime.now(UTC) - timedelta(hours=1)  # Expired 1 hour ago
-        payload = {
-            "sub": "user_123",
-            "exp": expiration,
-            "iat": datetime.now(UTC) - timedelta(hours=2),
-        }
-        expired_token = jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
-        
         result = decode_access_token(expired_token)
         assert result is None
 
@@ -151,96 +185,77 @@ class TestDecodeAccessToken:
         result = decode_access_token(malformed_token)
         assert result is None
 
-    def test_token_with_wrong_secret_returns_none(self):
+    def test_token_with_wrong_secret_returns_none(self, wrong_secret_token):
         """Test token signed with wrong secret returns None."""
-        wrong_secret = "wrong-secret-key"
-        token = jwt.encode(
-            {"sub": "user_123", "exp": datetime.now(UTC) + timedelta(hours=1)},
-            wrong_secret,
-            algorithm=JWT_ALGORITHM,
-        )
-        
-        result = decode_access_token(token)
+        result = decode_access_token(wrong_secret_token)
         assert result is None
 
 
+@pytest.fixture
+def auth_credentials() -> HTTPAuthorizationCredentials:
+    """Bearer credentials; tests assign the token under test to ``.credentials``."""
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials="")
+
+
+@pytest.fixture
+def mock_user_db() -> Mock:
+    return Mock()
+
+
 class TestGetCurrentUser:
     """Test get_current_user dependency function."""
 
-    def test_missing_credentials_raises_401(self):
+    def test_missing_credentials_raises_401(self, mock_user_db):
         """Test missing auth header raises 401."""
-        mock_db = Mock()
-        
         with pytest.raises(HTTPException) as exc_info:
-            get_current_user(credentials=None, db=mock_db)
+            get_current_user(credentials=None, db=mock_user_db)
         
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
         assert "Authentication required" in exc_info.value.detail
 
-    def test_invalid_token_raises_401(self):
+    def test_invalid_token_raises_401(self, auth_credentials, mock_user_db):
         """Test invalid token raises 401."""
-        mock_credentials = Mock(spec=HTTPAuthorizationCredentials)
-        mock_credentials.credentials = "invalid_token"
-        mock_db = Mock()
+        auth_credentials.credentials = "invalid_token"
         
         with pytest.raises(HTTPException) as exc_info:
-            get_current_user(credentials=mock_credentials, db=mock_db)
+            get_current_user(credentials=auth_credentials, db=mock_user_db)
         
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
         assert "Invalid or expired token" in exc_info.value.detail
 
-    def test_expired_token_raises_401(self):
+    def test_expired_token_raises_401(self, auth_credentials, mock_user_db, expired_token):
         """Test expired token raises 401."""
-        # Create expired token
-        expiration = datetime.now(UTC) - timedelta(hours=1)
-        payload = {
-            "sub": "user_123",
-            "exp": expiration,
-            "iat": datetime.now(UTC) - timedelta(hours=2),
-        }
-        expired_token = jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
-        
-        mock_credentials = Mock(spec=HTTPAuthorizationCredentials)
-        mock_credentials.credentials = expired_token
-        mock_db = Mock()
+        auth_credentials.credentials = expired_token
         
         with pytest.raises(HTTPException) as exc_info:
-            get_current_user(credentials=mock_credentials, db=mock_db)
+            get_current_user(credentials=auth_credentials, db=mock_user_db)
         
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
 
-    def test_user_not_found_raises_401(self):
+    def test_user_not_found_raises_401(self, auth_credentials, mock_user_db, token_factory):
         """Test non-existent user raises 401."""
         user_id = "nonexistent_user"
-        token = create_access_token(user_id)
+        token = token_factory(user_id)
         
-        mock_credentials = Mock(spec=HTTPAuthorizationCredentials)
-        mock_credentials.credentials = token
-        mock_db = Mock()
-        mock_db.get.return_value = None  # User not found
+        auth_credentials.credentials = token
+        mock_user_db.get.return_value = None  # User not found
         
         with pytest.raises(HTTPException) as exc_info:
-            get_current_user(credentials=mock_credentials, db=mock_db)
+            get_current_user(credentials=auth_credentials, db=mock_user_db)
         
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
         assert "User not found" in exc_info.value.detail
-        mock_db.get.assert_called_once_with(User, user_id)
+        mock_user_db.get.assert_called_once_with(User, user_id)
 
-    def test_valid_token_returns_user(self):
+    def test_valid_token_returns_user(self, sample_user_id, sample_token, auth_credentials, mock_user_db):
         """Test valid token with existing user returns user."""
-        user_id = "user_123"
-        token = create_access_token(user_id)
-        
-        mock_user = Mock(spec=User)
-        mock_user.id = user_id
+        mock_user = _FakeUser(id=sample_user_id)
         
-        mock_credentials = Mock(spec=HTTPAuthorizationCredentials)
-        mock_credentials.credentials = token
-        mock_db = Mock()
-        mock_db.get.return_value = mock_user
+        auth_credentials.credentials = sample_token
+        mock_user_db.get.return_value = mock_user
         
-        result = get_current_user(credentials=mock_credentials, db=mock_db)
+        result = get_current_user(credentials=auth_credentials, db=mock_user_db)
         
         assert result == mock_user
-        mock_db.get.assert_called_once_with(User, user_id)
+        mock_user_db.get.assert_called_once_with(User, sample_user_id)
 
@@ -7,27 +7,71 @@ Run with: pytest backend/tests/unit/test_beat_alignment.py -v
 Or from backend/: pytest tests/unit/test_beat_alignment.py -v
 """
 
-import sys
-from pathlib import Path
+from collections.abc import Sequence
 
-# Add backend directory to path for direct execution
-backend_dir = Path(__file__).parent.parent
-if str(backend_dir) not in sys.path:
-    sys.path.insert(0, str(backend_dir))
+import numpy as np
+import pytest
 
-import pytest  # noqa: E402
-from app.services.beat_alignment import (  # noqa: E402
+from app.services.beat_alignment import (
     MAX_CLIP_DURATION,
     MIN_CLIP_DURATION,
+    ClipBoundary,
+    ClipBoundaryArray,
     calculate_beat_aligned_boundaries,
     calculate_beat_aligned_clip_boundaries,
     find_nearest_beat_index,
+    find_nearest_beat_indices,
     map_beats_to_frames,
     validate_boundaries,
     verify_beat_aligned_transitions,
 )
 
 
+def _beat_grid(num_beats: int) -> np.ndarray:
+    """Read-only 120 BPM beat grid (one beat every 0.5s) starting at 0.0."""
+    beats = np.arange(num_beats, dtype=np.float64) * 0.5
+    beats.setflags(write=False)
+    return beats
+
+
+def _boundaries_to_arrays(
+    boundaries: Sequence[ClipBoundary],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Collect (starts, ends, durations, start_beats, end_beats) for batched asserts."""
+    count = len(boundaries)
+    return (
+        np.fromiter((b.start_time for b in boundaries), dtype=np.float64, count=count),
+        np.fromiter((b.end_time for b in boundaries), dtype=np.float64, count=count),
+        np.fromiter((b.duration_sec for b in boundaries), dtype=np.float64, count=count),
+        np.fromiter((b.start_beat_index for b in boundaries), dtype=np.int64, count=count),
+        np.fromiter((b.end_beat_index for b in boundaries), dtype=np.int64, count=count),
+    )
+
+
+@pytest.fixture(scope="session")
+def beats_10s_120bpm():
+    """120 BPM beats covering 0-10 seconds."""
+    return _beat_grid(21)
+
+
+@pytest.fixture(scope="session")
+def beats_30s_120bpm():
+    """120 BPM beats covering 0-30 seconds."""
+    return _beat_grid(61)
+
+
+@pytest.fixture(scope="session")
+def beats_60s_120bpm():
+    """120 BPM beats covering 0-60 seconds."""
+    return _beat_grid(121)
+
+
+@pytest.fixture(scope="session")
+def boundaries_10s_120bpm(beats_10s_120bpm):
+    """Default-FPS boundaries for the 10-second grid, shared by read-only tests."""
+    return calculate_beat_aligned_boundaries(beats_10s_120bpm, 10.0)
+
+
 class TestMapBeatsToFrames:
     """Test beat-to-frame mapping algorithm."""
 
@@ -53,15 +97,15 @@ class TestMapBeatsToFrames:
 
         # Beat 0: 0.000s → Frame 0 (0.000s), error = 0.000s
         assert alignments[0].frame_index == 0
-        assert alignments[0].error_sec == pytest.approx(0.0, abs=0.001)
+        assert alignments[0].error_sec <= 0.001
 
         # Beat 1: 0.545s → Frame 4 (0.500s), error ≈ 0.045s
         assert alignments[1].frame_index == 4
-        assert alignments[1].error_sec == pytest.approx(0.045, abs=0.001)
+        assert abs(alignments[1].error_sec - 0.045) <= 0.001
 
         # Beat 2: 1.091s → Frame 9 (1.125s), error ≈ 0.034s
         assert alignments[2].frame_index == 9
-        assert alignments[2].error_sec == pytest.approx(0.034, abs=0.001)
+        assert abs(alignments[2].error_sec - 0.034) <= 0.001
 
     def test_higher_fps_improves_alignment(self):
         """Test that higher FPS reduces alignment error."""
@@ -84,6 +128,34 @@ class TestMapBeatsToFrames:
             assert alignment.frame_index >= 0
             assert alignment.error_sec >= 0
 
+    def test_columns_match_rows(self):
+        """Test that the per-field arrays agree with the row view."""
+        beat_times = [0.0, 0.545, 1.091]
+        alignments = map_beats_to_frames(beat_times, fps=8.0)
+
+        assert alignments.beat_index.tolist() == [0, 1, 2]
+        assert alignments.frame_index.tolist() == [a.frame_index for a in alignments]
+        assert alignments.error_sec.tolist() == [a.error_sec for a in alignments]
+
+    def test_list_and_array_inputs_align_identically(self):
+        """Test that a beat grid given as a list or numpy array maps to the same frames."""
+        beat_times = [0.0, 0.5, 1.0, 1.5, 2.0]
+
+        from_list = map_beats_to_frames(beat_times, fps=8.0)
+        from_array = map_beats_to_frames(np.array(beat_times), fps=8.0)
+
+        assert np.array_equal(from_array.frame_index, from_list.frame_index)
+        assert np.array_equal(from_array.frame_time, from_list.frame_time)
+        assert np.array_equal(from_array.error_sec, from_list.error_sec)
+
+    def test_non_terminating_fps_uses_exact_rate(self):
+        """Test that NTSC-style rates like 30000/1001 are not rounded before frame math."""
+        fps = 30000 / 1001
+        alignments = map_beats_to_frames([10.0], fps=fps)
+
+        assert alignments.frame_index.tolist() == [300]
+        assert abs(alignments.frame_time[0] - 300 / fps) <= 1e-12
+
 
 class TestFindNearestBeatIndex:
     """Test finding nearest beat index."""
@@ -107,6 +179,16 @@ class TestFindNearestBeatIndex:
         assert find_nearest_beat_index(-0.1, beat_times) == 0  # Before first beat
         assert find_nearest_beat_index(2.5, beat_times) == 2  # After last beat
 
+    def test_batched_lookup_matches_single(self):
+        """Test that the batched lookup agrees with per-time lookups."""
+        beat_times = [0.0, 1.0, 2.0, 3.0]
+        times = [-0.1, 0.5, 1.4, 1.6, 3.5]
+
+        indices = find_nearest_beat_indices(times, beat_times)
+
+        assert indices.tolist() == [find_nearest_beat_index(t, beat_times) for t in times]
+        assert indices.tolist() == [0, 0, 1, 2, 3]  # Ties resolve to the earlier beat
+
 
 class TestCalculateBeatAlignedBoundaries:
     """Test clip boundary calculation algorithm."""
@@ -126,15 +208,15 @@ class TestCalculateBeatAlignedBoundaries:
 
         assert len(boundaries) > 0
         # Each boundary should have valid duration
-        for boundary in boundaries:
-            assert MIN_CLIP_DURATION <= boundary.duration_sec <= MAX_CLIP_DURATION * 1.1
-            assert boundary.start_time < boundary.end_time
-            assert boundary.start_beat_index <= boundary.end_beat_index
+        starts, ends, durations, start_beats, end_beats = _boundaries_to_arrays(boundaries)
+        assert ((durations >= MIN_CLIP_DURATION) & (durations <= MAX_CLIP_DURATION * 1.1)).all()
+        assert (starts < ends).all()
+        assert (start_beats <= end_beats).all()
 
-    def test_duration_constraints(self):
+    def test_duration_constraints(self, beats_30s_120bpm):
         """Test that all clips respect 3-6 second duration constraints."""
         # Create beats for a 30-second song at 120 BPM (0.5s per beat)
-        beat_times = [i * 0.5 for i in range(61)]  # 30 seconds
+        beat_times = beats_30s_120bpm
         song_duration = 30.0
 
         boundaries = calculate_beat_aligned_boundaries(
@@ -143,26 +225,22 @@ class TestCalculateBeatAlignedBoundaries:
         )
 
         assert len(boundaries) > 0
-        for boundary in boundaries:
-            # Allow 10% tolerance for edge cases
-            assert boundary.duration_sec >= MIN_CLIP_DURATION * 0.9
-            assert boundary.duration_sec <= MAX_CLIP_DURATION * 1.1
+        durations = _boundaries_to_arrays(boundaries)[2]
+        # Allow 10% tolerance for edge cases
+        assert (durations >= MIN_CLIP_DURATION * 0.9).all()
+        assert (durations <= MAX_CLIP_DURATION * 1.1).all()
 
-    def test_boundaries_cover_full_song(self):
+    def test_boundaries_cover_full_song(self, beats_10s_120bpm, boundaries_10s_120bpm):
         """Test that boundaries cover the entire song duration."""
-        beat_times = [i * 0.5 for i in range(21)]  # 10 seconds
+        beat_times = beats_10s_120bpm
         song_duration = 10.0
-
-        boundaries = calculate_beat_aligned_boundaries(
-            beat_times=beat_times,
-            song_duration=song_duration,
-        )
+        boundaries = boundaries_10s_120bpm
 
         assert len(boundaries) > 0
         # First boundary should start at or near first beat
-        assert boundaries[0].start_time == pytest.approx(beat_times[0], abs=0.1)
+        assert abs(boundaries[0].start_time - beat_times[0]) <= 0.1
         # Last boundary should end at or near song duration
-        assert boundaries[-1].end_time == pytest.approx(song_duration, abs=0.1)
+        assert abs(boundaries[-1].end_time - song_duration) <= 0.1
 
     def test_short_song(self):
         """Test boundary calculation for short song (just over min duration)."""
@@ -181,10 +259,10 @@ class TestCalculateBeatAlignedBoundaries:
         assert boundaries[0].start_time <= 0.1
         assert boundaries[-1].end_time >= song_duration - 0.1
 
-    def test_long_song(self):
+    def test_long_song(self, beats_60s_120bpm):
         """Test boundary calculation for longer song."""
         # 60-second song at 120 BPM
-        beat_times = [i * 0.5 for i in range(121)]  # 60 seconds
+        beat_times = beats_60s_120bpm
         song_duration = 60.0
 
         boundaries = calculate_beat_aligned_boundaries(
@@ -196,54 +274,35 @@ class TestCalculateBeatAlignedBoundaries:
         assert len(boundaries) >= 5  # At least 5 clips for 60 seconds
         # Total coverage should match song duration
         total_coverage = boundaries[-1].end_time - boundaries[0].start_time
-        assert total_coverage == pytest.approx(song_duration, abs=1.0)
+        assert abs(total_coverage - song_duration) <= 1.0
 
-    def test_different_fps_values(self):
+    @pytest.mark.parametrize("fps", [8.0, 30.0])
+    def test_valid_boundaries_any_fps(self, beats_10s_120bpm, fps):
         """Test that different FPS values produce valid boundaries."""
-        beat_times = [i * 0.5 for i in range(21)]  # 10 seconds
-        song_duration = 10.0
-
-        boundaries_8fps = calculate_beat_aligned_boundaries(
-            beat_times=beat_times,
-            song_duration=song_duration,
-            fps=8.0,
-        )
-
-        boundaries_30fps = calculate_beat_aligned_boundaries(
-            beat_times=beat_times,
-            song_duration=song_duration,
-            fps=30.0,
+        boundaries = calculate_beat_aligned_boundaries(
+            beat_times=beats_10s_120bpm,
+            song_duration=10.0,
+            fps=fps,
         )
 
-        # Both should produce valid boundaries
-        assert len(boundaries_8fps) > 0
-        assert len(boundaries_30fps) > 0
-
-        # Both should respect duration constraints
-        for boundary in boundaries_8fps + boundaries_30fps:
-            assert boundary.duration_sec >= MIN_CLIP_DURATION * 0.9
-            assert boundary.duration_sec <= MAX_CLIP_DURATION * 1.1
+        assert len(boundaries) > 0
+        durations = _boundaries_to_arrays(boundaries)[2]
+        assert (durations >= MIN_CLIP_DURATION * 0.9).all()
+        assert (durations <= MAX_CLIP_DURATION * 1.1).all()
 
-    def test_beats_in_clip_metadata(self):
+    def test_beats_in_clip_metadata(self, boundaries_10s_120bpm):
         """Test that beats_in_clip metadata is correct."""
-        beat_times = [i * 0.5 for i in range(21)]  # 10 seconds
-        song_duration = 10.0
-
-        boundaries = calculate_beat_aligned_boundaries(
-            beat_times=beat_times,
-            song_duration=song_duration,
-        )
+        boundaries = boundaries_10s_120bpm
+        # beats_in_clip should be a sequence of indices
+        assert all(isinstance(b.beats_in_clip, Sequence) for b in boundaries)
 
         for boundary in boundaries:
-            # beats_in_clip should be a list
-            assert isinstance(boundary.beats_in_clip, list)
             # Should contain beat indices from start to end
             assert boundary.start_beat_index in boundary.beats_in_clip
             assert boundary.end_beat_index in boundary.beats_in_clip
             # Should be sequential
-            if len(boundary.beats_in_clip) > 1:
-                for i in range(len(boundary.beats_in_clip) - 1):
-                    assert boundary.beats_in_clip[i] < boundary.beats_in_clip[i + 1]
+            beats = np.asarray(boundary.beats_in_clip, dtype=np.int64)
+            assert (np.diff(beats) > 0).all()
 
     def test_empty_beat_times_raises_error(self):
         """Test that empty beat_times raises ValueError."""
@@ -270,28 +329,71 @@ class TestCalculateBeatAlignedBoundaries:
             )
 
 
+class TestClipBoundaryArray:
+    """Test the structure-of-arrays boundary container."""
+
+    def test_round_trip_from_boundaries(self):
+        """Test that columns round-trip back to the original ClipBoundary tuples."""
+        boundaries = [
+            ClipBoundary(
+                start_time=0.0, end_time=3.5,
+                start_beat_index=0, end_beat_index=7,
+                start_frame_index=0, end_frame_index=84,
+                start_alignment_error=0.0, end_alignment_error=0.0,
+                duration_sec=3.5, beats_in_clip=list(range(0, 8))
+            ),
+            ClipBoundary(
+                start_time=3.5, end_time=7.0,
+                start_beat_index=7, end_beat_index=14,
+                start_frame_index=84, end_frame_index=168,
+                start_alignment_error=0.0, end_alignment_error=0.0,
+                duration_sec=3.5, beats_in_clip=list(range(7, 15))
+            ),
+        ]
+
+        array = ClipBoundaryArray.from_boundaries(boundaries)
+
+        assert len(array) == 2
+        assert array.end_time.tolist() == [3.5, 7.0]
+        assert list(array) == boundaries
+        assert array[-1] == boundaries[-1]
+        assert list(array[1:]) == boundaries[1:]
+        assert type(array[0].end_frame_index) is int
+
+    def test_with_offset_shifts_times_only(self, boundaries_10s_120bpm):
+        """Test that with_offset moves start/end times but keeps indices."""
+        array = boundaries_10s_120bpm
+
+        shifted = array.with_offset(2.0)
+
+        assert np.allclose(shifted.start_time, array.start_time + 2.0)
+        assert shifted.start_beat_index.tolist() == array.start_beat_index.tolist()
+        assert shifted.duration_sec.tolist() == array.duration_sec.tolist()
+
+
 class TestValidateBoundaries:
     """Test boundary validation logic."""
 
-    def test_valid_boundaries(self):
-        """Test validation of well-aligned boundaries."""
-        beat_times = [i * 0.5 for i in range(21)]  # 10 seconds
+    @pytest.mark.parametrize("fps", [8.0, 30.0])
+    def test_valid_boundaries(self, beats_10s_120bpm, fps):
+        """Test validation of well-aligned boundaries at different FPS values."""
+        beat_times = beats_10s_120bpm
         song_duration = 10.0
 
         boundaries = calculate_beat_aligned_boundaries(
             beat_times=beat_times,
             song_duration=song_duration,
-            fps=8.0,
+            fps=fps,
         )
 
+        # Validate with same FPS
         is_valid, max_error, avg_error = validate_boundaries(
             boundaries=boundaries,
             beat_times=beat_times,
             song_duration=song_duration,
-            fps=8.0,
+            fps=fps,
         )
 
-        # Should be valid for well-aligned boundaries
         assert isinstance(is_valid, bool)
         assert max_error >= 0
         assert avg_error >= 0
@@ -308,30 +410,6 @@ class TestValidateBoundaries:
         assert max_error == 0.0
         assert avg_error == 0.0
 
-    def test_validation_with_different_fps(self):
-        """Test that validation works with different FPS values."""
-        beat_times = [i * 0.5 for i in range(21)]
-        song_duration = 10.0
-
-        boundaries = calculate_beat_aligned_boundaries(
-            beat_times=beat_times,
-            song_duration=song_duration,
-            fps=30.0,
-        )
-
-        # Validate with same FPS
-        is_valid_30, max_error_30, avg_error_30 = validate_boundaries(
-            boundaries=boundaries,
-            beat_times=beat_times,
-            song_duration=song_duration,
-            fps=30.0,
-        )
-
-        # Higher FPS should generally have lower errors
-        assert isinstance(is_valid_30, bool)
-        assert max_error_30 >= 0
-        assert avg_error_30 >= 0
-
 
 class TestCalculateBeatAlignedClipBoundaries:
     """Test beat-aligned clip boundaries with user selection support.
@@ -340,9 +418,9 @@ class TestCalculateBeatAlignedClipBoundaries:
     This ensures boundaries are correctly calculated for selected segments.
     """
 
-    def test_without_user_selection(self):
+    def test_without_user_selection(self, beats_10s_120bpm):
         """Test boundary calculation without user selection (full song)."""
-        beat_times = [i * 0.5 for i in range(21)]  # 10 seconds
+        beat_times = beats_10s_120bpm
         song_duration = 10.0
         
         boundaries = calculate_beat_aligned_clip_boundaries(
@@ -353,34 +431,42 @@ class TestCalculateBeatAlignedClipBoundaries:
         
         assert len(boundaries) > 0
         # First boundary should start at first beat
-        assert boundaries[0].start_time == pytest.approx(beat_times[0], abs=0.1)
+        assert abs(boundaries[0].start_time - beat_times[0]) <= 0.1
         # Last boundary should end near song duration
-        assert boundaries[-1].end_time == pytest.approx(song_duration, abs=0.5)
+        assert abs(boundaries[-1].end_time - song_duration) <= 0.5
+
+    @pytest.mark.parametrize(
+        "beats_fixture, sel_start, sel_end",
+        [
+            ("beats_60s_120bpm", 10.0, 40.0),  # 30s selection from a 60s song
+            ("beats_10s_120bpm", 2.0, 8.0),
+        ],
+    )
+    def test_user_selection_range(self, request, beats_fixture, sel_start, sel_end):
+        """Test that boundaries stay within the user selection, in absolute time."""
+        beat_times = request.getfixturevalue(beats_fixture)
 
-    def test_with_user_selection_30s(self):
-        """Test boundary calculation with 30-second user selection."""
-        beat_times = [i * 0.5 for i in range(121)]  # 60 seconds of beats
-        song_duration = 60.0
-        
-        # User selects 10-40 second segment
         boundaries = calculate_beat_aligned_clip_boundaries(
             beat_times=beat_times,
-            song_duration=song_duration,
+            song_duration=float(beat_times[-1]),
             num_clips=6,
-            user_selection_start=10.0,
-            user_selection_end=40.0,
+            user_selection_start=sel_start,
+            user_selection_end=sel_end,
         )
-        
+
         assert len(boundaries) > 0
-        # First boundary should start at or after user selection start
-        assert boundaries[0].start_time >= 10.0
+        # Boundaries should be in absolute time (not relative to selection start)
+        assert boundaries[0].start_time >= sel_start
+        # Beat indices should refer to the full beat list, not the selected slice
+        assert beat_times[boundaries[0].start_beat_index] >= sel_start
+        assert beat_times[boundaries[-1].end_beat_index] <= sel_end
         # Last boundary may extend slightly beyond selection end to meet duration constraints
         # But should start within selection
-        assert boundaries[-1].start_time <= 40.0
+        assert boundaries[-1].start_time <= sel_end
 
-    def test_user_selection_filters_beats(self):
+    def test_user_selection_filters_beats(self, beats_10s_120bpm):
         """Test that user selection filters beats correctly."""
-        beat_times = [i * 0.5 for i in range(21)]  # 0-10 seconds
+        beat_times = beats_10s_120bpm
         song_duration = 10.0
         
         # Select 2-6 second segment
@@ -392,29 +478,9 @@ class TestCalculateBeatAlignedClipBoundaries:
         )
         
         # Boundaries should only use beats in the 2-6 second range
-        for boundary in boundaries:
-            assert boundary.start_time >= 2.0
-            assert boundary.end_time <= 6.0
-
-    def test_user_selection_adjusts_times(self):
-        """Test that boundaries are adjusted for user selection offset."""
-        beat_times = [i * 0.5 for i in range(21)]  # 0-10 seconds
-        song_duration = 10.0
-        
-        # Select 2-8 second segment (longer to ensure we get boundaries)
-        boundaries = calculate_beat_aligned_clip_boundaries(
-            beat_times=beat_times,
-            song_duration=song_duration,
-            user_selection_start=2.0,
-            user_selection_end=8.0,
-        )
-        
-        # Should have at least one boundary
-        assert len(boundaries) > 0
-        # Boundaries should be in absolute time (not relative to selection start)
-        assert boundaries[0].start_time >= 2.0
-        # Last boundary may extend slightly beyond selection end to meet duration constraints
-        assert boundaries[-1].start_time <= 8.0
+        starts, ends = _boundaries_to_arrays(boundaries)[:2]
+        assert (starts >= 2.0).all()
+        assert (ends <= 6.0).all()
 
 
 class TestVerifyBeatAlignedTransitions:
@@ -427,7 +493,6 @@ class TestVerifyBeatAlignedTransitions:
     def test_perfect_alignment(self):
         """Test verification when all transitions are perfectly aligned."""
         beat_times = [0.0, 1.0, 2.0, 3.0, 4.0]
-        from app.services.beat_alignment import ClipBoundary
         
         boundaries = [
             ClipBoundary(
@@ -450,12 +515,11 @@ class TestVerifyBeatAlignedTransitions:
         
         assert all_aligned is True
         assert len(errors) == 1  # One transition
-        assert errors[0] == pytest.approx(0.0, abs=0.001)
+        assert abs(errors[0]) <= 0.001
 
     def test_transitions_within_tolerance(self):
         """Test verification when transitions are within tolerance."""
         beat_times = [0.0, 1.0, 2.0, 3.0]
-        from app.services.beat_alignment import ClipBoundary
         
         boundaries = [
             ClipBoundary(
@@ -483,7 +547,6 @@ class TestVerifyBeatAlignedTransitions:
     def test_transitions_outside_tolerance(self):
         """Test verification when transitions exceed tolerance."""
         beat_times = [0.0, 1.0, 2.0, 3.0]
-        from app.services.beat_alignment import ClipBoundary
         
         boundaries = [
             ClipBoundary(
@@ -511,7 +574,6 @@ class TestVerifyBeatAlignedTransitions:
     def test_multiple_transitions(self):
         """Test verification with multiple clip transitions."""
         beat_times = [i * 0.5 for i in range(11)]  # 0-5 seconds
-        from app.services.beat_alignment import ClipBoundary
         
         boundaries = [
             ClipBoundary(
@@ -541,5 +603,5 @@ class TestVerifyBeatAlignedTransitions:
         
         assert all_aligned is True
         assert len(errors) == 2  # Two transitions between three clips
-        assert all(error <= 0.05 for error in errors)
+        assert (np.asarray(errors) <= 0.05).all()
 
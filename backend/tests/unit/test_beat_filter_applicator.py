@@ -7,39 +7,55 @@ Run with: pytest backend/tests/unit/test_beat_filter_applicator.py -v
 """
 
 import os
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
+import pytest
 
 from app.core.config import BeatEffectConfig
 from app.services.beat_filter_applicator import BeatFilterApplicator
 
 
+_DEFAULT_CONFIG = {
+    "flash_intensity": 50.0,
+    "glitch_intensity": 0.3,
+    "color_burst_saturation": 1.5,
+    "color_burst_brightness": 0.1,
+    "brightness_pulse_amount": 0.15,
+    "zoom_pulse_amount": 1.05,
+    "tolerance_ms": 20.0,
+    "test_mode_enabled": False,
+    "test_mode_tolerance_multiplier": 3.0,
+    "test_mode_flash_intensity_multiplier": 3.0,
+    "test_mode_glitch_intensity": 0.8,
+    "test_mode_color_burst_saturation": 2.0,
+    "test_mode_color_burst_brightness": 0.2,
+    "test_mode_brightness_pulse": 0.3,
+    "test_mode_zoom_pulse": 1.15,
+}
+
+
 def create_test_config(**overrides):
-    """Create a test BeatEffectConfig with default values."""
-    # Use model_validate to create config with overrides
-    defaults = {
-        "flash_intensity": 50.0,
-        "glitch_intensity": 0.3,
-        "color_burst_saturation": 1.5,
-        "color_burst_brightness": 0.1,
-        "brightness_pulse_amount": 0.15,
-        "zoom_pulse_amount": 1.05,
-        "tolerance_ms": 20.0,
-        "test_mode_enabled": False,
-        "test_mode_tolerance_multiplier": 3.0,
-        "test_mode_flash_intensity_multiplier": 3.0,
-        "test_mode_glitch_intensity": 0.8,
-        "test_mode_color_burst_saturation": 2.0,
-        "test_mode_color_burst_brightness": 0.2,
-        "test_mode_brightness_pulse": 0.3,
-        "test_mode_zoom_pulse": 1.15,
-    }
-    defaults.update(overrides)
-    # Create a mock config object instead of using Pydantic
-    config = Mock(spec=BeatEffectConfig)
-    for key, value in defaults.items():
-        setattr(config, key, value)
-    return config
+    """Create a plain stand-in for BeatEffectConfig with default values."""
+    return SimpleNamespace(**{**_DEFAULT_CONFIG, **overrides})
+
+
+@pytest.fixture(scope="module")
+def normal_applicator():
+    """Default-config applicator in normal mode, shared by read-only tests."""
+    return BeatFilterApplicator(effect_config=create_test_config(), test_mode=False)
+
+
+@pytest.fixture(scope="module")
+def test_mode_applicator():
+    """Default-config applicator in test mode, shared by read-only tests."""
+    return BeatFilterApplicator(effect_config=create_test_config(), test_mode=True)
+
+
+@pytest.fixture
+def stream_stub():
+    """Fresh stand-in for an ffmpeg stream; only ``.filter`` is used."""
+    return Mock(spec=["filter"])
 
 
 class TestBeatFilterApplicatorInitialization:
@@ -48,7 +64,8 @@ class TestBeatFilterApplicatorInitialization:
     @patch("app.services.beat_filter_applicator.get_beat_effect_config")
     def test_default_config_used_when_none_provided(self, mock_get_config):
         """Test that default config is used when none provided."""
-        mock_config = create_test_config()
+        mock_config = Mock(spec=BeatEffectConfig)
+        mock_config.test_mode_enabled = False
         mock_get_config.return_value = mock_config
         applicator = BeatFilterApplicator()
         assert applicator.effect_config is not None
@@ -86,292 +103,195 @@ class TestBeatFilterApplicatorInitialization:
 class TestGetToleranceSec:
     """Test tolerance calculation."""
 
-    def test_normal_mode_tolerance(self):
+    def test_normal_mode_tolerance(self, normal_applicator):
         """Test tolerance in normal mode uses config value."""
-        config = create_test_config(tolerance_ms=20.0)
-        applicator = BeatFilterApplicator(effect_config=config, test_mode=False)
+        applicator = normal_applicator
         assert applicator.get_tolerance_sec() == 0.02  # 20ms / 1000
 
-    def test_test_mode_tolerance_multiplier(self):
+    def test_test_mode_tolerance_multiplier(self, test_mode_applicator):
         """Test tolerance in test mode uses multiplier."""
-        config = create_test_config(tolerance_ms=20.0, test_mode_tolerance_multiplier=3.0)
-        applicator = BeatFilterApplicator(effect_config=config, test_mode=True)
+        applicator = test_mode_applicator
         expected = (20.0 * 3.0) / 1000.0  # 60ms / 1000
         assert applicator.get_tolerance_sec() == expected
 
 
-class TestFlashFilter:
-    """Test flash effect filter application."""
-
-    def test_flash_filter_normal_mode(self):
-        """Test flash filter uses correct intensity in normal mode."""
-        config = create_test_config(flash_intensity=50.0)
-        applicator = BeatFilterApplicator(effect_config=config, test_mode=False)
-        mock_stream = Mock()
-        
-        applicator.apply_flash_filter(mock_stream, "min(1,condition)")
-        
-        mock_stream.filter.assert_called_once()
-        call_args = mock_stream.filter.call_args
-        assert call_args[0][0] == "geq"
-        assert "r+if(min(1,condition),50,0)" in call_args[1]["r"]
-        assert "g+if(min(1,condition),50,0)" in call_args[1]["g"]
-        assert "b+if(min(1,condition),50,0)" in call_args[1]["b"]
-
-    def test_flash_filter_test_mode_multiplier(self):
-        """Test flash filter multiplies intensity in test mode."""
-        config = create_test_config(
-            flash_intensity=50.0,
-            test_mode_flash_intensity_multiplier=3.0
-        )
-        applicator = BeatFilterApplicator(effect_config=config, test_mode=True)
-        mock_stream = Mock()
-        
-        applicator.apply_flash_filter(mock_stream, "min(1,condition)")
-        
-        call_args = mock_stream.filter.call_args
-        # Should be 50 * 3 = 150
-        assert "r+if(min(1,condition),150,0)" in call_args[1]["r"]
-
-
-class TestGlitchFilter:
-    """Test glitch effect filter application."""
-
-    def test_glitch_filter_normal_mode(self):
-        """Test glitch filter uses correct intensity in normal mode."""
-        config = create_test_config(glitch_intensity=0.3)
-        applicator = BeatFilterApplicator(effect_config=config, test_mode=False)
-        mock_stream = Mock()
-        
-        applicator.apply_glitch_filter(mock_stream, "min(1,condition)")
-        
-        call_args = mock_stream.filter.call_args
-        assert call_args[0][0] == "geq"
-        # shift_pixels = 0.3 * 10 = 3
-        assert "p(X+3,Y)" in call_args[1]["r"]
-        assert "p(X-3,Y)" in call_args[1]["b"]
-
-    def test_glitch_filter_test_mode(self):
-        """Test glitch filter uses test mode intensity."""
-        config = create_test_config(
-            glitch_intensity=0.3,
-            test_mode_glitch_intensity=0.8
-        )
-        applicator = BeatFilterApplicator(effect_config=config, test_mode=True)
-        mock_stream = Mock()
-        
-        applicator.apply_glitch_filter(mock_stream, "min(1,condition)")
-        
-        call_args = mock_stream.filter.call_args
-        # shift_pixels = 0.8 * 10 = 8
-        assert "p(X+8,Y)" in call_args[1]["r"]
-        assert "p(X-8,Y)" in call_args[1]["b"]
-
-
-class TestColorBurstFilter:
-    """Test color burst effect filter application."""
-
-    def test_color_burst_filter_normal_mode(self):
-        """Test color burst filter uses correct values in normal mode."""
-        config = create_test_config(
-            color_burst_saturation=1.5,
-            color_burst_brightness=0.1
-        )
-        applicator = BeatFilterApplicator(effect_config=config, test_mode=False)
-        mock_stream = Mock()
-        
-        applicator.apply_color_burst_filter(mock_stream, "min(1,condition)")
-        
-        call_args = mock_stream.filter.call_args
-        assert call_args[0][0] == "eq"
-        assert "if(min(1,condition),1.5,1)" in call_args[1]["saturation"]
-        assert "if(min(1,condition),0.1,0)" in call_args[1]["brightness"]
-
-    def test_color_burst_filter_test_mode(self):
-        """Test color burst filter uses test mode values."""
-        config = create_test_config(
-            color_burst_saturation=1.5,
-            color_burst_brightness=0.1,
-            test_mode_color_burst_saturation=2.0,
-            test_mode_color_burst_brightness=0.2
-        )
-        applicator = BeatFilterApplicator(effect_config=config, test_mode=True)
-        mock_stream = Mock()
-        
-        applicator.apply_color_burst_filter(mock_stream, "min(1,condition)")
-        
-        call_args = mock_stream.filter.call_args
-        assert "if(min(1,condition),2.0,1)" in call_args[1]["saturation"]
-        assert "if(min(1,condition),0.2,0)" in call_args[1]["brightness"]
-
-
-class TestBrightnessPulseFilter:
-    """Test brightness pulse effect filter application."""
-
-    def test_brightness_pulse_filter_normal_mode(self):
-        """Test brightness pulse filter uses correct value in normal mode."""
-        config = create_test_config(brightness_pulse_amount=0.15)
-        applicator = BeatFilterApplicator(effect_config=config, test_mode=False)
-        mock_stream = Mock()
-        
-        applicator.apply_brightness_pulse_filter(mock_stream, "min(1,condition)")
-        
-        call_args = mock_stream.filter.call_args
-        assert call_args[0][0] == "eq"
-        assert "if(min(1,condition),0.15,0)" in call_args[1]["brightness"]
-
-    def test_brightness_pulse_filter_test_mode(self):
-        """Test brightness pulse filter uses test mode value."""
-        config = create_test_config(
-            brightness_pulse_amount=0.15,
-            test_mode_brightness_pulse=0.3
-        )
-        applicator = BeatFilterApplicator(effect_config=config, test_mode=True)
-        mock_stream = Mock()
-        
-        applicator.apply_brightness_pulse_filter(mock_stream, "min(1,condition)")
-        
-        call_args = mock_stream.filter.call_args
-        assert "if(min(1,condition),0.3,0)" in call_args[1]["brightness"]
-
-
-class TestZoomPulseFilter:
-    """Test zoom pulse effect filter application."""
-
-    def test_zoom_pulse_filter_normal_mode(self):
-        """Test zoom pulse filter uses correct value in normal mode."""
-        config = create_test_config(zoom_pulse_amount=1.05)
-        applicator = BeatFilterApplicator(effect_config=config, test_mode=False)
-        mock_stream = Mock()
-        
-        applicator.apply_zoom_pulse_filter(mock_stream, "min(1,condition)")
-        
-        call_args = mock_stream.filter.call_args
-        assert call_args[0][0] == "scale"
-        assert "if(min(1,condition),1.05,1)" in call_args[1]["w"]
-        assert "if(min(1,condition),1.05,1)" in call_args[1]["h"]
-
-    def test_zoom_pulse_filter_test_mode(self):
-        """Test zoom pulse filter uses test mode value."""
-        config = create_test_config(
-            zoom_pulse_amount=1.05,
-            test_mode_zoom_pulse=1.15
-        )
-        applicator = BeatFilterApplicator(effect_config=config, test_mode=True)
-        mock_stream = Mock()
-        
-        applicator.apply_zoom_pulse_filter(mock_stream, "min(1,condition)")
-        
-        call_args = mock_stream.filter.call_args
-        assert "if(min(1,condition),1.15,1)" in call_args[1]["w"]
+class TestEffectFilters:
+    """Test each effect filter's parameters in normal and test mode."""
+
+    @pytest.mark.parametrize(
+        "filter_method,applicator_fixture,filter_name,expected",
+        [
+            pytest.param(
+                "apply_flash_filter", "normal_applicator", "geq",
+                {
+                    "r": "r+if(min(1,condition),50,0)",
+                    "g": "g+if(min(1,condition),50,0)",
+                    "b": "b+if(min(1,condition),50,0)",
+                },
+                id="flash-normal",
+            ),
+            pytest.param(
+                # 50 * 3 = 150
+                "apply_flash_filter", "test_mode_applicator", "geq",
+                {"r": "r+if(min(1,condition),150,0)"},
+                id="flash-test",
+            ),
+            pytest.param(
+                # shift_pixels = 0.3 * 10 = 3
+                "apply_glitch_filter", "normal_applicator", "geq",
+                {"r": "p(X+3,Y)", "b": "p(X-3,Y)"},
+                id="glitch-normal",
+            ),
+            pytest.param(
+                # shift_pixels = 0.8 * 10 = 8
+                "apply_glitch_filter", "test_mode_applicator", "geq",
+                {"r": "p(X+8,Y)", "b": "p(X-8,Y)"},
+                id="glitch-test",
+            ),
+            pytest.param(
+                "apply_color_burst_filter", "normal_applicator", "eq",
+                {
+                    "saturation": "if(min(1,condition),1.5,1)",
+                    "brightness": "if(min(1,condition),0.1,0)",
+                },
+                id="color-burst-normal",
+            ),
+            pytest.param(
+                "apply_color_burst_filter", "test_mode_applicator", "eq",
+                {
+                    "saturation": "if(min(1,condition),2.0,1)",
+                    "brightness": "if(min(1,condition),0.2,0)",
+                },
+                id="color-burst-test",
+            ),
+            pytest.param(
+                "apply_brightness_pulse_filter", "normal_applicator", "eq",
+                {"brightness": "if(min(1,condition),0.15,0)"},
+                id="brightness-pulse-normal",
+            ),
+            pytest.param(
+                "apply_brightness_pulse_filter", "test_mode_applicator", "eq",
+                {"brightness": "if(min(1,condition),0.3,0)"},
+                id="brightness-pulse-test",
+            ),
+            pytest.param(
+                "apply_zoom_pulse_filter", "normal_applicator", "scale",
+                {
+                    "w": "if(min(1,condition),1.05,1)",
+                    "h": "if(min(1,condition),1.05,1)",
+                },
+                id="zoom-pulse-normal",
+            ),
+            pytest.param(
+                "apply_zoom_pulse_filter", "test_mode_applicator", "scale",
+                {"w": "if(min(1,condition),1.15,1)"},
+                id="zoom-pulse-test",
+            ),
+        ],
+    )
+    def test_filter_parameters(self, request, filter_method, applicator_fixture, filter_name, expected, stream_stub):
+        """Test each filter emits the configured intensity for its mode."""
+        applicator = request.getfixturevalue(applicator_fixture)
+
+        getattr(applicator, filter_method)(stream_stub, "min(1,condition)")
+
+        stream_stub.filter.assert_called_once()
+        args, kwargs = stream_stub.filter.call_args
+        assert args[0] == filter_name
+        for key, substring in expected.items():
+            assert substring in kwargs[key]
 
 
 class TestApplyFilter:
     """Test the main apply_filter method that routes to specific filters."""
 
-    def test_apply_filter_flash(self):
+    def test_apply_filter_flash(self, normal_applicator, stream_stub):
         """Test apply_filter routes to flash filter."""
-        config = create_test_config()
-        applicator = BeatFilterApplicator(effect_config=config)
-        mock_stream = Mock()
+        applicator = normal_applicator
         
         with patch.object(applicator, 'apply_flash_filter') as mock_flash:
-            mock_flash.return_value = mock_stream
-            applicator.apply_filter(mock_stream, "condition", "flash")
+            mock_flash.return_value = stream_stub
+            applicator.apply_filter(stream_stub, "condition", "flash")
             
-            mock_flash.assert_called_once_with(mock_stream, "condition")
+            mock_flash.assert_called_once_with(stream_stub, "condition")
 
-    def test_apply_filter_glitch(self):
+    def test_apply_filter_glitch(self, normal_applicator, stream_stub):
         """Test apply_filter routes to glitch filter."""
-        config = create_test_config()
-        applicator = BeatFilterApplicator(effect_config=config)
-        mock_stream = Mock()
+        applicator = normal_applicator
         
         with patch.object(applicator, 'apply_glitch_filter') as mock_glitch:
-            mock_glitch.return_value = mock_stream
-            applicator.apply_filter(mock_stream, "condition", "glitch")
+            mock_glitch.return_value = stream_stub
+            applicator.apply_filter(stream_stub, "condition", "glitch")
             
-            mock_glitch.assert_called_once_with(mock_stream, "condition")
+            mock_glitch.assert_called_once_with(stream_stub, "condition")
 
-    def test_apply_filter_color_burst(self):
+    def test_apply_filter_color_burst(self, normal_applicator, stream_stub):
         """Test apply_filter routes to color_burst filter."""
-        config = create_test_config()
-        applicator = BeatFilterApplicator(effect_config=config)
-        mock_stream = Mock()
+        applicator = normal_applicator
         
         with patch.object(applicator, 'apply_color_burst_filter') as mock_color:
-            mock_color.return_value = mock_stream
-            applicator.apply_filter(mock_stream, "condition", "color_burst")
+            mock_color.return_value = stream_stub
+            applicator.apply_filter(stream_stub, "condition", "color_burst")
             
-            mock_color.assert_called_once_with(mock_stream, "condition")
+            mock_color.assert_called_once_with(stream_stub, "condition")
 
-    def test_apply_filter_brightness_pulse(self):
+    def test_apply_filter_brightness_pulse(self, normal_applicator, stream_stub):
         """Test apply_filter routes to brightness_pulse filter."""
-        config = create_test_config()
-        applicator = BeatFilterApplicator(effect_config=config)
-        mock_stream = Mock()
+        applicator = normal_applicator
         
         with patch.object(applicator, 'apply_brightness_pulse_filter') as mock_bright:
-            mock_bright.return_value = mock_stream
-            applicator.apply_filter(mock_stream, "condition", "brightness_pulse")
+            mock_bright.return_value = stream_stub
+            applicator.apply_filter(stream_stub, "condition", "brightness_pulse")
             
-            mock_bright.assert_called_once_with(mock_stream, "condition")
+            mock_bright.assert_called_once_with(stream_stub, "condition")
 
-    def test_apply_filter_zoom_pulse(self):
+    def test_apply_filter_zoom_pulse(self, normal_applicator, stream_stub):
         """Test apply_filter routes to zoom_pulse filter."""
-        config = create_test_config()
-        applicator = BeatFilterApplicator(effect_config=config)
-        mock_stream = Mock()
+        applicator = normal_applicator
         
         with patch.object(applicator, 'apply_zoom_pulse_filter') as mock_zoom:
-            mock_zoom.return_value = mock_stream
-            applicator.apply_filter(mock_stream, "condition", "zoom_pulse")
+            mock_zoom.return_value = stream_stub
+            applicator.apply_filter(stream_stub, "condition", "zoom_pulse")
             
-            mock_zoom.assert_called_once_with(mock_stream, "condition")
+            mock_zoom.assert_called_once_with(stream_stub, "condition")
 
-    def test_apply_filter_unknown_type_returns_original(self):
+    def test_apply_filter_unknown_type_returns_original(self, normal_applicator, stream_stub):
         """Test apply_filter returns original stream for unknown filter type."""
-        config = create_test_config()
-        applicator = BeatFilterApplicator(effect_config=config)
-        mock_stream = Mock()
+        applicator = normal_applicator
         
-        result = applicator.apply_filter(mock_stream, "condition", "unknown_type")
+        result = applicator.apply_filter(stream_stub, "condition", "unknown_type")
         
-        assert result == mock_stream
+        assert result == stream_stub
         # Should not call any filter methods
-        assert not hasattr(mock_stream, 'filter') or not mock_stream.filter.called
+        assert not hasattr(stream_stub, 'filter') or not stream_stub.filter.called
 
 
 class TestShouldChunk:
     """Test chunking logic for large beat counts."""
 
-    def test_should_chunk_flash_large_count(self):
+    def test_should_chunk_flash_large_count(self, normal_applicator):
         """Test should_chunk returns True for flash with >200 beats."""
-        config = create_test_config()
-        applicator = BeatFilterApplicator(effect_config=config)
+        applicator = normal_applicator
         assert applicator.should_chunk("flash", 201) is True
         assert applicator.should_chunk("flash", 200) is False
         assert applicator.should_chunk("flash", 199) is False
 
-    def test_should_chunk_glitch_large_count(self):
+    def test_should_chunk_glitch_large_count(self, normal_applicator):
         """Test should_chunk returns True for glitch with >200 beats."""
-        config = create_test_config()
-        applicator = BeatFilterApplicator(effect_config=config)
+        applicator = normal_applicator
         assert applicator.should_chunk("glitch", 201) is True
         assert applicator.should_chunk("glitch", 200) is False
 
-    def test_should_chunk_other_effects_never_chunk(self):
+    def test_should_chunk_other_effects_never_chunk(self, normal_applicator):
         """Test should_chunk returns False for other effect types."""
-        config = create_test_config()
-        applicator = BeatFilterApplicator(effect_config=config)
+        applicator = normal_applicator
         assert applicator.should_chunk("color_burst", 1000) is False
         assert applicator.should_chunk("brightness_pulse", 1000) is False
         assert applicator.should_chunk("zoom_pulse", 1000) is False
 
-    def test_should_chunk_custom_chunk_size(self):
+    def test_should_chunk_custom_chunk_size(self, normal_applicator):
         """Test should_chunk respects custom chunk_size parameter."""
-        config = create_test_config()
-        applicator = BeatFilterApplicator(effect_config=config)
+        applicator = normal_applicator
         assert applicator.should_chunk("flash", 101, chunk_size=100) is True
         assert applicator.should_chunk("flash", 100, chunk_size=100) is False
 
@@ -7,115 +7,128 @@ Run with: pytest backend/tests/unit/test_beat_filters.py -v
 Or from backend/: pytest tests/unit/test_beat_filters.py -v
 """
 
-import sys
-from pathlib import Path
+import re
+from functools import lru_cache
 
-# Add backend directory to path for direct execution
-backend_dir = Path(__file__).parent.parent
-if str(backend_dir) not in sys.path:
-    sys.path.insert(0, str(backend_dir))
+import pytest
 
-from app.services.beat_filters import (  # noqa: E402
+from app.services.beat_filters import (
     convert_beat_times_to_frames,
     generate_beat_filter_complex,
     generate_beat_filter_expression,
 )
 
+pytestmark = pytest.mark.unit
 
-class TestGenerateBeatFilterExpression:
-    """Test beat filter expression generation."""
+# Compiled once so each assertion scans the filter string a single time
+_RE_BEAT_CONDITION = re.compile(r"\|\||n >=")
+_RE_SHIFT = re.compile(r"p\(X[+-]")
 
-    def test_empty_beat_times_returns_empty(self):
-        """Test that empty beat times returns empty string."""
-        result = generate_beat_filter_expression([])
-        assert result == ""
 
-    def test_single_beat_flash_filter(self):
-        """Test flash filter generation for single beat."""
-        beat_times = [1.0]
-        result = generate_beat_filter_expression(beat_times, filter_type="flash", frame_rate=24.0)
-        
-        assert "geq" in result
-        assert "r+" in result or "r=" in result
-        assert "g+" in result or "g=" in result
-        assert "b+" in result or "b=" in result
+@pytest.fixture(scope="session")
+def cached_expr():
+    """generate_beat_filter_expression memoized per (beat_times tuple, options) for the session."""
 
-    def test_multiple_beats_flash_filter(self):
-        """Test flash filter generation for multiple beats."""
-        beat_times = [1.0, 2.0, 3.0]
-        result = generate_beat_filter_expression(beat_times, filter_type="flash", frame_rate=24.0)
-        
-        assert "geq" in result
-        # Should contain OR conditions for multiple beats
-        assert "||" in result or "n >=" in result
+    @lru_cache(maxsize=256)
+    def expr(beat_times: tuple[float, ...], **options) -> str:
+        return generate_beat_filter_expression(list(beat_times), **options)
 
-    def test_color_burst_filter(self):
-        """Test color burst filter generation."""
-        beat_times = [1.0]
-        result = generate_beat_filter_expression(beat_times, filter_type="color_burst", frame_rate=24.0)
-        
-        assert "eq" in result
-        assert "saturation" in result.lower()
-        assert "brightness" in result.lower()
+    return expr
 
-    def test_brightness_pulse_filter(self):
-        """Test brightness pulse filter generation."""
-        beat_times = [1.0]
-        result = generate_beat_filter_expression(beat_times, filter_type="brightness_pulse", frame_rate=24.0)
-        
-        assert "eq" in result
-        assert "brightness" in result.lower()
 
-    def test_zoom_pulse_filter(self):
-        """Test zoom pulse filter generation."""
-        beat_times = [1.0]
-        result = generate_beat_filter_expression(beat_times, filter_type="zoom_pulse", frame_rate=24.0)
-        
-        assert "scale" in result.lower()
+@pytest.fixture(
+    params=[generate_beat_filter_expression, generate_beat_filter_complex],
+    ids=["expression", "complex"],
+)
+def gen(request):
+    """Each beat filter entry point; complex returns a list of filter strings."""
+    return request.param
 
-    def test_invalid_filter_type_defaults_to_flash(self):
-        """Test that invalid filter type defaults to flash."""
-        beat_times = [1.0]
-        result = generate_beat_filter_expression(beat_times, filter_type="invalid_type")
+
+def _as_text(result) -> str:
+    """Flatten a filter complex list so both entry points can be searched alike."""
+    return "".join(result) if isinstance(result, list) else result
+
+
+class TestBeatFilterGenerators:
+    """Behaviour shared by the expression and filter complex generators."""
+
+    def test_empty_beat_times_returns_empty(self, gen):
+        """Test that empty beat times returns an empty string or list."""
+        result = gen([])
+        assert result == ([] if gen is generate_beat_filter_complex else "")
+
+    @pytest.mark.parametrize(
+        "filter_type,expected_substrings",
+        [
+            ("flash", ["geq", "r+", "g+", "b+"]),
+            ("color_burst", ["eq", "saturation", "brightness"]),
+        ],
+    )
+    def test_single_beat_filter_type(self, gen, filter_type, expected_substrings):
+        """Test filter types supported by both generators for a single beat."""
+        result = gen([1.0], filter_type=filter_type, frame_rate=24.0)
+
+        lowered = _as_text(result).lower()
+        assert all(substring in lowered for substring in expected_substrings)
+
+    def test_tolerance_affects_range(self, gen):
+        """Test that tolerance affects the frame or time range."""
+        result_20ms = gen([1.0], tolerance_ms=20.0, frame_rate=24.0)
+        result_50ms = gen([1.0], tolerance_ms=50.0, frame_rate=24.0)
+
+        # Different tolerances should produce different ranges
+        assert result_20ms != result_50ms
+
+
+class TestGenerateBeatFilterExpression:
+    """Test beat filter expression generation."""
+
+    @pytest.mark.parametrize(
+        "filter_type,expected_substrings",
+        [
+            ("brightness_pulse", ["eq", "brightness"]),
+            ("zoom_pulse", ["scale"]),
+            pytest.param("invalid_type", ["geq"], id="invalid_type-defaults-to-flash"),
+        ],
+    )
+    def test_single_beat_filter_type(self, filter_type, expected_substrings, cached_expr):
+        """Test expression-only filter types for a single beat."""
+        result = cached_expr((1.0,), filter_type=filter_type, frame_rate=24.0)
+
+        lowered = result.lower()
+        assert all(substring in lowered for substring in expected_substrings)
+
+    def test_multiple_beats_flash_filter(self, cached_expr):
+        """Test flash filter generation for multiple beats."""
+        beat_times = (1.0, 2.0, 3.0)
+        result = cached_expr(beat_times, filter_type="flash", frame_rate=24.0)
         
-        assert "geq" in result  # Flash uses geq
+        assert "geq" in result
+        # Should contain OR conditions for multiple beats
+        assert _RE_BEAT_CONDITION.search(result)
 
-    def test_frame_rate_affects_frame_calculation(self):
+    def test_frame_rate_affects_frame_calculation(self, cached_expr):
         """Test that frame rate affects frame number calculations."""
-        beat_times = [1.0]
-        result_24fps = generate_beat_filter_expression(beat_times, frame_rate=24.0)
-        result_30fps = generate_beat_filter_expression(beat_times, frame_rate=30.0)
+        beat_times = (1.0,)
+        result_24fps = cached_expr(beat_times, frame_rate=24.0)
+        result_30fps = cached_expr(beat_times, frame_rate=30.0)
         
         # Frame numbers should be different
         assert result_24fps != result_30fps
 
-    def test_tolerance_affects_frame_range(self):
-        """Test that tolerance affects the frame range."""
-        beat_times = [1.0]
-        result_20ms = generate_beat_filter_expression(beat_times, tolerance_ms=20.0, frame_rate=24.0)
-        result_50ms = generate_beat_filter_expression(beat_times, tolerance_ms=50.0, frame_rate=24.0)
-        
-        # Different tolerances should produce different frame ranges
-        assert result_20ms != result_50ms
-
 
 class TestGenerateBeatFilterComplex:
     """Test beat filter complex generation."""
 
-    def test_empty_beat_times_returns_empty_list(self):
-        """Test that empty beat times returns empty list."""
-        result = generate_beat_filter_complex([])
-        assert result == []
+    @pytest.mark.parametrize("filter_type", ["flash", "color_burst"])
+    def test_single_beat_filter_complex_type(self, filter_type):
+        """Test each supported filter type produces one select-gated filter for a single beat."""
+        result = generate_beat_filter_complex([1.0], filter_type=filter_type, frame_rate=24.0)
 
-    def test_single_beat_flash_filter_complex(self):
-        """Test flash filter complex for single beat."""
-        beat_times = [1.0]
-        result = generate_beat_filter_complex(beat_times, filter_type="flash", frame_rate=24.0)
-        
         assert len(result) == 1
         assert "select" in result[0]
         assert "between(t" in result[0]
-        assert "geq" in result[0]
 
     def test_multiple_beats_flash_filter_complex(self):
         """Test flash filter complex for multiple beats."""
@@ -127,15 +140,6 @@ class TestGenerateBeatFilterComplex:
             assert "select" in filter_str
             assert "between(t" in filter_str
 
-    def test_color_burst_filter_complex(self):
-        """Test color burst filter complex."""
-        beat_times = [1.0]
-        result = generate_beat_filter_complex(beat_times, filter_type="color_burst", frame_rate=24.0)
-        
-        assert len(result) == 1
-        assert "eq" in result[0]
-        assert "saturation" in result[0].lower()
-
     def test_unsupported_filter_type_returns_empty(self):
         """Test that unsupported filter types return empty list."""
         beat_times = [1.0]
@@ -144,15 +148,6 @@ class TestGenerateBeatFilterComplex:
         # zoom_pulse is not implemented in filter_complex, should return empty
         assert result == []
 
-    def test_tolerance_affects_time_range(self):
-        """Test that tolerance affects the time range in filter complex."""
-        beat_times = [1.0]
-        result_20ms = generate_beat_filter_complex(beat_times, tolerance_ms=20.0)
-        result_50ms = generate_beat_filter_complex(beat_times, tolerance_ms=50.0)
-        
-        # Different tolerances should produce different time ranges
-        assert result_20ms != result_50ms
-
     def test_negative_beat_time_handled(self):
         """Test that negative beat times are handled (clamped to 0)."""
         beat_times = [-0.1, 1.0]
@@ -160,7 +155,7 @@ class TestGenerateBeatFilterComplex:
         
         # Should still generate filters, with start_time clamped
         assert len(result) == 2
-        assert "between(t,0" in result[0] or "between(t,0.0" in result[0]
+        assert "between(t,0" in result[0]
 
 
 class TestConvertBeatTimesToFrames:
@@ -236,10 +231,10 @@ class TestEffectParameters:
     This ensures parameters are correctly applied to filter generation.
     """
 
-    def test_flash_with_custom_intensity(self):
+    def test_flash_with_custom_intensity(self, cached_expr):
         """Test flash filter with custom intensity parameter."""
         beat_times = [1.0]
-        result_default = generate_beat_filter_expression(beat_times, filter_type="flash")
+        result_default = cached_expr(tuple(beat_times), filter_type="flash")
         result_custom = generate_beat_filter_expression(
             beat_times, 
             filter_type="flash",
@@ -259,7 +254,7 @@ class TestEffectParameters:
             effect_params={"saturation": 2.0, "brightness": 0.2}
         )
         
-        assert "2.0" in result or "2" in result  # Custom saturation
+        assert "2" in result  # Custom saturation, e.g. 2 or 2.0
         assert "0.2" in result  # Custom brightness
 
     def test_zoom_pulse_with_custom_zoom(self):
@@ -283,7 +278,7 @@ class TestEffectParameters:
         )
         
         # Glitch effect should contain pixel shift values
-        assert "p(X+" in result or "p(X-" in result  # Channel shift
+        assert _RE_SHIFT.search(result)  # Channel shift
         assert "5" in result  # 0.5 * 10 = 5 pixels
 
     def test_glitch_filter_complex(self):
@@ -297,5 +292,5 @@ class TestEffectParameters:
         
         assert len(result) == 2  # One filter per beat
         assert "geq" in result[0]  # Glitch uses geq filter
-        assert "p(X+" in result[0] or "p(X-" in result[0]  # Channel shift
+        assert _RE_SHIFT.search(result[0])  # Channel shift
 
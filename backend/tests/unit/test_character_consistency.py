@@ -6,77 +6,89 @@ Validates core business logic in isolation - fast.
 Run with: pytest backend/tests/unit/test_character_consistency.py -v
 """
 
-import sys
-from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import Mock
 from uuid import uuid4
 
-# Add backend directory to path for direct execution
-backend_dir = Path(__file__).parent.parent
-if str(backend_dir) not in sys.path:
-    sys.path.insert(0, str(backend_dir))
-
-from app.models.song import Song  # noqa: E402
-from app.services.character_consistency import generate_character_image_job  # noqa: E402
+import pytest
+
+import app.services.character_consistency as character_consistency
+from app.models.song import Song
+from app.services.character_consistency import generate_character_image_job
+
+pytestmark = pytest.mark.unit
+
+_PATCHED_NAMES = (
+    "SongRepository",
+    "download_bytes_from_s3",
+    "generate_presigned_get_url",
+    "interrogate_reference_image",
+    "generate_consistent_character_image",
+    "upload_consistent_character_image",
+    "get_settings",
+)
+
+
+@pytest.fixture
+def mocks(monkeypatch):
+    """Replace the job's collaborators with Mocks, exposed by name.
+
+    ``httpx.get`` is exposed as ``httpx_get``.
+    """
+    namespace = SimpleNamespace()
+    for name in _PATCHED_NAMES:
+        mock = Mock()
+        monkeypatch.setattr(character_consistency, name, mock)
+        setattr(namespace, name, mock)
+    namespace.httpx_get = Mock()
+    monkeypatch.setattr(character_consistency.httpx, "get", namespace.httpx_get)
+    return namespace
+
+
+def make_song(**overrides):
+    """Fresh Song with a reference image and consistency disabled."""
+    return Song(
+        **{
+            "id": uuid4(),
+            "character_reference_image_s3_key": "songs/test/character_reference.jpg",
+            "character_consistency_enabled": False,
+            **overrides,
+        }
+    )
 
 
 class TestGenerateCharacterImageJob:
     """Test character image generation job orchestration."""
 
-    @patch("app.services.character_consistency.SongRepository")
-    @patch("app.services.character_consistency.download_bytes_from_s3")
-    @patch("app.services.character_consistency.generate_presigned_get_url")
-    @patch("app.services.character_consistency.interrogate_reference_image")
-    @patch("app.services.character_consistency.generate_consistent_character_image")
-    @patch("app.services.character_consistency.httpx.get")
-    @patch("app.services.character_consistency.upload_consistent_character_image")
-    @patch("app.services.character_consistency.get_settings")
-    def test_successful_job(
-        self,
-        mock_get_settings,
-        mock_upload,
-        mock_httpx_get,
-        mock_generate,
-        mock_interrogate,
-        mock_presigned,
-        mock_download,
-        mock_repo,
-    ):
+    def test_successful_job(self, mocks):
         """Test successful character image generation job."""
-        song_id = uuid4()
-        
         # Setup song
-        song = Song(
-            id=song_id,
-            character_reference_image_s3_key="songs/test/character_reference.jpg",
-            character_consistency_enabled=False,
-        )
-        mock_repo.get_by_id.return_value = song
-        mock_repo.update.return_value = song
+        song = make_song()
+        song_id = song.id
+        mocks.SongRepository.get_by_id.return_value = song
+        mocks.SongRepository.update.return_value = song
 
         # Setup settings
-        mock_settings = MagicMock()
-        mock_settings.s3_bucket_name = "test-bucket"
-        mock_get_settings.return_value = mock_settings
+        mocks.get_settings.return_value = SimpleNamespace(s3_bucket_name="test-bucket")
 
         # Setup mocks
-        mock_download.return_value = b"image bytes"
-        mock_presigned.return_value = "https://presigned-url.com/image.jpg"
-        mock_interrogate.return_value = {
+        mocks.download_bytes_from_s3.return_value = b"image bytes"
+        mocks.generate_presigned_get_url.return_value = "https://presigned-url.com/image.jpg"
+        mocks.interrogate_reference_image.return_value = {
             "prompt": "test prompt",
             "character_description": "test description",
             "style_notes": "test notes",
         }
-        mock_generate.return_value = (
+        mocks.generate_consistent_character_image.return_value = (
             True,
             "https://replicate.delivery/pbxt/image.jpg",
             {"job_id": "pred-123"},
         )
-        mock_response = MagicMock()
-        mock_response.content = b"generated image bytes"
-        mock_response.raise_for_status = MagicMock()
-        mock_httpx_get.return_value = mock_response
-        mock_upload.return_value = "songs/test/character_generated.jpg"
+        mocks.httpx_get.return_value = SimpleNamespace(
+            content=b"generated image bytes",
+            raise_for_status=lambda: None,
+        )
+        mocks.upload_consistent_character_image.return_value = "songs/test/character_generated.jpg"
 
         result = generate_character_image_job(song_id)
 
@@ -87,71 +99,43 @@ class TestGenerateCharacterImageJob:
         assert song.character_interrogation_prompt is not None
 
         # Verify calls
-        mock_repo.get_by_id.assert_called_once_with(song_id)
-        mock_download.assert_called_once()
-        mock_interrogate.assert_called_once()
-        mock_generate.assert_called_once()
-        mock_upload.assert_called_once()
-        assert mock_repo.update.call_count >= 2  # At least for interrogation and final update
-
-    @patch("app.services.character_consistency.SongRepository")
-    @patch("app.services.character_consistency.get_settings")
-    def test_skips_when_no_reference_image(self, mock_get_settings, mock_repo):
+        mocks.SongRepository.get_by_id.assert_called_once_with(song_id)
+        mocks.download_bytes_from_s3.assert_called_once()
+        mocks.interrogate_reference_image.assert_called_once()
+        mocks.generate_consistent_character_image.assert_called_once()
+        mocks.upload_consistent_character_image.assert_called_once()
+        assert mocks.SongRepository.update.call_count >= 2  # At least for interrogation and final update
+
+    def test_skips_when_no_reference_image(self, mocks):
         """Test that job is skipped when no reference image exists."""
-        song_id = uuid4()
-        
-        song = Song(
-            id=song_id,
-            character_reference_image_s3_key=None,
-        )
-        mock_repo.get_by_id.return_value = song
+        song = make_song(character_reference_image_s3_key=None)
+        song_id = song.id
+        mocks.SongRepository.get_by_id.return_value = song
 
-        mock_settings = MagicMock()
-        mock_get_settings.return_value = mock_settings
+        mocks.get_settings.return_value = SimpleNamespace()
 
         result = generate_character_image_job(song_id)
 
         assert result["status"] == "skipped"
         assert result["reason"] == "No reference image"
 
-    @patch("app.services.character_consistency.SongRepository")
-    @patch("app.services.character_consistency.download_bytes_from_s3")
-    @patch("app.services.character_consistency.generate_presigned_get_url")
-    @patch("app.services.character_consistency.interrogate_reference_image")
-    @patch("app.services.character_consistency.generate_consistent_character_image")
-    @patch("app.services.character_consistency.get_settings")
-    def test_handles_generation_failure(
-        self,
-        mock_get_settings,
-        mock_generate,
-        mock_interrogate,
-        mock_presigned,
-        mock_download,
-        mock_repo,
-    ):
+    def test_handles_generation_failure(self, mocks):
         """Test handling of character image generation failure."""
-        song_id = uuid4()
-        
-        song = Song(
-            id=song_id,
-            character_reference_image_s3_key="songs/test/character_reference.jpg",
-            character_consistency_enabled=True,
-        )
-        mock_repo.get_by_id.return_value = song
-        mock_repo.update.return_value = song
+        song = make_song(character_consistency_enabled=True)
+        song_id = song.id
+        mocks.SongRepository.get_by_id.return_value = song
+        mocks.SongRepository.update.return_value = song
 
-        mock_settings = MagicMock()
-        mock_settings.s3_bucket_name = "test-bucket"
-        mock_get_settings.return_value = mock_settings
+        mocks.get_settings.return_value = SimpleNamespace(s3_bucket_name="test-bucket")
 
-        mock_download.return_value = b"image bytes"
-        mock_presigned.return_value = "https://presigned-url.com/image.jpg"
-        mock_interrogate.return_value = {
+        mocks.download_bytes_from_s3.return_value = b"image bytes"
+        mocks.generate_presigned_get_url.return_value = "https://presigned-url.com/image.jpg"
+        mocks.interrogate_reference_image.return_value = {
             "prompt": "test prompt",
             "character_description": "test description",
             "style_notes": "test notes",
         }
-        mock_generate.return_value = (False, None, {"error": "Generation failed"})
+        mocks.generate_consistent_character_image.return_value = (False, None, {"error": "Generation failed"})
 
         result = generate_character_image_job(song_id)
 
@@ -159,37 +143,18 @@ class TestGenerateCharacterImageJob:
         assert result["error"] == "Generation failed"
         assert song.character_consistency_enabled is False
 
-    @patch("app.services.character_consistency.SongRepository")
-    @patch("app.services.character_consistency.download_bytes_from_s3")
-    @patch("app.services.character_consistency.generate_presigned_get_url")
-    @patch("app.services.character_consistency.interrogate_reference_image")
-    @patch("app.services.character_consistency.get_settings")
-    def test_handles_interrogation_failure(
-        self,
-        mock_get_settings,
-        mock_interrogate,
-        mock_presigned,
-        mock_download,
-        mock_repo,
-    ):
+    def test_handles_interrogation_failure(self, mocks):
         """Test handling of image interrogation failure."""
-        song_id = uuid4()
-        
-        song = Song(
-            id=song_id,
-            character_reference_image_s3_key="songs/test/character_reference.jpg",
-            character_consistency_enabled=True,
-        )
-        mock_repo.get_by_id.return_value = song
-        mock_repo.update.return_value = song
+        song = make_song(character_consistency_enabled=True)
+        song_id = song.id
+        mocks.SongRepository.get_by_id.return_value = song
+        mocks.SongRepository.update.return_value = song
 
-        mock_settings = MagicMock()
-        mock_settings.s3_bucket_name = "test-bucket"
-        mock_get_settings.return_value = mock_settings
+        mocks.get_settings.return_value = SimpleNamespace(s3_bucket_name="test-bucket")
 
-        mock_download.return_value = b"image bytes"
-        mock_presigned.return_value = "https://presigned-url.com/image.jpg"
-        mock_interrogate.side_effect = Exception("Interrogation failed")
+        mocks.download_bytes_from_s3.return_value = b"image bytes"
+        mocks.generate_presigned_get_url.return_value = "https://presigned-url.com/image.jpg"
+        mocks.interrogate_reference_image.side_effect = Exception("Interrogation failed")
 
         result = generate_character_image_job(song_id)
 
@@ -197,51 +162,28 @@ class TestGenerateCharacterImageJob:
         assert "Interrogation failed" in result["error"]
         assert song.character_consistency_enabled is False
 
-    @patch("app.services.character_consistency.SongRepository")
-    @patch("app.services.character_consistency.download_bytes_from_s3")
-    @patch("app.services.character_consistency.generate_presigned_get_url")
-    @patch("app.services.character_consistency.interrogate_reference_image")
-    @patch("app.services.character_consistency.generate_consistent_character_image")
-    @patch("app.services.character_consistency.httpx.get")
-    @patch("app.services.character_consistency.get_settings")
-    def test_handles_http_download_failure(
-        self,
-        mock_get_settings,
-        mock_httpx_get,
-        mock_generate,
-        mock_interrogate,
-        mock_presigned,
-        mock_download,
-        mock_repo,
-    ):
+    def test_handles_http_download_failure(self, mocks):
         """Test handling of HTTP download failure."""
-        song_id = uuid4()
-        
-        song = Song(
-            id=song_id,
-            character_reference_image_s3_key="songs/test/character_reference.jpg",
-            character_consistency_enabled=True,
-        )
-        mock_repo.get_by_id.return_value = song
-        mock_repo.update.return_value = song
+        song = make_song(character_consistency_enabled=True)
+        song_id = song.id
+        mocks.SongRepository.get_by_id.return_value = song
+        mocks.SongRepository.update.return_value = song
 
-        mock_settings = MagicMock()
-        mock_settings.s3_bucket_name = "test-bucket"
-        mock_get_settings.return_value = mock_settings
+        mocks.get_settings.return_value = SimpleNamespace(s3_bucket_name="test-bucket")
 
-        mock_download.return_value = b"image bytes"
-        mock_presigned.return_value = "https://presigned-url.com/image.jpg"
-        mock_interrogate.return_value = {
+        mocks.download_bytes_from_s3.return_value = b"image bytes"
+        mocks.generate_presigned_get_url.return_value = "https://presigned-url.com/image.jpg"
+        mocks.interrogate_reference_image.return_value = {
             "prompt": "test prompt",
             "character_description": "test description",
             "style_notes": "test notes",
         }
-        mock_generate.return_value = (
+        mocks.generate_consistent_character_image.return_value = (
             True,
             "https://replicate.delivery/pbxt/image.jpg",
             {"job_id": "pred-123"},
         )
-        mock_httpx_get.side_effect = Exception("HTTP error")
+        mocks.httpx_get.side_effect = Exception("HTTP error")
 
         result = generate_character_image_job(song_id)
 
@@ -3,6 +3,8 @@
 Tests the clip model selection and validation logic.
 """
 
+import re
+from types import SimpleNamespace
 from unittest.mock import Mock
 from uuid import uuid4
 
@@ -13,25 +15,80 @@ from app.models.clip import SongClip
 from app.models.section_video import SectionVideo
 from app.services.clip_model_selector import (
     get_and_validate_clip,
+    get_clip_model_class,
     get_clips_for_composition,
 )
 
+pytestmark = pytest.mark.unit
+
+# Error message patterns, compiled once for pytest.raises(match=...)
+_NOT_FOUND_SV = re.compile(r"SectionVideo.*not found")
+_NOT_FOUND_SC = re.compile(r"SongClip.*not found")
+_WRONG_SONG = re.compile("does not belong to song")
+_NOT_READY = re.compile("is not ready")
+
+
+def make_clip(**overrides):
+    """Plain stand-in for a ready SectionVideo/SongClip row; validation only reads attributes."""
+    return SimpleNamespace(
+        **{
+            "id": uuid4(),
+            "song_id": uuid4(),
+            "status": "completed",
+            "video_url": "http://example.com/video.mp4",
+            **overrides,
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def _shared_session_pair():
+    session = Mock()
+    exec_result = Mock()
+    session.exec.return_value = exec_result
+    return session, exec_result
+
+
+@pytest.fixture
+def session_pair(_shared_session_pair):
+    """Module-wide (session, exec result) pair, reset after each test.
+
+    ``session.exec()`` always returns ``exec_result``; tests configure
+    ``session.get.return_value`` or ``exec_result.all.return_value``.
+    """
+    session, exec_result = _shared_session_pair
+    yield session, exec_result
+    session.reset_mock()
+    session.get.reset_mock(return_value=True, side_effect=True)
+    exec_result.all.reset_mock(return_value=True, side_effect=True)
+
+
+class TestGetClipModelClass:
+    """Tests for get_clip_model_class function."""
+
+    @pytest.mark.parametrize(
+        "use_sections,expected",
+        [
+            (True, SectionVideo),
+            (False, SongClip),
+        ],
+    )
+    def test_model_class_for_sections_flag(self, use_sections, expected):
+        """Test that SectionVideo is used with sections and SongClip without."""
+        assert get_clip_model_class(use_sections) is expected
+
 
 class TestGetAndValidateClip:
     """Tests for get_and_validate_clip function."""
 
-    def test_valid_sectionvideo_clip(self):
+    def test_valid_sectionvideo_clip(self, session_pair):
         """Test validation of a valid SectionVideo clip."""
         song_id = uuid4()
         clip_id = uuid4()
 
-        mock_clip = Mock(spec=SectionVideo)
-        mock_clip.id = clip_id
-        mock_clip.song_id = song_id
-        mock_clip.status = "completed"
-        mock_clip.video_url = "http://example.com/video.mp4"
+        mock_clip = make_clip(id=clip_id, song_id=song_id)
 
-        mock_session = Mock()
+        mock_session, _ = session_pair
         mock_session.get.return_value = mock_clip
 
         result = get_and_validate_clip(mock_session, clip_id, song_id, use_sections=True)
@@ -39,18 +96,14 @@ class TestGetAndValidateClip:
         assert result == mock_clip
         mock_session.get.assert_called_once_with(SectionVideo, clip_id)
 
-    def test_valid_songclip_clip(self):
+    def test_valid_songclip_clip(self, session_pair):
         """Test validation of a valid SongClip clip."""
         song_id = uuid4()
         clip_id = uuid4()
 
-        mock_clip = Mock(spec=SongClip)
-        mock_clip.id = clip_id
-        mock_clip.song_id = song_id
-        mock_clip.status = "completed"
-        mock_clip.video_url = "http://example.com/video.mp4"
+        mock_clip = make_clip(id=clip_id, song_id=song_id)
 
-        mock_session = Mock()
+        mock_session, _ = session_pair
         mock_session.get.return_value = mock_clip
 
         result = get_and_validate_clip(mock_session, clip_id, song_id, use_sections=False)
@@ -58,103 +111,78 @@ class TestGetAndValidateClip:
         assert result == mock_clip
         mock_session.get.assert_called_once_with(SongClip, clip_id)
 
-    def test_clip_not_found_raises_error(self):
+    def test_clip_not_found_raises_error(self, session_pair):
         """Test that ClipNotFoundError is raised when clip is not found."""
         song_id = uuid4()
         clip_id = uuid4()
 
-        mock_session = Mock()
+        mock_session, _ = session_pair
         mock_session.get.return_value = None
 
-        with pytest.raises(ClipNotFoundError, match="SectionVideo.*not found"):
+        with pytest.raises(ClipNotFoundError, match=_NOT_FOUND_SV):
             get_and_validate_clip(mock_session, clip_id, song_id, use_sections=True)
 
-        with pytest.raises(ClipNotFoundError, match="SongClip.*not found"):
+        with pytest.raises(ClipNotFoundError, match=_NOT_FOUND_SC):
             get_and_validate_clip(mock_session, clip_id, song_id, use_sections=False)
 
-    def test_clip_wrong_song_id_raises_error(self):
+    def test_clip_wrong_song_id_raises_error(self, session_pair):
         """Test that CompositionError is raised when clip belongs to different song."""
         song_id = uuid4()
         wrong_song_id = uuid4()
         clip_id = uuid4()
 
-        mock_clip = Mock(spec=SectionVideo)
-        mock_clip.id = clip_id
-        mock_clip.song_id = wrong_song_id
-        mock_clip.status = "completed"
-        mock_clip.video_url = "http://example.com/video.mp4"
+        mock_clip = make_clip(id=clip_id, song_id=wrong_song_id)
 
-        mock_session = Mock()
+        mock_session, _ = session_pair
         mock_session.get.return_value = mock_clip
 
-        with pytest.raises(CompositionError, match="does not belong to song"):
+        with pytest.raises(CompositionError, match=_WRONG_SONG):
             get_and_validate_clip(mock_session, clip_id, song_id, use_sections=True)
 
-    def test_clip_not_completed_raises_error(self):
+    def test_clip_not_completed_raises_error(self, session_pair):
         """Test that CompositionError is raised when clip is not completed."""
         song_id = uuid4()
         clip_id = uuid4()
 
-        mock_clip = Mock(spec=SectionVideo)
-        mock_clip.id = clip_id
-        mock_clip.song_id = song_id
-        mock_clip.status = "processing"
-        mock_clip.video_url = "http://example.com/video.mp4"
+        mock_clip = make_clip(id=clip_id, song_id=song_id, status="processing")
 
-        mock_session = Mock()
+        mock_session, _ = session_pair
         mock_session.get.return_value = mock_clip
 
-        with pytest.raises(CompositionError, match="is not ready"):
+        with pytest.raises(CompositionError, match=_NOT_READY):
             get_and_validate_clip(mock_session, clip_id, song_id, use_sections=True)
 
-    def test_clip_no_video_url_raises_error(self):
+    def test_clip_no_video_url_raises_error(self, session_pair):
         """Test that CompositionError is raised when clip has no video_url."""
         song_id = uuid4()
         clip_id = uuid4()
 
-        mock_clip = Mock(spec=SectionVideo)
-        mock_clip.id = clip_id
-        mock_clip.song_id = song_id
-        mock_clip.status = "completed"
-        mock_clip.video_url = None
+        mock_clip = make_clip(id=clip_id, song_id=song_id, video_url=None)
 
-        mock_session = Mock()
+        mock_session, _ = session_pair
         mock_session.get.return_value = mock_clip
 
-        with pytest.raises(CompositionError, match="is not ready"):
+        with pytest.raises(CompositionError, match=_NOT_READY):
             get_and_validate_clip(mock_session, clip_id, song_id, use_sections=True)
 
 
 class TestGetClipsForComposition:
     """Tests for get_clips_for_composition function."""
 
-    def test_get_multiple_valid_clips(self):
+    def test_get_multiple_valid_clips(self, session_pair):
         """Test getting multiple valid clips."""
         song_id = uuid4()
         clip_id_1 = uuid4()
         clip_id_2 = uuid4()
 
-        mock_song = Mock()
-        mock_song.id = song_id
-        mock_song.video_type = "full_length"
-
-        mock_clip_1 = Mock(spec=SectionVideo)
-        mock_clip_1.id = clip_id_1
-        mock_clip_1.song_id = song_id
-        mock_clip_1.status = "completed"
-        mock_clip_1.video_url = "http://example.com/video1.mp4"
+        mock_song = SimpleNamespace(id=song_id, video_type="full_length")
 
-        mock_clip_2 = Mock(spec=SectionVideo)
-        mock_clip_2.id = clip_id_2
-        mock_clip_2.song_id = song_id
-        mock_clip_2.status = "completed"
-        mock_clip_2.video_url = "http://example.com/video2.mp4"
+        mock_clip_1 = make_clip(id=clip_id_1, song_id=song_id, video_url="http://example.com/video1.mp4")
+        mock_clip_2 = make_clip(id=clip_id_2, song_id=song_id, video_url="http://example.com/video2.mp4")
 
-        mock_session = Mock()
         # Mock the new bulk query approach: session.exec(select(...)) returns list
-        mock_exec_result = Mock()
+        mock_session, mock_exec_result = session_pair
         mock_exec_result.all.return_value = [mock_clip_1, mock_clip_2]
-        mock_session.exec.return_value = mock_exec_result
 
         clips, clip_urls = get_clips_for_composition(
             mock_session, [clip_id_1, clip_id_2], mock_song
@@ -167,74 +195,54 @@ class TestGetClipsForComposition:
         assert clip_urls[0] == "http://example.com/video1.mp4"
         assert clip_urls[1] == "http://example.com/video2.mp4"
 
-    def test_get_clips_uses_songclip_for_short_form(self):
+    def test_get_clips_uses_songclip_for_short_form(self, session_pair):
         """Test that SongClip is used when video_type is short_form."""
         song_id = uuid4()
         clip_id = uuid4()
 
-        mock_song = Mock()
-        mock_song.id = song_id
-        mock_song.video_type = "short_form"
+        mock_song = SimpleNamespace(id=song_id, video_type="short_form")
 
-        mock_clip = Mock(spec=SongClip)
-        mock_clip.id = clip_id
-        mock_clip.song_id = song_id
-        mock_clip.status = "completed"
-        mock_clip.video_url = "http://example.com/video.mp4"
+        mock_clip = make_clip(id=clip_id, song_id=song_id)
 
-        mock_session = Mock()
         # Mock the new bulk query approach: session.exec(select(...)) returns list
-        mock_exec_result = Mock()
+        mock_session, mock_exec_result = session_pair
         mock_exec_result.all.return_value = [mock_clip]
-        mock_session.exec.return_value = mock_exec_result
 
         clips, clip_urls = get_clips_for_composition(mock_session, [clip_id], mock_song)
 
         assert len(clips) == 1
-        assert isinstance(clips[0], Mock)  # Mock doesn't have isinstance, but we can check
+        assert clips[0] is mock_clip
         # Verify it used select with SongClip model
         assert mock_session.exec.called
 
-    def test_get_clips_raises_error_on_invalid_clip(self):
+    def test_get_clips_raises_error_on_invalid_clip(self, session_pair):
         """Test that errors are propagated when a clip is invalid."""
         song_id = uuid4()
         clip_id = uuid4()
 
-        mock_song = Mock()
-        mock_song.id = song_id
-        mock_song.video_type = "full_length"
+        mock_song = SimpleNamespace(id=song_id, video_type="full_length")
 
-        mock_session = Mock()
         # Mock the new bulk query approach: returns empty list (clip not found)
-        mock_exec_result = Mock()
+        mock_session, mock_exec_result = session_pair
         mock_exec_result.all.return_value = []
-        mock_session.exec.return_value = mock_exec_result
 
         with pytest.raises(ClipNotFoundError):
             get_clips_for_composition(mock_session, [clip_id], mock_song)
 
-    def test_get_clips_raises_error_on_missing_video_url(self):
+    def test_get_clips_raises_error_on_missing_video_url(self, session_pair):
         """Test that CompositionError is raised when clip has no video_url."""
         song_id = uuid4()
         clip_id = uuid4()
 
-        mock_song = Mock()
-        mock_song.id = song_id
-        mock_song.video_type = "full_length"
+        mock_song = SimpleNamespace(id=song_id, video_type="full_length")
 
-        mock_clip = Mock(spec=SectionVideo)
-        mock_clip.id = clip_id
-        mock_clip.song_id = song_id
-        mock_clip.status = "completed"
-        mock_clip.video_url = None  # Missing video_url
+        mock_clip = make_clip(id=clip_id, song_id=song_id, video_url=None)  # Missing video_url
 
-        mock_session = Mock()
         # Mock the new bulk query approach: returns clip but it has no video_url
-        mock_exec_result = Mock()
+        mock_session, mock_exec_result = session_pair
         mock_exec_result.all.return_value = [mock_clip]
-        mock_session.exec.return_value = mock_exec_result
 
         # Validation will catch this and raise "is not ready"
-        with pytest.raises(CompositionError, match="is not ready"):
+        with pytest.raises(CompositionError, match=_NOT_READY):
             get_clips_for_composition(mock_session, [clip_id], mock_song)
 
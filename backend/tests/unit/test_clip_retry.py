@@ -6,20 +6,56 @@ Covers state reset, error handling, and queue integration.
 Run with: pytest backend/tests/unit/test_clip_retry.py -v
 """
 
-import sys
-from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 from uuid import uuid4
 
-# Add backend directory to path for direct execution
-backend_dir = Path(__file__).parent.parent
-if str(backend_dir) not in sys.path:
-    sys.path.insert(0, str(backend_dir))
-
-import pytest  # noqa: E402
-from app.exceptions import ClipNotFoundError  # noqa: E402
-from app.models.clip import SongClip  # noqa: E402
-from app.services.clip_generation import retry_clip_generation  # noqa: E402
+import pytest
+
+from app.exceptions import ClipNotFoundError
+from app.services.clip_generation import retry_clip_generation
+
+pytestmark = pytest.mark.unit
+
+# Arbitrary id for tests whose mocked repository ignores it
+_ANY_CLIP_ID = uuid4()
+
+_SETTINGS = SimpleNamespace(rq_worker_queue="test-queue")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _settings():
+    """Serve _SETTINGS from clip_generation.get_settings for the whole module."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("app.services.clip_generation.get_settings", lambda: _SETTINGS)
+        yield _SETTINGS
+
+
+def make_clip(**overrides):
+    """Plain stand-in for a failed SongClip with every field SongClipStatus reads."""
+    return SimpleNamespace(
+        **{
+            "id": uuid4(),
+            "song_id": uuid4(),
+            "status": "failed",
+            "error": None,
+            "video_url": None,
+            "replicate_job_id": None,
+            "rq_job_id": None,
+            "clip_index": 0,
+            "fps": 8,
+            "num_frames": 100,
+            "duration_sec": 10.0,
+            "start_sec": 0.0,
+            "end_sec": 10.0,
+            "start_beat_index": None,
+            "end_beat_index": None,
+            "source": "test",
+            "prompt": None,
+            "style_seed": None,
+            **overrides,
+        }
+    )
 
 
 class DummyJob:
@@ -37,7 +73,9 @@ class DummyQueue:
 
     def enqueue(self, func, clip_id, job_timeout=None, meta=None):
         job = DummyJob(f"job-{clip_id}")
-        self.enqueued_jobs.append((func, clip_id, job_timeout, meta))
+        self.enqueued_jobs.append(
+            {"func": func, "clip_id": clip_id, "timeout": job_timeout, "meta": meta}
+        )
         return job
 
 
@@ -46,94 +84,51 @@ class TestRetryClipGeneration:
 
     @patch("app.services.clip_generation.get_queue")
     @patch("app.services.clip_generation.ClipRepository")
-    @patch("app.services.clip_generation.get_settings")
-    def test_clip_not_found(self, mock_get_settings, mock_repo, mock_get_queue):
+    def test_clip_not_found(self, mock_repo, mock_get_queue):
         """Test that clip not found raises ValueError."""
-        mock_settings = MagicMock()
-        mock_settings.rq_worker_queue = "test-queue"
-        mock_get_settings.return_value = mock_settings
-
         mock_repo.get_by_id.side_effect = ClipNotFoundError("Clip not found")
 
         with pytest.raises(ValueError, match="not found"):
-            retry_clip_generation(uuid4())
+            retry_clip_generation(_ANY_CLIP_ID)
 
     @patch("app.services.clip_generation.get_queue")
     @patch("app.services.clip_generation.ClipRepository")
-    @patch("app.services.clip_generation.get_settings")
-    def test_clip_already_processing(self, mock_get_settings, mock_repo, mock_get_queue):
+    def test_clip_already_processing(self, mock_repo, mock_get_queue):
         """Test that clip already processing raises RuntimeError."""
-        mock_settings = MagicMock()
-        mock_settings.rq_worker_queue = "test-queue"
-        mock_get_settings.return_value = mock_settings
-
-        clip = MagicMock(spec=SongClip)
-        clip.status = "processing"
-        clip.song_id = uuid4()
-        clip.clip_index = 0
-        clip.fps = 8
-        clip.num_frames = 100
-        clip.duration_sec = 10.0
+        clip = make_clip(status="processing")
 
         mock_repo.get_by_id.return_value = clip
 
         with pytest.raises(RuntimeError, match="already queued or processing"):
-            retry_clip_generation(uuid4())
+            retry_clip_generation(_ANY_CLIP_ID)
 
     @patch("app.services.clip_generation.get_queue")
     @patch("app.services.clip_generation.ClipRepository")
-    @patch("app.services.clip_generation.get_settings")
-    def test_clip_already_queued(self, mock_get_settings, mock_repo, mock_get_queue):
+    def test_clip_already_queued(self, mock_repo, mock_get_queue):
         """Test that clip already queued raises RuntimeError."""
-        mock_settings = MagicMock()
-        mock_settings.rq_worker_queue = "test-queue"
-        mock_get_settings.return_value = mock_settings
-
-        clip = MagicMock(spec=SongClip)
-        clip.status = "queued"
-        clip.song_id = uuid4()
-        clip.clip_index = 0
-        clip.fps = 8
-        clip.num_frames = 100
-        clip.duration_sec = 10.0
+        clip = make_clip(status="queued")
 
         mock_repo.get_by_id.return_value = clip
 
         with pytest.raises(RuntimeError, match="already queued or processing"):
-            retry_clip_generation(uuid4())
+            retry_clip_generation(_ANY_CLIP_ID)
 
     @patch("app.services.clip_generation.get_queue")
     @patch("app.services.clip_generation.ClipRepository")
-    @patch("app.services.clip_generation.get_settings")
-    def test_successful_retry(self, mock_get_settings, mock_repo, mock_get_queue):
+    def test_successful_retry(self, mock_repo, mock_get_queue):
         """Test successful retry resets state and enqueues job."""
         clip_id = uuid4()
         song_id = uuid4()
 
-        mock_settings = MagicMock()
-        mock_settings.rq_worker_queue = "test-queue"
-        mock_get_settings.return_value = mock_settings
-
-        # Create mock clip with all required fields
-        clip = MagicMock(spec=SongClip)
-        clip.id = clip_id
-        clip.status = "failed"
-        clip.error = "Some error"
-        clip.video_url = "https://example.com/video.mp4"
-        clip.replicate_job_id = "replicate-123"
-        clip.rq_job_id = "old-job-123"
-        clip.song_id = song_id
-        clip.clip_index = 0
-        clip.fps = 8
-        clip.num_frames = 100
-        clip.duration_sec = 10.0
-        clip.start_sec = 0.0
-        clip.end_sec = 10.0
-        clip.start_beat_index = None
-        clip.end_beat_index = None
-        clip.source = "test"
-        clip.prompt = None  # Optional field for SongClipStatus
-        clip.style_seed = None  # Optional field for SongClipStatus
+        # Failed clip still carrying state from the previous attempt
+        clip = make_clip(
+            id=clip_id,
+            error="Some error",
+            video_url="https://example.com/video.mp4",
+            replicate_job_id="replicate-123",
+            rq_job_id="old-job-123",
+            song_id=song_id,
+        )
 
         # Mock repository
         mock_repo.get_by_id.return_value = clip
@@ -161,46 +156,27 @@ class TestRetryClipGeneration:
 
         # Verify queue was called with correct parameters
         assert len(dummy_queue.enqueued_jobs) == 1
-        enqueued_func, enqueued_clip_id, enqueued_timeout, enqueued_meta = dummy_queue.enqueued_jobs[0]
-        assert enqueued_clip_id == clip_id
-        assert enqueued_meta["song_id"] == str(song_id)
-        assert enqueued_meta["clip_index"] == 0
-        assert enqueued_meta["retry"] is True
+        job = dummy_queue.enqueued_jobs[0]
+        assert job["clip_id"] == clip_id
+        assert job["meta"]["song_id"] == str(song_id)
+        assert job["meta"]["clip_index"] == 0
+        assert job["meta"]["retry"] is True
 
         # Verify rq_job_id was set
         assert clip.rq_job_id == f"job-{clip_id}"
 
     @patch("app.services.clip_generation.get_queue")
     @patch("app.services.clip_generation.ClipRepository")
-    @patch("app.services.clip_generation.get_settings")
-    def test_num_frames_recalculated(self, mock_get_settings, mock_repo, mock_get_queue):
+    def test_num_frames_recalculated(self, mock_repo, mock_get_queue):
         """Test that num_frames is recalculated if <= 0."""
         clip_id = uuid4()
         song_id = uuid4()
 
-        mock_settings = MagicMock()
-        mock_settings.rq_worker_queue = "test-queue"
-        mock_get_settings.return_value = mock_settings
-
-        clip = MagicMock(spec=SongClip)
-        clip.id = clip_id
-        clip.status = "failed"
-        clip.error = None
-        clip.video_url = None
-        clip.replicate_job_id = None
-        clip.rq_job_id = None
-        clip.song_id = song_id
-        clip.clip_index = 0
-        clip.fps = 8
-        clip.num_frames = 0  # Zero frames
-        clip.duration_sec = 10.0  # 10 seconds
-        clip.start_sec = 0.0
-        clip.end_sec = 10.0
-        clip.start_beat_index = None
-        clip.end_beat_index = None
-        clip.source = "test"
-        clip.prompt = None  # Optional field for SongClipStatus
-        clip.style_seed = None  # Optional field for SongClipStatus
+        clip = make_clip(
+            id=clip_id,
+            song_id=song_id,
+            num_frames=0,  # Zero frames
+        )
 
         mock_repo.get_by_id.return_value = clip
         mock_repo.update.return_value = clip
@@ -215,35 +191,18 @@ class TestRetryClipGeneration:
 
     @patch("app.services.clip_generation.get_queue")
     @patch("app.services.clip_generation.ClipRepository")
-    @patch("app.services.clip_generation.get_settings")
-    def test_num_frames_minimum_one(self, mock_get_settings, mock_repo, mock_get_queue):
+    def test_num_frames_minimum_one(self, mock_repo, mock_get_queue):
         """Test that num_frames is at least 1 even for very short clips."""
         clip_id = uuid4()
         song_id = uuid4()
 
-        mock_settings = MagicMock()
-        mock_settings.rq_worker_queue = "test-queue"
-        mock_get_settings.return_value = mock_settings
-
-        clip = MagicMock(spec=SongClip)
-        clip.id = clip_id
-        clip.status = "failed"
-        clip.error = None
-        clip.video_url = None
-        clip.replicate_job_id = None
-        clip.rq_job_id = None
-        clip.song_id = song_id
-        clip.clip_index = 0
-        clip.fps = 8
-        clip.num_frames = 0
-        clip.duration_sec = 0.01  # Very short duration
-        clip.start_sec = 0.0
-        clip.end_sec = 0.01
-        clip.start_beat_index = None
-        clip.end_beat_index = None
-        clip.source = "test"
-        clip.prompt = None  # Optional field for SongClipStatus
-        clip.style_seed = None  # Optional field for SongClipStatus
+        clip = make_clip(
+            id=clip_id,
+            song_id=song_id,
+            num_frames=0,
+            duration_sec=0.01,  # Very short duration
+            end_sec=0.01,
+        )
 
         mock_repo.get_by_id.return_value = clip
         mock_repo.update.return_value = clip
@@ -258,28 +217,12 @@ class TestRetryClipGeneration:
 
     @patch("app.services.clip_generation.get_queue")
     @patch("app.services.clip_generation.ClipRepository")
-    @patch("app.services.clip_generation.get_settings")
-    def test_clip_disappears_after_enqueue(self, mock_get_settings, mock_repo, mock_get_queue):
+    def test_clip_disappears_after_enqueue(self, mock_repo, mock_get_queue):
         """Test that clip disappearing after enqueue raises ValueError."""
         clip_id = uuid4()
         song_id = uuid4()
 
-        mock_settings = MagicMock()
-        mock_settings.rq_worker_queue = "test-queue"
-        mock_get_settings.return_value = mock_settings
-
-        clip = MagicMock(spec=SongClip)
-        clip.id = clip_id
-        clip.status = "failed"
-        clip.error = None
-        clip.video_url = None
-        clip.replicate_job_id = None
-        clip.rq_job_id = None
-        clip.song_id = song_id
-        clip.clip_index = 0
-        clip.fps = 8
-        clip.num_frames = 100
-        clip.duration_sec = 10.0
+        clip = make_clip(id=clip_id, song_id=song_id)
 
         # First call succeeds, second call (after enqueue) fails
         mock_repo.get_by_id.side_effect = [clip, ClipNotFoundError("Clip disappeared")]
@@ -292,35 +235,12 @@ class TestRetryClipGeneration:
 
     @patch("app.services.clip_generation.get_queue")
     @patch("app.services.clip_generation.ClipRepository")
-    @patch("app.services.clip_generation.get_settings")
-    def test_queue_name_with_suffix(self, mock_get_settings, mock_repo, mock_get_queue):
+    def test_queue_name_with_suffix(self, mock_repo, mock_get_queue):
         """Test that queue name uses main queue (no :clip-generation suffix)."""
         clip_id = uuid4()
         song_id = uuid4()
 
-        mock_settings = MagicMock()
-        mock_settings.rq_worker_queue = "test-queue"
-        mock_get_settings.return_value = mock_settings
-
-        clip = MagicMock(spec=SongClip)
-        clip.id = clip_id
-        clip.status = "failed"
-        clip.error = None
-        clip.video_url = None
-        clip.replicate_job_id = None
-        clip.rq_job_id = None
-        clip.song_id = song_id
-        clip.clip_index = 0
-        clip.fps = 8
-        clip.num_frames = 100
-        clip.duration_sec = 10.0
-        clip.start_sec = 0.0
-        clip.end_sec = 10.0
-        clip.start_beat_index = None
-        clip.end_beat_index = None
-        clip.source = "test"  # Required string field
-        clip.prompt = None  # Optional field for SongClipStatus
-        clip.style_seed = None  # Optional field for SongClipStatus
+        clip = make_clip(id=clip_id, song_id=song_id)
 
         mock_repo.get_by_id.return_value = clip
         mock_repo.update.return_value = clip
@@ -332,6 +252,6 @@ class TestRetryClipGeneration:
 
         # Verify queue was created with correct name (main queue, no suffix)
         mock_get_queue.assert_called_once()
-        call_kwargs = mock_get_queue.call_args[1]
+        call_kwargs = mock_get_queue.call_args.kwargs
         assert call_kwargs["queue_name"] == "test-queue"
 
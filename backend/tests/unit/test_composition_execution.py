@@ -1,126 +1,103 @@
 """Unit tests for composition execution service."""
 
-from unittest.mock import MagicMock, Mock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock
 from uuid import uuid4
 
+import pytest
 
-from app.models.clip import SongClip
-from app.models.section_video import SectionVideo
-from app.services.composition_execution import MAX_DURATION_MISMATCH_SECONDS
+import app.services.composition_execution as composition_execution
+from app.services.composition_execution import (
+    MAX_DURATION_MISMATCH_SECONDS,
+    execute_composition_pipeline,
+)
 
 
-class TestDurationMismatchHandling:
-    """Tests for duration mismatch handling in composition pipeline."""
+class _StopAfterClipSelection(Exception):
+    """Raised by the patched clip validation to end the pipeline once clips are fetched."""
 
-    def test_max_duration_mismatch_constant(self):
-        """Test that MAX_DURATION_MISMATCH_SECONDS is set correctly."""
-        assert MAX_DURATION_MISMATCH_SECONDS == 5.0
 
-    def test_duration_mismatch_logic_clips_longer(self):
-        """Test duration mismatch calculation when clips are longer."""
-        total_clip_duration = 35.0
-        song_duration = 30.0
-        duration_diff = total_clip_duration - song_duration
+_PATCHED_NAMES = (
+    "session_scope",
+    "SongRepository",
+    "update_job_progress",
+    "fail_job",
+    "validate_composition_inputs",
+)
 
-        # Should be within threshold (5 seconds)
-        assert abs(duration_diff) <= MAX_DURATION_MISMATCH_SECONDS
-        assert duration_diff > 0  # Clips are longer
 
-    def test_duration_mismatch_logic_clips_shorter(self):
-        """Test duration mismatch calculation when clips are shorter."""
-        total_clip_duration = 25.0
-        song_duration = 30.0
-        duration_diff = total_clip_duration - song_duration
+@pytest.fixture(scope="module")
+def _shared_session():
+    return MagicMock()
 
-        # Should be within threshold (5 seconds)
-        assert abs(duration_diff) <= MAX_DURATION_MISMATCH_SECONDS
-        assert duration_diff < 0  # Clips are shorter
 
-    def test_duration_mismatch_logic_too_long(self):
-        """Test duration mismatch when clips are too much longer."""
-        total_clip_duration = 40.0
-        song_duration = 30.0
-        duration_diff = total_clip_duration - song_duration
+@pytest.fixture
+def fresh_session(_shared_session):
+    """Module-wide MagicMock session, fully reset after each test.
 
-        # Should exceed threshold (10 seconds > 5 seconds)
-        assert abs(duration_diff) > MAX_DURATION_MISMATCH_SECONDS
+    Tests configure ``get.return_value`` and ``exec.return_value.all.return_value``.
+    """
+    yield _shared_session
+    _shared_session.reset_mock(return_value=True, side_effect=True)
 
-    def test_duration_mismatch_logic_too_short(self):
-        """Test duration mismatch when clips are too much shorter."""
-        total_clip_duration = 20.0
-        song_duration = 30.0
-        duration_diff = total_clip_duration - song_duration
 
-        # Should exceed threshold (10 seconds > 5 seconds)
-        assert abs(duration_diff) > MAX_DURATION_MISMATCH_SECONDS
+@pytest.fixture
+def pipeline(monkeypatch, fresh_session):
+    """Replace the pipeline's collaborators with MagicMocks, exposed by name.
 
+    ``session_scope()`` yields ``fresh_session``, and ``validate_composition_inputs``
+    raises ``_StopAfterClipSelection`` so the pipeline ends once clips are fetched.
+    """
+    namespace = SimpleNamespace()
+    for name in _PATCHED_NAMES:
+        mock = MagicMock()
+        monkeypatch.setattr(composition_execution, name, mock)
+        setattr(namespace, name, mock)
+    namespace.session_scope.return_value.__enter__.return_value = fresh_session
+    namespace.validate_composition_inputs.side_effect = _StopAfterClipSelection
+    return namespace
 
-class TestCompositionExecutionModelSelection:
-    """Tests for model selection based on video_type."""
-
-    @patch("app.services.composition_execution.session_scope")
-    @patch("app.services.composition_execution.SongRepository")
-    @patch("app.services.composition_execution.update_job_progress")
-    def test_execute_composition_sections_enabled_uses_sectionvideo(
-        self, mock_update, mock_repo, mock_session
-    ):
-        """Test that composition uses SectionVideo when video_type is full_length."""
-        from app.services.composition_execution import execute_composition_pipeline
 
-        # Setup mocks
-        song_id = uuid4()
-        clip_id = uuid4()
-        job_id = "test-job-123"
+class TestDurationMismatchHandling:
+    """Tests for duration mismatch handling in composition pipeline."""
 
-        mock_song = Mock()
-        mock_song.id = song_id  # Must set id for validation
-        mock_song.duration_sec = 30.0
-        mock_song.processed_s3_key = "audio/test.mp3"
-        mock_song.video_type = "full_length"
-        mock_repo.get_by_id.return_value = mock_song
+    def test_max_duration_mismatch_constant(self):
+        """Test that MAX_DURATION_MISMATCH_SECONDS is set correctly."""
+        assert MAX_DURATION_MISMATCH_SECONDS == 5.0
 
-        mock_section_video = Mock(spec=SectionVideo)
-        mock_section_video.video_url = "http://example.com/video.mp4"
-        mock_section_video.id = clip_id
-        mock_section_video.song_id = song_id  # Must match song_id for validation
-        mock_section_video.status = "completed"
+    @pytest.mark.parametrize(
+        "total_clip_duration,song_duration,within_threshold,clips_longer",
+        [
+            pytest.param(35.0, 30.0, True, True, id="clips_longer"),
+            pytest.param(25.0, 30.0, True, False, id="clips_shorter"),
+            pytest.param(40.0, 30.0, False, True, id="too_long"),
+            pytest.param(20.0, 30.0, False, False, id="too_short"),
+        ],
+    )
+    def test_duration_mismatch_logic(
+        self, total_clip_duration, song_duration, within_threshold, clips_longer
+    ):
+        """Test duration mismatch against the 5-second threshold in both directions."""
+        duration_diff = total_clip_duration - song_duration
 
-        mock_session_obj = MagicMock()
-        # Mock CompositionJob lookup (first call)
-        mock_job = Mock()
-        mock_job.status = "processing"
-        # Mock get_clips_for_composition: it uses session.exec(select(...)) now
-        mock_exec_result = Mock()
-        mock_exec_result.all.return_value = [mock_section_video]
-        mock_session_obj.exec.return_value = mock_exec_result
-        # get() is called for CompositionJob, exec() is called for clips
-        mock_session_obj.get.return_value = mock_job
-        mock_session.return_value.__enter__.return_value = mock_session_obj
+        assert (abs(duration_diff) <= MAX_DURATION_MISMATCH_SECONDS) is within_threshold
+        assert (duration_diff > 0) is clips_longer
 
-        # This will fail early in the pipeline, but we can verify it tries to use SectionVideo
-        try:
-            execute_composition_pipeline(
-                job_id=job_id,
-                song_id=song_id,
-                clip_ids=[clip_id],
-                clip_metadata=[],
-            )
-        except (ValueError, RuntimeError, AttributeError, Exception):
-            # Expected to fail - we just want to verify the code path
-            pass
 
-        # Verify it tried to get clips using exec() (new bulk query approach)
-        assert mock_session_obj.exec.called, "exec() should have been called to fetch clips when video_type is full_length"
+class TestCompositionExecutionModelSelection:
+    """Tests for model selection based on video_type."""
 
-    @patch("app.services.composition_execution.session_scope")
-    @patch("app.services.composition_execution.SongRepository")
-    @patch("app.services.composition_execution.update_job_progress")
-    def test_execute_composition_sections_disabled_uses_songclip(
-        self, mock_update, mock_repo, mock_session
+    @pytest.mark.parametrize(
+        "video_type,model_name",
+        [
+            ("full_length", "SectionVideo"),
+            ("short_form", "SongClip"),
+        ],
+    )
+    def test_execute_composition_selects_clip_model(
+        self, pipeline, fresh_session, video_type, model_name
     ):
-        """Test that composition uses SongClip when video_type is short_form."""
-        from app.services.composition_execution import execute_composition_pipeline
-
+        """Test that composition queries SectionVideo for full_length and SongClip otherwise."""
         # Setup mocks
         song_id = uuid4()
         clip_id = uuid4()
@@ -130,136 +107,36 @@ class TestCompositionExecutionModelSelection:
         mock_song.id = song_id  # Must set id for validation
         mock_song.duration_sec = 30.0
         mock_song.processed_s3_key = "audio/test.mp3"
-        mock_song.video_type = "short_form"
-        mock_repo.get_by_id.return_value = mock_song
+        mock_song.video_type = video_type
+        pipeline.SongRepository.get_by_id.return_value = mock_song
 
-        mock_song_clip = Mock(spec=SongClip)
-        mock_song_clip.video_url = "http://example.com/video.mp4"
-        mock_song_clip.id = clip_id
-        mock_song_clip.song_id = song_id  # Must match song_id for validation
-        mock_song_clip.status = "completed"
+        mock_clip = SimpleNamespace(
+            id=clip_id,
+            song_id=song_id,  # Must match song_id for validation
+            status="completed",
+            video_url="http://example.com/video.mp4",
+        )
 
-        mock_session_obj = MagicMock()
+        mock_session_obj = fresh_session
         # Mock CompositionJob lookup (first call)
         mock_job = Mock()
         mock_job.status = "processing"
         # Mock get_clips_for_composition: it uses session.exec(select(...)) now
-        mock_exec_result = Mock()
-        mock_exec_result.all.return_value = [mock_song_clip]
-        mock_session_obj.exec.return_value = mock_exec_result
+        mock_session_obj.exec.return_value.all.return_value = [mock_clip]
         # get() is called for CompositionJob, exec() is called for clips
         mock_session_obj.get.return_value = mock_job
-        mock_session.return_value.__enter__.return_value = mock_session_obj
 
-        # This will fail early in the pipeline, but we can verify it tries to use SongClip
-        try:
+        # Validation is patched to stop the pipeline right after clips are fetched
+        with pytest.raises(_StopAfterClipSelection):
             execute_composition_pipeline(
                 job_id=job_id,
                 song_id=song_id,
                 clip_ids=[clip_id],
                 clip_metadata=[],
             )
-        except (ValueError, RuntimeError, AttributeError, Exception):
-            # Expected to fail - we just want to verify the code path
-            pass
-
-        # Verify it tried to get clips using exec() (new bulk query approach)
-        assert mock_session_obj.exec.called, "exec() should have been called to fetch clips when video_type is short_form"
 
-    # Commented out: Requires DATABASE_URL environment variable
-    # @pytest.mark.skipif(not os.getenv("DATABASE_URL"), reason="Database not configured")
-    # @patch("app.repositories.song_repository.session_scope")
-    # @patch("app.services.composition_execution.session_scope")
-    # @patch("app.services.composition_execution.SongRepository")
-    # @patch("app.services.composition_execution.update_job_progress")
-    # def test_execute_composition_sections_disabled_validation(
-    #     self, mock_update, mock_repo_class, mock_session, mock_repo_session
-    # ):
-    #     """Test that SongClip validation works correctly when video_type is short_form."""
-    #     from app.services.composition_execution import execute_composition_pipeline
-    #
-    #     song_id = uuid4()
-    #     clip_id = uuid4()
-    #     job_id = "test-job-123"
-    #
-    #     mock_song = Mock()
-    #     mock_song.id = song_id  # Must set id for validation
-    #     mock_song.duration_sec = 30.0
-    #     mock_song.processed_s3_key = "audio/test.mp3"
-    #     mock_song.video_type = "short_form"
-    #     # Configure the mock class to return the song when get_by_id is called
-    #     mock_repo_class.get_by_id = Mock(return_value=mock_song)
-    #
-    #     mock_song_clip = Mock(spec=SongClip)
-    #     mock_song_clip.video_url = "http://example.com/video.mp4"
-    #     mock_song_clip.id = clip_id
-    #     mock_song_clip.song_id = song_id  # Must match song_id for validation
-    #     mock_song_clip.status = "completed"
-    #
-    #     # Setup session mock - get() is called for CompositionJob first, then for SongClip
-    #     mock_job = Mock()
-    #     mock_job.status = "processing"
-    #     mock_session_obj = MagicMock()
-    #     # First call: CompositionJob, Second call: SongClip
-    #     mock_session_obj.get.side_effect = [mock_job, mock_song_clip]
-    #     mock_session.return_value.__enter__.return_value = mock_session_obj
-    #     # Also mock the database session_scope used by SongRepository.get_by_id
-    #     mock_repo_session.return_value.__enter__.return_value = mock_session_obj
-    #
-    #     # Should not raise ClipNotFoundError when clip exists and is valid
-    #     # Will fail later in pipeline (download, etc.) but clip validation should pass
-    #     with pytest.raises((RuntimeError, AttributeError)):  # Will fail later in pipeline
-    #         execute_composition_pipeline(
-    #             job_id=job_id,
-    #             song_id=song_id,
-    #             clip_ids=[clip_id],
-    #             clip_metadata=[],
-    #         )
-    #
-    #     # Verify it validated the clip exists (get() called at least twice: job + clip)
-    #     assert mock_session_obj.get.call_count >= 2
+        pipeline.validate_composition_inputs.assert_called_once_with(["http://example.com/video.mp4"])
 
-    # Commented out: Requires DATABASE_URL environment variable
-    # @pytest.mark.skipif(not os.getenv("DATABASE_URL"), reason="Database not configured")
-    # @patch("app.repositories.song_repository.session_scope")
-    # @patch("app.services.composition_execution.session_scope")
-    # @patch("app.services.composition_execution.SongRepository")
-    # @patch("app.services.composition_execution.update_job_progress")
-    # def test_execute_composition_sections_disabled_error_handling(
-    #     self, mock_update, mock_repo_class, mock_session, mock_repo_session
-    # ):
-    #     """Test that proper errors are raised for missing SongClip when video_type is short_form."""
-    #     from app.models.composition import CompositionJob
-    #     from app.services.composition_execution import execute_composition_pipeline
-    #
-    #     song_id = uuid4()
-    #     clip_id = uuid4()
-    #     job_id = "test-job-123"
-    #
-    #     mock_song = Mock()
-    #     mock_song.id = song_id  # Must set id for validation
-    #     mock_song.duration_sec = 30.0
-    #     mock_song.processed_s3_key = "audio/test.mp3"
-    #     mock_song.video_type = "short_form"
-    #     # Configure the mock class to return the song when get_by_id is called
-    #     mock_repo_class.get_by_id = Mock(return_value=mock_song)
-    #
-    #     mock_session_obj = MagicMock()
-    #     # First call returns the job (for job lookup), subsequent calls return None (clip not found)
-    #     mock_job = Mock(spec=CompositionJob)
-    #     mock_job.status = "processing"
-    #     # get() is called for: 1) CompositionJob, 2) SongClip (returns None)
-    #     mock_session_obj.get.side_effect = [mock_job, None]  # Job found, clip not found
-    #     mock_session.return_value.__enter__.return_value = mock_session_obj
-    #     # Also mock the database session_scope used by SongRepository.get_by_id
-    #     mock_repo_session.return_value.__enter__.return_value = mock_session_obj
-    #
-    #     # Should raise ClipNotFoundError for missing clip (now using centralized validation)
-    #     from app.exceptions import ClipNotFoundError
-    #     with pytest.raises(ClipNotFoundError, match="SongClip.*not found"):
-    #         execute_composition_pipeline(
-    #             job_id=job_id,
-    #             song_id=song_id,
-    #             clip_ids=[clip_id],
-    #             clip_metadata=[],
-    #         )
+        # The bulk clip query selects the model chosen for this video_type
+        statement = mock_session_obj.exec.call_args.args[0]
+        assert statement.column_descriptions[0]["name"] == model_name
@@ -5,192 +5,84 @@ Tests model validation based on feature flag.
 Run with: pytest backend/tests/unit/test_composition_job.py -v
 """
 
-import sys
-from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock
 from uuid import uuid4
 
-# Add backend directory to path for direct execution
-backend_dir = Path(__file__).parent.parent
-if str(backend_dir) not in sys.path:
-    sys.path.insert(0, str(backend_dir))
+import pytest
 
-import pytest  # noqa: E402
-from app.exceptions import ClipNotFoundError  # noqa: E402
-from app.models.clip import SongClip  # noqa: E402
-from app.models.section_video import SectionVideo  # noqa: E402
+import app.services.composition_job as composition_job
+from app.exceptions import ClipNotFoundError
+from app.models.clip import SongClip
+from app.models.section_video import SectionVideo
+from app.services.composition_job import enqueue_composition
 
 
-class TestCompositionJobModelValidation:
-    """Tests for model validation based on video_type."""
-
-    @patch("app.services.composition_job.session_scope")
-    @patch("app.services.composition_job.SongRepository")
-    @patch("app.services.composition_job.get_queue")
-    def test_enqueue_composition_sections_enabled_validates_sectionvideo(
-        self, mock_queue, mock_repo, mock_session
-    ):
-        """Test that SectionVideo is validated when video_type is full_length."""
-        from app.services.composition_job import enqueue_composition
-
-        song_id = uuid4()
-        clip_id = uuid4()
-
-        mock_song = Mock()
-        mock_song.video_type = "full_length"
-        mock_repo.get_by_id.return_value = mock_song
-
-        mock_section_video = Mock(spec=SectionVideo)
-        mock_section_video.song_id = song_id
-        mock_section_video.status = "completed"
-        mock_section_video.video_url = "http://example.com/video.mp4"
-
-        mock_session_obj = MagicMock()
-        mock_session_obj.get.return_value = mock_section_video
-        mock_session.return_value.__enter__.return_value = mock_session_obj
-
-        mock_job = Mock()
-        mock_job.id = "test-job-123"
-        mock_queue_obj = Mock()
-        mock_queue_obj.enqueue.return_value = mock_job
-        mock_queue.return_value = mock_queue_obj
-
-        # Should succeed
-        job_id, job = enqueue_composition(
-            song_id=song_id,
-            clip_ids=[clip_id],
-            clip_metadata=[],
-        )
-
-        assert job_id == "test-job-123"
-        # Verify it tried to get SectionVideo
-        mock_session_obj.get.assert_called()
-        call_args = mock_session_obj.get.call_args
-        if call_args:
-            model_class = call_args[0][0] if call_args[0] else None
-            assert model_class == SectionVideo or (
-                hasattr(model_class, "__name__") and model_class.__name__ == "SectionVideo"
-            )
-
-    @patch("app.services.composition_job.session_scope")
-    @patch("app.services.composition_job.SongRepository")
-    @patch("app.services.composition_job.get_queue")
-    def test_enqueue_composition_sections_disabled_validates_songclip(
-        self, mock_queue, mock_repo, mock_session
-    ):
-        """Test that SongClip is validated when video_type is short_form."""
-        from app.services.composition_job import enqueue_composition
-
-        song_id = uuid4()
-        clip_id = uuid4()
-
-        mock_song = Mock()
-        mock_song.video_type = "short_form"
-        mock_repo.get_by_id.return_value = mock_song
-
-        mock_song_clip = Mock(spec=SongClip)
-        mock_song_clip.song_id = song_id
-        mock_song_clip.status = "completed"
-        mock_song_clip.video_url = "http://example.com/video.mp4"
+@pytest.fixture
+def composition_mocks(monkeypatch):
+    """Patch session_scope, SongRepository and get_queue on composition_job.
 
-        mock_session_obj = MagicMock()
-        mock_session_obj.get.return_value = mock_song_clip
-        mock_session.return_value.__enter__.return_value = mock_session_obj
+    Exposes ``song`` (returned by the repository), ``session`` (yielded by
+    ``session_scope()``) and ``queue`` (returned by ``get_queue``), whose
+    ``enqueue`` returns a job with id ``"test-job-123"``.
+    """
+    song = Mock()
+    session = MagicMock()
+    queue = Mock()
+    queue.enqueue.return_value = SimpleNamespace(id="test-job-123")
 
-        mock_job = Mock()
-        mock_job.id = "test-job-123"
-        mock_queue_obj = Mock()
-        mock_queue_obj.enqueue.return_value = mock_job
-        mock_queue.return_value = mock_queue_obj
+    session_scope = MagicMock()
+    session_scope.return_value.__enter__.return_value = session
+    monkeypatch.setattr(composition_job, "session_scope", session_scope)
+    monkeypatch.setattr(composition_job, "SongRepository", Mock(get_by_id=Mock(return_value=song)))
+    monkeypatch.setattr(composition_job, "get_queue", Mock(return_value=queue))
+    return SimpleNamespace(song=song, session=session, queue=queue)
 
-        # Should succeed
-        job_id, job = enqueue_composition(
-            song_id=song_id,
-            clip_ids=[clip_id],
-            clip_metadata=[],
-        )
 
-        assert job_id == "test-job-123"
-        # Verify it tried to get SongClip
-        mock_session_obj.get.assert_called()
-        call_args = mock_session_obj.get.call_args
-        if call_args:
-            model_class = call_args[0][0] if call_args[0] else None
-            assert model_class == SongClip or (
-                hasattr(model_class, "__name__") and model_class.__name__ == "SongClip"
-            )
+class TestCompositionJobModelValidation:
+    """Tests for model validation based on video_type."""
 
-    @patch("app.services.composition_job.session_scope")
-    @patch("app.services.composition_job.SongRepository")
-    def test_enqueue_composition_sections_disabled_rejects_sectionvideo(
-        self, mock_repo, mock_session
+    @pytest.mark.parametrize(
+        "video_type,expected_model,clip_found",
+        [
+            pytest.param("full_length", SectionVideo, True, id="full_length-validates-sectionvideo"),
+            pytest.param("short_form", SongClip, True, id="short_form-validates-songclip"),
+            pytest.param("short_form", SongClip, False, id="short_form-rejects-sectionvideo"),
+            pytest.param("full_length", SectionVideo, False, id="full_length-rejects-songclip"),
+        ],
+    )
+    def test_enqueue_composition_validates_clip_model(
+        self, composition_mocks, video_type, expected_model, clip_found
     ):
-        """Test that SectionVideo is rejected when video_type is short_form."""
-        from app.services.composition_job import enqueue_composition
-
+        """Test that clips are looked up as SectionVideo for full_length and SongClip otherwise."""
         song_id = uuid4()
         clip_id = uuid4()
 
-        mock_song = Mock()
-        mock_song.video_type = "short_form"
-        mock_repo.get_by_id.return_value = mock_song
-
-        # Return None (SectionVideo not found when looking for SongClip)
-        mock_session_obj = MagicMock()
-        mock_session_obj.get.return_value = None
-        mock_session.return_value.__enter__.return_value = mock_session_obj
-
-        # Should raise ClipNotFoundError
-        with pytest.raises(ClipNotFoundError, match="SongClip.*not found"):
-            enqueue_composition(
+        composition_mocks.song.video_type = video_type
+        # A clip of the other model is simply not found by this lookup
+        composition_mocks.session.get.return_value = (
+            SimpleNamespace(
                 song_id=song_id,
-                clip_ids=[clip_id],
-                clip_metadata=[],
-            )
-
-        # Verify it tried to get SongClip (not SectionVideo)
-        mock_session_obj.get.assert_called()
-        call_args = mock_session_obj.get.call_args
-        if call_args:
-            model_class = call_args[0][0] if call_args[0] else None
-            assert model_class == SongClip or (
-                hasattr(model_class, "__name__") and model_class.__name__ == "SongClip"
+                status="completed",
+                video_url="http://example.com/video.mp4",
             )
+            if clip_found
+            else None
+        )
 
-    @patch("app.services.composition_job.session_scope")
-    @patch("app.services.composition_job.SongRepository")
-    def test_enqueue_composition_sections_enabled_rejects_songclip(
-        self, mock_repo, mock_session
-    ):
-        """Test that SongClip is rejected when video_type is full_length."""
-        from app.services.composition_job import enqueue_composition
-
-        song_id = uuid4()
-        clip_id = uuid4()
-
-        mock_song = Mock()
-        mock_song.video_type = "full_length"
-        mock_repo.get_by_id.return_value = mock_song
-
-        # Return None (SongClip not found when looking for SectionVideo)
-        mock_session_obj = MagicMock()
-        mock_session_obj.get.return_value = None
-        mock_session.return_value.__enter__.return_value = mock_session_obj
-
-        # Should raise ClipNotFoundError
-        with pytest.raises(ClipNotFoundError, match="SectionVideo.*not found"):
-            enqueue_composition(
+        if clip_found:
+            job_id, _ = enqueue_composition(
                 song_id=song_id,
                 clip_ids=[clip_id],
                 clip_metadata=[],
             )
-
-        # Verify it tried to get SectionVideo (not SongClip)
-        mock_session_obj.get.assert_called()
-        call_args = mock_session_obj.get.call_args
-        if call_args:
-            model_class = call_args[0][0] if call_args[0] else None
-            assert model_class == SectionVideo or (
-                hasattr(model_class, "__name__") and model_class.__name__ == "SectionVideo"
-            )
-
+            assert job_id == "test-job-123"
+        else:
+            with pytest.raises(ClipNotFoundError, match=f"{expected_model.__name__}.*not found"):
+                enqueue_composition(
+                    song_id=song_id,
+                    clip_ids=[clip_id],
+                    clip_metadata=[],
+                )
+
+        composition_mocks.session.get.assert_called_once_with(expected_model, clip_id)
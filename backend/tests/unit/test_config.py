@@ -5,136 +5,77 @@ Tests feature flag configuration, especially is_sections_enabled().
 Run with: pytest backend/tests/unit/test_config.py -v
 """
 
-import os
-import sys
-from pathlib import Path
+import pytest
 
-# Add backend directory to path for direct execution
-backend_dir = Path(__file__).parent.parent
-if str(backend_dir) not in sys.path:
-    sys.path.insert(0, str(backend_dir))
+from app.core.config import get_settings, is_sections_enabled
 
-from app.core.config import get_settings, is_sections_enabled  # noqa: E402
+
+@pytest.fixture(autouse=True)
+def _clear_settings_cache():
+    """Drop cached settings before and after each test so env changes take effect."""
+    is_sections_enabled.cache_clear()
+    get_settings.cache_clear()
+    yield
+    is_sections_enabled.cache_clear()
+    get_settings.cache_clear()
 
 
 class TestFeatureFlagConfiguration:
     """Tests for feature flag configuration."""
 
-    def test_is_sections_enabled_default_true(self):
+    def test_is_sections_enabled_default_true(self, monkeypatch):
         """Test that default value is True for backward compatibility."""
-        # Clear cache to get fresh settings
-        is_sections_enabled.cache_clear()
-        get_settings.cache_clear()
+        monkeypatch.delenv("ENABLE_SECTIONS", raising=False)
 
-        # Remove env var if it exists
-        env_backup = os.environ.pop("ENABLE_SECTIONS", None)
+        result = is_sections_enabled()
+        assert result is True, "Default should be True for backward compatibility"
 
-        try:
-            result = is_sections_enabled()
-            assert result is True, "Default should be True for backward compatibility"
-        finally:
-            # Restore env var if it was set
-            if env_backup is not None:
-                os.environ["ENABLE_SECTIONS"] = env_backup
-            is_sections_enabled.cache_clear()
-            get_settings.cache_clear()
-
-    def test_is_sections_enabled_env_override_true(self):
+    def test_is_sections_enabled_env_override_true(self, monkeypatch):
         """Test that environment variable can override to True."""
-        is_sections_enabled.cache_clear()
-        get_settings.cache_clear()
+        monkeypatch.setenv("ENABLE_SECTIONS", "true")
 
-        env_backup = os.environ.get("ENABLE_SECTIONS")
-
-        try:
-            os.environ["ENABLE_SECTIONS"] = "true"
-            result = is_sections_enabled()
-            assert result is True
-        finally:
-            if env_backup is not None:
-                os.environ["ENABLE_SECTIONS"] = env_backup
-            elif "ENABLE_SECTIONS" in os.environ:
-                del os.environ["ENABLE_SECTIONS"]
-            is_sections_enabled.cache_clear()
-            get_settings.cache_clear()
-
-    def test_is_sections_enabled_env_override_false(self):
-        """Test that environment variable can override to False."""
-        is_sections_enabled.cache_clear()
-        get_settings.cache_clear()
+        result = is_sections_enabled()
+        assert result is True
 
-        env_backup = os.environ.get("ENABLE_SECTIONS")
-
-        try:
-            os.environ["ENABLE_SECTIONS"] = "false"
-            result = is_sections_enabled()
-            assert result is False
-        finally:
-            if env_backup is not None:
-                os.environ["ENABLE_SECTIONS"] = env_backup
-            elif "ENABLE_SECTIONS" in os.environ:
-                del os.environ["ENABLE_SECTIONS"]
-            is_sections_enabled.cache_clear()
-            get_settings.cache_clear()
-
-    def test_is_sections_enabled_case_insensitive(self):
+    def test_is_sections_enabled_env_override_false(self, monkeypatch):
+        """Test that environment variable can override to False."""
+        monkeypatch.setenv("ENABLE_SECTIONS", "false")
+
+        result = is_sections_enabled()
+        assert result is False
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("False", False),
+            ("FALSE", False),
+            ("false", False),
+            ("0", False),
+            ("True", True),
+            ("TRUE", True),
+            ("true", True),
+            ("1", True),
+        ],
+    )
+    def test_is_sections_enabled_case_insensitive(self, monkeypatch, value, expected):
         """Test that case variations work (False, FALSE, false)."""
-        is_sections_enabled.cache_clear()
-        get_settings.cache_clear()
+        monkeypatch.setenv("ENABLE_SECTIONS", value)
+
+        assert is_sections_enabled() is expected, f"Should be {expected} for value: {value}"
 
-        env_backup = os.environ.get("ENABLE_SECTIONS")
-
-        try:
-            for value in ["False", "FALSE", "false", "0"]:
-                os.environ["ENABLE_SECTIONS"] = value
-                is_sections_enabled.cache_clear()
-                get_settings.cache_clear()
-                result = is_sections_enabled()
-                assert result is False, f"Should be False for value: {value}"
-
-            for value in ["True", "TRUE", "true", "1"]:
-                os.environ["ENABLE_SECTIONS"] = value
-                is_sections_enabled.cache_clear()
-                get_settings.cache_clear()
-                result = is_sections_enabled()
-                assert result is True, f"Should be True for value: {value}"
-        finally:
-            if env_backup is not None:
-                os.environ["ENABLE_SECTIONS"] = env_backup
-            elif "ENABLE_SECTIONS" in os.environ:
-                del os.environ["ENABLE_SECTIONS"]
-            is_sections_enabled.cache_clear()
-            get_settings.cache_clear()
-
-    def test_is_sections_enabled_caching(self):
+    def test_is_sections_enabled_caching(self, monkeypatch):
         """Test that @lru_cache works correctly."""
-        is_sections_enabled.cache_clear()
-        get_settings.cache_clear()
+        # Set to False
+        monkeypatch.setenv("ENABLE_SECTIONS", "false")
+        result1 = is_sections_enabled()
 
-        env_backup = os.environ.get("ENABLE_SECTIONS")
-
-        try:
-            # Set to False
-            os.environ["ENABLE_SECTIONS"] = "false"
-            is_sections_enabled.cache_clear()
-            get_settings.cache_clear()
-            result1 = is_sections_enabled()
-
-            # Change env var but don't clear cache - should return cached value
-            os.environ["ENABLE_SECTIONS"] = "true"
-            result2 = is_sections_enabled()
-            assert result1 == result2, "Should return cached value"
-
-            # Clear cache and try again - should get new value
-            is_sections_enabled.cache_clear()
-            get_settings.cache_clear()
-            result3 = is_sections_enabled()
-            assert result3 is True, "Should get new value after cache clear"
-        finally:
-            if env_backup is not None:
-                os.environ["ENABLE_SECTIONS"] = env_backup
-            elif "ENABLE_SECTIONS" in os.environ:
-                del os.environ["ENABLE_SECTIONS"]
-            is_sections_enabled.cache_clear()
-            get_settings.cache_clear()
+        # Change env var but don't clear cache - should return cached value
+        monkeypatch.setenv("ENABLE_SECTIONS", "true")
+        result2 = is_sections_enabled()
+        assert result1 == result2, "Should return cached value"
 
+        # Clear cache and try again - should get new value
+        is_sections_enabled.cache_clear()
+        get_settings.cache_clear()
+        result3 = is_sections_enabled()
+        assert result3 is True, "Should get new value after cache clear"